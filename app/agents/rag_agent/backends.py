@@ -0,0 +1,192 @@
+"""
+Generation and embedding backends for the RAG pipeline (``RAG_BACKEND``).
+
+- ``gemini``: Google Gemini through ``google.generativeai`` (default)
+- ``local``: deterministic and offline, for load tests, profiling and CI.
+  Embeddings are signed feature hashes of words and word bigrams, so texts
+  sharing words land close together. Generations are templated from the
+  prompt: the claim is checked against the context by word overlap and a
+  JSON verdict (or a plain answer) is returned. ``LOCAL_LLM_LATENCY`` and
+  ``LOCAL_LLM_EMBED_LATENCY`` simulate API round trips, optionally with
+  ``LOCAL_LLM_JITTER`` (a fraction of the latency, seeded by the input so
+  runs stay repeatable).
+
+A backend has ``model_name`` and ``embed_model`` (used in cache keys, so the
+backends never share cached results), ``generate(prompt, generation_config)``
+returning the response text and ``embed(texts)`` returning one vector per text,
+plus their coroutine versions ``agenerate`` and ``aembed``.
+"""
+
+import asyncio
+import hashlib
+import json
+import math
+import random
+import re
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+import google.generativeai as genai
+
+from app.core.config import settings
+from app.models.rag import RagResponse
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+_CLAIM = re.compile(r"^(?:Claim|Question): (.*)$", re.MULTILINE)
+_CONTEXT = re.compile(r"^Context:\s?(.*?)(?:\n\nQuestion:|\Z)", re.MULTILINE | re.DOTALL)
+
+# Too common to count as evidence for a claim
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or that the this to was were will with".split()
+)
+
+
+class GeminiBackend:
+    """Google Gemini generation and embeddings."""
+
+    name = "gemini"
+
+    def __init__(self, model_name: Optional[str] = None, embed_model: Optional[str] = None) -> None:
+        if settings.gemini.api_key:
+            genai.configure(api_key=settings.gemini.api_key)
+        self.model_name = model_name or settings.gemini.model
+        self.embed_model = embed_model or settings.gemini.embed_model
+        self._llm = genai.GenerativeModel(self.model_name)
+
+    def generate(self, prompt: str, generation_config: Optional[Dict[str, Any]] = None) -> str:
+        if generation_config is None:
+            resp = self._llm.generate_content(prompt)
+        else:
+            resp = self._llm.generate_content(prompt, generation_config=generation_config)
+        return _response_text(resp)
+
+    async def agenerate(self, prompt: str, generation_config: Optional[Dict[str, Any]] = None) -> str:
+        if generation_config is None:
+            resp = await self._llm.generate_content_async(prompt)
+        else:
+            resp = await self._llm.generate_content_async(prompt, generation_config=generation_config)
+        return _response_text(resp)
+
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        emb = genai.embed_content(model=self.embed_model, content=list(texts))
+        # API returns {'embedding': [[...], ...]} for a list of contents
+        return [list(v) for v in emb.get("embedding", [])]
+
+    async def aembed(self, texts: List[str]) -> List[List[float]]:
+        emb = await genai.embed_content_async(model=self.embed_model, content=list(texts))
+        return [list(v) for v in emb.get("embedding", [])]
+
+
+class LocalBackend:
+    """Deterministic offline stand-in for Gemini: hashing embeddings and templated verdicts."""
+
+    name = "local"
+
+    def __init__(
+        self,
+        latency: Optional[float] = None,
+        embed_latency: Optional[float] = None,
+        jitter: Optional[float] = None,
+        dim: Optional[int] = None,
+    ) -> None:
+        self.latency = latency if latency is not None else settings.local_llm.latency
+        self.embed_latency = embed_latency if embed_latency is not None else settings.local_llm.embed_latency
+        self.jitter = jitter if jitter is not None else settings.local_llm.jitter
+        self.dim = dim or settings.local_llm.embed_dim
+        self.model_name = "local-template"
+        self.embed_model = f"local-hash-{self.dim}"
+
+    def _delay(self, seconds: float, seed: str) -> float:
+        if seconds <= 0:
+            return 0.0
+        if self.jitter:
+            rng = random.Random(hashlib.sha256(seed.encode("utf-8")).digest())
+            seconds *= 1 + rng.uniform(-self.jitter, self.jitter)
+        return max(0.0, seconds)
+
+    def _vector(self, text: str) -> List[float]:
+        words = [w for w in _WORD.findall(text.lower()) if w not in _STOPWORDS]
+        features = words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+        if not features:
+            return []
+        vector = [0.0] * self.dim
+        for feature in features:
+            digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest()
+            value = int.from_bytes(digest, "little")
+            vector[value % self.dim] += 1.0 if value >> 63 else -1.0
+        norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+        return [v / norm for v in vector]
+
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        time.sleep(self._delay(self.embed_latency, "\n".join(texts)))
+        return [self._vector(text) for text in texts]
+
+    async def aembed(self, texts: List[str]) -> List[List[float]]:
+        await asyncio.sleep(self._delay(self.embed_latency, "\n".join(texts)))
+        return [self._vector(text) for text in texts]
+
+    def generate(self, prompt: str, generation_config: Optional[Dict[str, Any]] = None) -> str:
+        time.sleep(self._delay(self.latency, prompt))
+        return self._verdict(prompt, generation_config)
+
+    async def agenerate(self, prompt: str, generation_config: Optional[Dict[str, Any]] = None) -> str:
+        await asyncio.sleep(self._delay(self.latency, prompt))
+        return self._verdict(prompt, generation_config)
+
+    def _verdict(self, prompt: str, generation_config: Optional[Dict[str, Any]]) -> str:
+        claim_match = _CLAIM.search(prompt)
+        context_match = _CONTEXT.search(prompt)
+        claim = claim_match.group(1) if claim_match else ""
+        context = context_match.group(1) if context_match else ""
+
+        claim_words = {w for w in _WORD.findall(claim.lower()) if w not in _STOPWORDS}
+        context_words = set(_WORD.findall(context.lower()))
+        overlap = len(claim_words & context_words) / len(claim_words) if claim_words else 0.0
+
+        if overlap >= 0.6:
+            label, answer = RagResponse.VERIFIED, "The context supports the claim."
+        elif overlap >= 0.3:
+            label, answer = RagResponse.UNVERIFIED, "The context only partly covers the claim; unsure."
+        else:
+            label, answer = RagResponse.UNVERIFIED, "The claim cannot be derived from the context; unsure."
+        if (generation_config or {}).get("response_mime_type") != "application/json":
+            return answer
+        return json.dumps({
+            "answer": answer,
+            "label": label.value,
+            "confidence": round(overlap, 2),
+            "rationale": f"{len(claim_words & context_words)} of {len(claim_words)} claim terms appear in the context.",
+        })
+
+
+def _response_text(resp) -> str:
+    """Text of a Gemini response, falling back to the first candidate part."""
+    text = getattr(resp, "text", None)
+    if not text and hasattr(resp, "candidates") and resp.candidates:
+        try:
+            text = resp.candidates[0].content.parts[0].text
+        except Exception:
+            text = ""
+    return (text or "").strip()
+
+
+BACKENDS = {
+    "gemini": GeminiBackend,
+    "local": LocalBackend,
+}
+
+_backends: Dict[str, Any] = {}
+_backends_lock = threading.Lock()
+
+
+def get_backend(name: Optional[str] = None):
+    """The process-wide backend for ``name`` (default ``RAG_BACKEND``)."""
+    name = name or settings.gemini.backend
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown RAG backend {name!r}, expected one of: {', '.join(BACKENDS)}")
+    if name not in _backends:
+        with _backends_lock:
+            if name not in _backends:
+                _backends[name] = BACKENDS[name]()
+    return _backends[name]
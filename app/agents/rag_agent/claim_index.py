@@ -0,0 +1,165 @@
+"""
+Index of already-verified claims for near-duplicate reuse.
+
+Posts often restate the same claim in different words. After a successful
+verification the post content is embedded and stored in a dedicated Chroma
+collection (HNSW, cosine) together with its verdict. A new post is first
+looked up there: when the nearest stored claim is at least
+``CLAIM_REUSE_THRESHOLD`` similar and younger than ``CLAIM_REUSE_MAX_AGE``,
+its verdict is reused instead of running search, scraping and the LLM again.
+A post never matches its own entry, so re-verifying it always runs the pipeline.
+
+Verdicts of ``unverified`` or failed verifications are not stored, since
+evidence may turn up later. Entries older than ``CLAIM_REUSE_MAX_AGE`` are
+deleted by ``compaction.py`` (by their ``ingested_at`` metadata).
+"""
+
+import datetime
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+import chromadb
+from chromadb.api.models.Collection import Collection
+
+from app.agents.rag_agent.rag_agent import _embed_texts
+from app.core.config import settings
+from app.models.rag import RagResponse
+
+
+@dataclass
+class ClaimMatch:
+    post_id: str
+    claim: str
+    similarity: float
+    status: str
+    confidence: float
+    answer: str
+    rationale: str
+    verified_at: str
+
+    def to_response(self, post_id: str) -> Dict[str, Any]:
+        """Verification response for ``post_id`` reusing this verdict, with provenance."""
+        return {
+            "status": self.status,
+            "confidence": self.confidence,
+            "answer": self.answer,
+            "supporting_context": [],
+            "rationale": self.rationale,
+            "metadata": {
+                "post_id": post_id,
+                "reused_from": {
+                    "post_id": self.post_id,
+                    "claim": self.claim,
+                    "similarity": round(self.similarity, 4),
+                    "verified_at": self.verified_at,
+                },
+            },
+        }
+
+
+class ClaimIndex:
+    """Nearest-neighbour lookup of verified claims in a Chroma collection."""
+
+    def __init__(
+        self,
+        collection_name: Optional[str] = None,
+        threshold: Optional[float] = None,
+        max_age: Optional[int] = None,
+    ) -> None:
+        self.collection_name = collection_name or settings.vectordb.claim_collection
+        self.threshold = threshold if threshold is not None else settings.vectordb.claim_reuse_threshold
+        self.max_age = max_age if max_age is not None else settings.vectordb.claim_reuse_max_age
+        self._collection: Optional[Collection] = None
+
+    def _get_collection(self) -> Collection:
+        if self._collection is None:
+            client = chromadb.PersistentClient(path=settings.vectordb.chroma_persist_path)
+            self._collection = client.get_or_create_collection(
+                name=self.collection_name,
+                metadata={"hnsw:space": "cosine"},
+            )
+        return self._collection
+
+    def lookup(self, claim: str, exclude_post_id: Optional[str] = None) -> Optional[ClaimMatch]:
+        """The closest verified claim if it is similar and recent enough, else None.
+
+        Args:
+            claim: Post content to look up
+            exclude_post_id: Ignore this post's own entry (the post being verified)
+        """
+        if not claim or not claim.strip():
+            return None
+        embedding = _embed_texts([claim])[0]
+        if not embedding:
+            return None
+
+        collection = self._get_collection()
+        if collection.count() == 0:
+            return None
+        result = collection.query(
+            query_embeddings=[embedding],
+            n_results=1,
+            where={"post_id": {"$ne": str(exclude_post_id)}} if exclude_post_id else None,
+            include=["documents", "metadatas", "distances"],
+        )
+        if not result.get("ids") or not result["ids"][0]:
+            return None
+
+        similarity = 1.0 - float(result["distances"][0][0])
+        meta = result["metadatas"][0][0] or {}
+        if similarity < self.threshold:
+            return None
+
+        verified_at = str(meta.get("verified_at", ""))
+        if self.max_age and verified_at:
+            age = datetime.datetime.now(datetime.timezone.utc) - datetime.datetime.fromisoformat(verified_at)
+            if age.total_seconds() > self.max_age:
+                return None
+
+        return ClaimMatch(
+            post_id=str(meta.get("post_id", "")),
+            claim=result["documents"][0][0],
+            similarity=similarity,
+            status=str(meta.get("status", RagResponse.UNVERIFIED.value)),
+            confidence=float(meta.get("confidence", 0.0)),
+            answer=str(meta.get("answer", "")),
+            rationale=str(meta.get("rationale", "")),
+            verified_at=verified_at,
+        )
+
+    def remove(self, post_id: str) -> None:
+        """Drop a post's entry, e.g. after its content was edited."""
+        self._get_collection().delete(ids=[f"claim_{post_id}"])
+
+    def add(self, post_id: str, claim: str, response: Dict[str, Any]) -> bool:
+        """Store a finished verification; returns False when it isn't worth reusing."""
+        status = response.get("status")
+        metadata = response.get("metadata") or {}
+        if (
+            not claim
+            or status not in {e.value for e in RagResponse}
+            or status == RagResponse.UNVERIFIED.value
+            or metadata.get("error")
+            or metadata.get("reused_from")
+        ):
+            return False
+
+        embedding = _embed_texts([claim])[0]
+        if not embedding:
+            return False
+        self._get_collection().upsert(
+            ids=[f"claim_{post_id}"],
+            documents=[claim],
+            embeddings=[embedding],
+            metadatas=[{
+                "post_id": str(post_id),
+                "status": status,
+                "confidence": float(response.get("confidence", 0.0)),
+                "answer": str(response.get("answer", "")),
+                "rationale": str(response.get("rationale", "")),
+                "verified_at": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+                "ingested_at": int(time.time()),
+            }],
+        )
+        return True
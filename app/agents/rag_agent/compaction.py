@@ -0,0 +1,104 @@
+"""
+Compaction of the persistent Chroma collections.
+
+Stored passages (``RAG_RETRIEVAL_MODE=chroma``) and verified claims (claim
+reuse) carry an ``ingested_at`` metadata field in Unix seconds. Nothing else
+ever removes them, so ``compact`` keeps the collections bounded:
+
+1. entries ingested longer ago than the TTL are deleted with a metadata filter:
+   ``CHROMA_DOC_TTL`` for passages and ``CLAIM_REUSE_MAX_AGE`` for claims, whose
+   older verdicts are never reused anyway,
+2. if the passage collection still holds more than ``CHROMA_MAX_DOCUMENTS``,
+   its oldest entries are deleted until it fits. Entries stored before they had
+   metadata count as the oldest.
+
+Run it from cron or queue it for the worker with ``python -m app.compact_chroma``.
+A TTL or size of 0 disables that step.
+"""
+
+import time
+from typing import Any, Dict, List, Optional
+
+import chromadb
+from chromadb.api.models.Collection import Collection
+from chromadb.errors import NotFoundError
+
+from app.core.config import settings
+
+# Entries read or deleted per Chroma call
+PAGE_SIZE = 1000
+
+
+def compact_collection(
+    collection: Collection,
+    ttl: int = 0,
+    max_documents: int = 0,
+    now: Optional[float] = None,
+) -> Dict[str, Any]:
+    """Delete expired entries, then the oldest ones beyond ``max_documents``.
+
+    Args:
+        collection: Chroma collection whose entries have ``ingested_at`` metadata
+        ttl: Seconds an entry is kept after ingestion (0 keeps them)
+        max_documents: Entries the collection may hold afterwards (0 for no limit)
+        now: Current Unix time (defaults to ``time.time()``)
+
+    Returns:
+        dict: Collection name, counts before and after, expired and evicted entries
+    """
+    now = time.time() if now is None else now
+    before = collection.count()
+
+    if ttl > 0 and before:
+        collection.delete(where={"ingested_at": {"$lt": int(now - ttl)}})
+    count = collection.count()
+
+    evicted = 0
+    if max_documents > 0 and count > max_documents:
+        entries: List[tuple] = []
+        for offset in range(0, count, PAGE_SIZE):
+            page = collection.get(include=["metadatas"], limit=PAGE_SIZE, offset=offset)
+            for entry_id, meta in zip(page["ids"], page["metadatas"] or []):
+                entries.append((int((meta or {}).get("ingested_at", 0)), entry_id))
+        entries.sort()
+        oldest = [entry_id for _, entry_id in entries[:len(entries) - max_documents]]
+        for i in range(0, len(oldest), PAGE_SIZE):
+            collection.delete(ids=oldest[i:i + PAGE_SIZE])
+        evicted = len(oldest)
+
+    remaining = collection.count()
+    return {
+        "collection": collection.name,
+        "before": before,
+        "expired": before - count,
+        "evicted": evicted,
+        "remaining": remaining,
+    }
+
+
+def compact(ttl: Optional[int] = None, max_documents: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Compact the passage collection and the verified-claim collection.
+
+    Args:
+        ttl: Passage TTL in seconds (``CHROMA_DOC_TTL``)
+        max_documents: Passage collection size cap (``CHROMA_MAX_DOCUMENTS``)
+
+    Returns:
+        List[dict]: One ``compact_collection`` summary per existing collection
+    """
+    ttl = settings.vectordb.doc_ttl if ttl is None else ttl
+    max_documents = settings.vectordb.max_documents if max_documents is None else max_documents
+    client = chromadb.PersistentClient(path=settings.vectordb.chroma_persist_path)
+
+    plans = [
+        (settings.vectordb.collection_name, ttl, max_documents),
+        (settings.vectordb.claim_collection, settings.vectordb.claim_reuse_max_age, 0),
+    ]
+    summaries = []
+    for name, collection_ttl, collection_max in plans:
+        try:
+            collection = client.get_collection(name=name)
+        except NotFoundError:
+            continue
+        summaries.append(compact_collection(collection, ttl=collection_ttl, max_documents=collection_max))
+    return summaries
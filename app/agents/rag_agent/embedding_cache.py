@@ -0,0 +1,112 @@
+"""
+Persistent embedding cache (SQLite).
+
+Vectors are keyed by ``(embed model, sha256(text))`` so a passage or claim is
+embedded once per model, no matter how many verifications it shows up in. The
+table is capped at ``EMBED_CACHE_MAX_ENTRIES``; least recently used vectors are
+evicted first. Vectors are stored as float32 blobs.
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from array import array
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from app.core.config import settings
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS embeddings (
+    model TEXT NOT NULL,
+    text_hash TEXT NOT NULL,
+    vector BLOB NOT NULL,
+    accessed_at REAL NOT NULL,
+    PRIMARY KEY (model, text_hash)
+);
+CREATE INDEX IF NOT EXISTS embeddings_accessed_at ON embeddings (accessed_at);
+"""
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """SQLite-backed cache of embedding vectors keyed by model and text hash."""
+
+    def __init__(self, path: Optional[str] = None, max_entries: Optional[int] = None) -> None:
+        self.path = path or settings.gemini.embed_cache_path
+        self.max_entries = max_entries if max_entries is not None else settings.gemini.embed_cache_max_entries
+        self.hits = 0
+        self.misses = 0
+        self._local = threading.local()
+
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        conn = self._conn()
+        conn.executescript(_SCHEMA)
+        conn.commit()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get_many(self, model: str, hashes: Iterable[str]) -> Dict[str, List[float]]:
+        """Cached vectors for the given text hashes; missing ones are left out."""
+        hashes = list(dict.fromkeys(hashes))
+        if not hashes:
+            return {}
+        found: Dict[str, List[float]] = {}
+        conn = self._conn()
+        with conn:
+            # Stay well below SQLite's bound-parameter limit
+            for i in range(0, len(hashes), 500):
+                chunk = hashes[i:i + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = conn.execute(
+                    f"SELECT text_hash, vector FROM embeddings WHERE model = ? AND text_hash IN ({placeholders})",
+                    (model, *chunk),
+                ).fetchall()
+                for key, blob in rows:
+                    found[key] = array("f", blob).tolist()
+            if found:
+                now = time.time()
+                conn.executemany(
+                    "UPDATE embeddings SET accessed_at = ? WHERE model = ? AND text_hash = ?",
+                    [(now, model, key) for key in found],
+                )
+        self.hits += len(found)
+        self.misses += len(hashes) - len(found)
+        return found
+
+    def put_many(self, model: str, items: Iterable[Tuple[str, List[float]]]) -> None:
+        """Store ``(text hash, vector)`` pairs and evict the least recently used overflow."""
+        now = time.time()
+        rows = [(model, key, array("f", vector).tobytes(), now) for key, vector in items if vector]
+        if not rows:
+            return
+        conn = self._conn()
+        with conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (model, text_hash, vector, accessed_at) VALUES (?, ?, ?, ?)",
+                rows,
+            )
+            conn.execute(
+                "DELETE FROM embeddings WHERE rowid IN ("
+                "SELECT rowid FROM embeddings ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (max(0, self.max_entries),),
+            )
+
+    def __len__(self) -> int:
+        return self._conn().execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+    def clear(self) -> None:
+        conn = self._conn()
+        with conn:
+            conn.execute("DELETE FROM embeddings")
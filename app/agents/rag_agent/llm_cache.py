@@ -0,0 +1,208 @@
+"""
+Cache of Gemini responses for the RAG pipeline.
+
+Re-verifying a post, or verifying a copy-pasted viral claim, sends the same
+prompts again. Responses are cached under a key built from:
+
+- the call kind (answer, classify, answer_classify),
+- the claim, normalized (Unicode NFKC, case-folded, whitespace collapsed),
+- a SHA-256 of the retrieved context (plus the answer, for classification),
+- the model name and generation config.
+
+Entries expire after ``LLM_CACHE_TTL`` seconds and the cache keeps at most
+``LLM_CACHE_MAX_ENTRIES``, evicting the least recently used. Two backends:
+
+- ``sqlite``: a file shared by every process on the host (default)
+- ``redis``: shared by every host, via ``REDIS_URL``; LRU order is a sorted set
+"""
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from typing import Any, Dict, Optional, Sequence
+
+from redis.exceptions import RedisError
+
+from app.core.config import settings
+from app.core.redis import get_redis_client
+
+VALUE_KEY = "llm_cache:{key}"
+LRU_KEY = "llm_cache:lru"
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_claim(claim: str) -> str:
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFKC", claim or "").casefold()).strip()
+
+
+def cache_key(
+    kind: str,
+    claim: str,
+    context: Sequence[str],
+    model: str,
+    generation_config: Optional[Dict[str, Any]] = None,
+) -> str:
+    """Stable key for one LLM call."""
+    context_hash = hashlib.sha256("\n\n".join(context or []).encode("utf-8")).hexdigest()
+    payload = json.dumps(
+        [kind, normalize_claim(claim), context_hash, model, generation_config or {}],
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class SQLiteLLMCache:
+    """LLM responses in a local SQLite file, shared by processes on this host."""
+
+    def __init__(self, path: Optional[str] = None, ttl: Optional[int] = None, max_entries: Optional[int] = None) -> None:
+        self.path = path or settings.llm_cache.path
+        self.ttl = ttl if ttl is not None else settings.llm_cache.ttl
+        self.max_entries = max_entries if max_entries is not None else settings.llm_cache.max_entries
+        self.hits = 0
+        self.misses = 0
+        self._local = threading.local()
+
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        conn = self._conn()
+        conn.executescript(
+            "CREATE TABLE IF NOT EXISTS llm_cache ("
+            "key TEXT PRIMARY KEY, response TEXT NOT NULL, expires_at REAL NOT NULL, accessed_at REAL NOT NULL);"
+            "CREATE INDEX IF NOT EXISTS llm_cache_accessed_at ON llm_cache (accessed_at);"
+        )
+        conn.commit()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        conn = self._conn()
+        with conn:
+            row = conn.execute(
+                "SELECT response FROM llm_cache WHERE key = ? AND expires_at > ?", (key, now)
+            ).fetchone()
+            if row is not None:
+                conn.execute("UPDATE llm_cache SET accessed_at = ? WHERE key = ?", (now, key))
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return row[0]
+
+    def set(self, key: str, response: str) -> None:
+        now = time.time()
+        conn = self._conn()
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, response, expires_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, response, now + self.ttl, now),
+            )
+            conn.execute("DELETE FROM llm_cache WHERE expires_at <= ?", (now,))
+            conn.execute(
+                "DELETE FROM llm_cache WHERE key IN ("
+                "SELECT key FROM llm_cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (max(0, self.max_entries),),
+            )
+
+    def stats(self) -> Dict[str, Any]:
+        entries = self._conn().execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+        return {"backend": "sqlite", "entries": entries, "hits": self.hits, "misses": self.misses}
+
+
+class RedisLLMCache:
+    """LLM responses in Redis, shared by every worker; LRU order kept in a sorted set."""
+
+    def __init__(self, ttl: Optional[int] = None, max_entries: Optional[int] = None) -> None:
+        self.ttl = ttl if ttl is not None else settings.llm_cache.ttl
+        self.max_entries = max_entries if max_entries is not None else settings.llm_cache.max_entries
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[str]:
+        r = get_redis_client()
+        value = r.get(VALUE_KEY.format(key=key))
+        if value is None:
+            self.misses += 1
+            return None
+        r.zadd(LRU_KEY, {key: time.time()})
+        self.hits += 1
+        return value
+
+    def set(self, key: str, response: str) -> None:
+        r = get_redis_client()
+        pipe = r.pipeline()
+        pipe.set(VALUE_KEY.format(key=key), response, ex=self.ttl)
+        pipe.zadd(LRU_KEY, {key: time.time()})
+        pipe.zcard(LRU_KEY)
+        size = pipe.execute()[-1]
+
+        overflow = size - self.max_entries
+        if overflow > 0:
+            evicted = [member for member, _ in r.zpopmin(LRU_KEY, overflow)]
+            if evicted:
+                r.delete(*[VALUE_KEY.format(key=member) for member in evicted])
+        # Expired values leave stale LRU members behind; drop those older than the TTL
+        r.zremrangebyscore(LRU_KEY, "-inf", time.time() - self.ttl)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "backend": "redis",
+            "entries": get_redis_client().zcard(LRU_KEY),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+class LLMCache:
+    """Front for the configured backend; backend errors count as misses instead of failing the call."""
+
+    def __init__(self, backend) -> None:
+        self.backend = backend
+
+    def get(self, key: str) -> Optional[str]:
+        try:
+            return self.backend.get(key)
+        except (RedisError, sqlite3.Error) as e:
+            print(f"LLM cache lookup failed: {str(e)}")
+            return None
+
+    def set(self, key: str, response: str) -> None:
+        if not response:
+            return
+        try:
+            self.backend.set(key, response)
+        except (RedisError, sqlite3.Error) as e:
+            print(f"LLM cache store failed: {str(e)}")
+
+    def stats(self) -> Dict[str, Any]:
+        return self.backend.stats()
+
+
+_llm_cache: Optional[LLMCache] = None
+_llm_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> Optional[LLMCache]:
+    """The process-wide LLM cache, or None when ``LLM_CACHE_BACKEND=none``."""
+    global _llm_cache
+    backend = settings.llm_cache.backend
+    if backend == "none":
+        return None
+    if _llm_cache is None:
+        with _llm_cache_lock:
+            if _llm_cache is None:
+                _llm_cache = LLMCache(RedisLLMCache() if backend == "redis" else SQLiteLLMCache())
+    return _llm_cache
@@ -2,36 +2,165 @@
 RAG Verification Pipeline (Gemini + Chroma)
 
 This module provides a Retrieval-Augmented Generation (RAG) pipeline that performs:
-1) Vectorization and storage of documents in ChromaDB
+1) Vectorization of documents into a per-request in-memory index (or ChromaDB)
 2) Retrieval via vector similarity search
-3) Answer generation and verification/classification using Google Gemini
+3) Answer generation and verification/classification using Google Gemini, in one
+   structured JSON call or as two sequential calls (``RAG_GENERATION_MODE``)
+
+Generation and embeddings go through the pipeline's backend (``backends.py``,
+``RAG_BACKEND`` unless one is passed): Gemini, or a deterministic offline
+stand-in for benchmarks and tests.
+
+``averify`` is the asyncio version of ``verify``: embedding and generation calls
+await the backend instead of blocking a thread, and the claim is embedded
+concurrently with the passages.
+
+Passages stored in Chroma carry ``post_id``, ``source_url`` and ``ingested_at``
+(Unix seconds) metadata. Re-verifying a post replaces its passages by
+``post_id``, knowledge base lookups skip passages older than ``CHROMA_DOC_TTL``,
+and ``compaction.py`` deletes expired passages and caps the collection size.
 """
 
 from __future__ import annotations
 
 from typing import List, Dict, Any, Optional, Tuple
+import asyncio
 import os
 import json
+import time
 
+from app.agents.rag_agent.backends import GeminiBackend, get_backend
+from app.agents.rag_agent.embedding_cache import EmbeddingCache, text_hash
+from app.agents.rag_agent.llm_cache import cache_key, get_llm_cache
+from app.agents.rag_agent.vector_index import VectorIndex
 from app.core.config import settings
-from app.models.rag import RagRequest, RagResponse
+from app.models.rag import ProgressCallback, RagRequest, RagResponse, emit_event
 
-import google.generativeai as genai
 import chromadb
 from chromadb.api.models.Collection import Collection
 
 
-def _embed_texts_gemini(texts: List[str]) -> List[List[float]]:
-    """Embed a list of texts using Gemini embeddings API."""
-    results: List[List[float]] = []
-    for text in texts:
-        if not text or not text.strip():
-            results.append([])
-            continue
-        emb = genai.embed_content(model=settings.gemini.embed_model, content=text)
-        # API returns {'embedding': [...]} as of current versions
-        results.append(list(emb.get("embedding", [])))
-    return results
+_embedding_cache: Optional[EmbeddingCache] = None
+
+
+def _get_embedding_cache() -> Optional[EmbeddingCache]:
+    global _embedding_cache
+    if _embedding_cache is None and settings.gemini.embed_cache_enabled:
+        _embedding_cache = EmbeddingCache()
+    return _embedding_cache
+
+
+def _embed_plan(texts: List[str], backend=None):
+    """(backend, cache, text keys, unique texts by key, cached vectors by key) for an embedding call."""
+    backend = backend or get_backend()
+    keys = [text_hash(t) if t and t.strip() else None for t in texts]
+    unique = {key: text for key, text in zip(keys, texts) if key}
+    cache = _get_embedding_cache()
+    vectors: Dict[str, List[float]] = cache.get_many(backend.embed_model, unique) if cache is not None else {}
+    return backend, cache, keys, unique, vectors
+
+
+def _embed_texts(texts: List[str], backend=None) -> List[List[float]]:
+    """Embed a list of texts with ``backend`` (default: the ``RAG_BACKEND`` backend).
+
+    Texts already in the embedding cache under the backend's ``embed_model``
+    are not sent again; the rest are deduplicated and embedded in batches of
+    ``GEMINI_EMBED_BATCH_SIZE``. Blank texts get an empty vector.
+    """
+    backend, cache, keys, unique, vectors = _embed_plan(texts, backend)
+
+    missing = [key for key in unique if key not in vectors]
+    batch_size = max(1, settings.gemini.embed_batch_size)
+    for i in range(0, len(missing), batch_size):
+        batch = missing[i:i + batch_size]
+        fresh = dict(zip(batch, backend.embed([unique[key] for key in batch])))
+        vectors.update(fresh)
+        if cache is not None:
+            cache.put_many(backend.embed_model, fresh.items())
+
+    return [vectors.get(key, []) if key else [] for key in keys]
+
+
+async def _aembed_texts(texts: List[str], backend=None) -> List[List[float]]:
+    """Async ``_embed_texts``; the batches are sent concurrently."""
+    backend, cache, keys, unique, vectors = await asyncio.to_thread(_embed_plan, texts, backend)
+
+    missing = [key for key in unique if key not in vectors]
+    batch_size = max(1, settings.gemini.embed_batch_size)
+    batches = [missing[i:i + batch_size] for i in range(0, len(missing), batch_size)]
+    embedded = await asyncio.gather(*(backend.aembed([unique[key] for key in batch]) for batch in batches))
+    fresh: Dict[str, List[float]] = {}
+    for batch, batch_vectors in zip(batches, embedded):
+        fresh.update(zip(batch, batch_vectors))
+    vectors.update(fresh)
+    if cache is not None and fresh:
+        await asyncio.to_thread(cache.put_many, backend.embed_model, fresh.items())
+
+    return [vectors.get(key, []) if key else [] for key in keys]
+
+
+def _extract_json_block(s: str):
+    """Best-effort parse of a JSON object from model output (bare, fenced or embedded in prose)."""
+    try:
+        return json.loads(s)
+    except Exception:
+        pass
+    # Strip common fences
+    if "```" in s:
+        s2 = s.replace("```json", "```")
+        parts = s2.split("```")
+        for seg in parts:
+            seg = seg.strip()
+            if seg.startswith("{") and seg.endswith("}"):
+                try:
+                    return json.loads(seg)
+                except Exception:
+                    continue
+    # Fallback: first {...}
+    start = s.find("{")
+    end = s.rfind("}")
+    if start != -1 and end != -1 and end > start:
+        candidate = s[start:end+1]
+        try:
+            return json.loads(candidate)
+        except Exception:
+            pass
+    return None
+
+
+def _parse_classification(data: Optional[Dict[str, Any]], raw: str) -> Tuple[RagResponse, float, str]:
+    """(label, confidence, rationale) from parsed model JSON; defaults when fields are missing."""
+    parsed_label: RagResponse = RagResponse.OTHER
+    parsed_conf: float = 0.5
+    rationale: str = raw
+    try:
+        if data:
+            label_str = str(data.get("label", "other")).lower()
+            # Normalize to enum
+            for e in RagResponse:
+                if e.value.lower() == label_str:
+                    parsed_label = e
+                    break
+            conf = float(data.get("confidence", 0.5))
+            parsed_conf = max(0.0, min(1.0, conf))
+            rationale = str(data.get("rationale", rationale))
+    except Exception:
+        # Keep defaults if parsing fails
+        pass
+    return parsed_label, parsed_conf, rationale
+
+
+CLASSIFICATION_GUIDELINES = (
+    "Classification guidelines:\n"
+    "- 'verified': Claim is factually correct and supported by evidence\n"
+    "- 'unverified': Insufficient evidence to determine truth\n"
+    "- 'misinformation': Claim is demonstrably false\n"
+    "- 'factual_error': Claim contains factual inaccuracies\n"
+    "- 'personal_opinion': Claim is subjective opinion, not factual\n"
+    "- 'other': Does not fit other categories\n\n"
+    "For well-known facts (historical events, scientific facts, geography, etc.), "
+    "classify as 'verified' even without extensive context.\n\n"
+)
 
 
 class VerificationRAGPipeline:
@@ -44,165 +173,270 @@ class VerificationRAGPipeline:
         model_name: Optional[str] = None,
         temperature: Optional[float] = None,
         max_tokens: Optional[int] = None,
+        retrieval_mode: Optional[str] = None,
+        generation_mode: Optional[str] = None,
+        backend: Optional[str] = None,
     ) -> None:
-        # Configure Gemini
-        if settings.gemini.api_key:
-            genai.configure(api_key=settings.gemini.api_key)
-        self._model_name = model_name or settings.gemini.model
+        # Gemini, or the offline backend (RAG_BACKEND=local); an explicit model_name is a Gemini model
+        self._backend = GeminiBackend(model_name=model_name) if model_name else get_backend(backend)
+        self._model_name = self._backend.model_name
         self._temperature = temperature if temperature is not None else settings.gemini.temperature
         self._max_tokens = max_tokens if max_tokens is not None else settings.gemini.max_output_tokens
-        self._llm = genai.GenerativeModel(self._model_name)
+        # "single": answer + classification in one JSON generation; "two_call": answer, then classify
+        self._generation_mode = generation_mode or settings.gemini.generation_mode
+        self._llm_cache = get_llm_cache()
 
-        # Setup ChromaDB (persistent)
-        self._chroma_client = chromadb.PersistentClient(path=settings.vectordb.chroma_persist_path)
-        self._collection: Collection = self._chroma_client.get_or_create_collection(
-            name=settings.vectordb.collection_name,
-            metadata={"hnsw:space": "cosine"},
-        )
+        # "ephemeral": per-request in-memory index; "chroma": the shared persistent collection
+        self._retrieval_mode = retrieval_mode or settings.vectordb.retrieval_mode
+        self._use_knowledge_base = settings.vectordb.knowledge_base_enabled
+        self._collection: Optional[Collection] = None
+
+    def _get_collection(self) -> Collection:
+        # Chroma is only opened when something uses it (chroma mode or the knowledge base)
+        if self._collection is None:
+            self._chroma_client = chromadb.PersistentClient(path=settings.vectordb.chroma_persist_path)
+            self._collection = self._chroma_client.get_or_create_collection(
+                name=settings.vectordb.collection_name,
+                metadata={"hnsw:space": "cosine"},
+            )
+        return self._collection
 
-    def _build_corpus(self, contents: List[str], summary: Optional[str]) -> None:
+    @staticmethod
+    def _corpus(contents: List[str], summary: Optional[str]) -> List[str]:
         corpus: List[str] = []
         if summary:
             corpus.append(summary)
         corpus.extend(contents or [])
         # Deduplicate trivially
-        dedup = list(dict.fromkeys([c for c in corpus if c and c.strip()]))
+        return list(dict.fromkeys([c for c in corpus if c and c.strip()]))
+
+    def _build_corpus(
+        self,
+        contents: List[str],
+        summary: Optional[str],
+        post_id: str = "",
+        sources: Optional[List[str]] = None,
+    ) -> int:
+        """Upsert the passages into the persistent Chroma collection (chroma mode)."""
+        dedup = self._corpus(contents, summary)
         if not dedup:
+            return 0
+
+        # Content-derived IDs so concurrent requests don't overwrite each other's documents;
+        # a passage seen again takes the metadata (and TTL) of its latest ingestion
+        ids = [f"doc_{text_hash(doc)[:32]}" for doc in dedup]
+        embeddings = _embed_texts(dedup, self._backend)
+        metadatas = self._metadatas(dedup, contents, post_id, sources)
+        self._get_collection().upsert(documents=dedup, embeddings=embeddings, metadatas=metadatas, ids=ids)
+        return len(dedup)
+
+    @staticmethod
+    def _metadatas(
+        docs: List[str], contents: List[str], post_id: str, sources: Optional[List[str]]
+    ) -> List[Dict[str, Any]]:
+        source_of = dict(zip(contents or [], sources or []))
+        ingested_at = int(time.time())
+        return [
+            {"post_id": str(post_id or ""), "source_url": source_of.get(doc, ""), "ingested_at": ingested_at}
+            for doc in docs
+        ]
+
+    def _forget_post(self, post_id: str) -> None:
+        """Delete the passages a previous verification of the post stored."""
+        if not post_id:
             return
+        try:
+            self._get_collection().delete(where={"post_id": str(post_id)})
+        except Exception as e:
+            print(f"Failed to delete stored passages of post {post_id}: {str(e)}")
+
+    def _build_index(self, contents: List[str], summary: Optional[str]) -> VectorIndex:
+        """Embed the passages into an in-memory index private to this request (ephemeral mode)."""
+        index = VectorIndex()
+        dedup = self._corpus(contents, summary)
+        if dedup:
+            index.add(dedup, _embed_texts(dedup, self._backend))
+        return index
 
-        # Prepare IDs and embeddings
-        ids = [f"doc_{i}" for i in range(len(dedup))]
-        embeddings = _embed_texts_gemini(dedup)
-        # Upsert into Chroma (replaces on duplicate IDs)
-        self._collection.upsert(documents=dedup, embeddings=embeddings, ids=ids)
+    def _query_collection(self, q_emb: List[float], k: int) -> List[Tuple[str, float]]:
+        where = None
+        if settings.vectordb.doc_ttl > 0:
+            # Expired passages may still be stored until the next compaction
+            where = {"ingested_at": {"$gte": int(time.time()) - settings.vectordb.doc_ttl}}
+        result = self._get_collection().query(query_embeddings=[q_emb], n_results=max(1, k), where=where)
+        # result["documents"] / ["distances"] are List[List[...]]; cosine distance = 1 - similarity
+        docs = (result or {}).get("documents") or [[]]
+        distances = (result or {}).get("distances") or [[]]
+        return [(doc, 1.0 - float(dist)) for doc, dist in zip(docs[0], distances[0])]
 
-    def _retrieve(self, query: str, k: int = 4) -> List[str]:
-        # Embed the query and search in Chroma
-        q_emb = _embed_texts_gemini([query])[0]
+    def _retrieve(self, query: str, k: int = 4, index: Optional[VectorIndex] = None) -> List[str]:
+        """Top ``k`` passages for the query.
+
+        With an ``index`` (ephemeral mode) the request's own passages are searched,
+        merged with knowledge base hits when ``CHROMA_KNOWLEDGE_BASE`` is on;
+        without one the shared Chroma collection is searched.
+        """
+        q_emb = _embed_texts([query], self._backend)[0]
         if not q_emb:
             return []
-        result = self._collection.query(query_embeddings=[q_emb], n_results=max(1, k))
-        # result["documents"] is List[List[str]]
-        docs: List[str] = []
-        if result and isinstance(result.get("documents"), list) and result["documents"]:
-            docs = result["documents"][0]
-        return docs
+        return self._rank(q_emb, k, index)
 
-    def _generate_answer(self, query: str, context: List[str]) -> str:
+    def _rank(self, q_emb: List[float], k: int, index: Optional[VectorIndex]) -> List[str]:
+        if index is None:
+            return [doc for doc, _ in self._query_collection(q_emb, k)]
+
+        hits = index.query(q_emb, k)
+        if self._use_knowledge_base:
+            try:
+                hits += self._query_collection(q_emb, k)
+            except Exception as e:
+                print(f"Knowledge base query failed, using request passages only: {str(e)}")
+        hits.sort(key=lambda hit: hit[1], reverse=True)
+        return list(dict.fromkeys(doc for doc, _ in hits))[:max(1, k)]
+
+    def _generate(
+        self,
+        kind: str,
+        claim: str,
+        context: List[str],
+        prompt: str,
+        generation_config: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        """Run one LLM call, served from the LLM cache when the same call was made before."""
+        key = None
+        if self._llm_cache is not None:
+            key = cache_key(kind, claim, context, self._model_name, generation_config)
+            cached = self._llm_cache.get(key)
+            if cached is not None:
+                return cached
+
+        text = self._backend.generate(prompt, generation_config)
+
+        if key is not None:
+            self._llm_cache.set(key, text)
+        return text
+
+    def _generation_config(self) -> Dict[str, Any]:
+        return {
+            "temperature": self._temperature,
+            "max_output_tokens": self._max_tokens,
+            "response_mime_type": "application/json",
+        }
+
+    @staticmethod
+    def _answer_prompt(query: str, context: List[str]) -> str:
         context_text = "\n\n".join(context) if context else ""
-        prompt = (
+        return (
             "You are a careful assistant. Use the provided context to answer the user's question. "
             "If the answer cannot be derived from the context, say you are unsure.\n\n"
             f"Context:\n{context_text}\n\n"
             f"Question: {query}\n\n"
             "Answer succinctly and cite specific context snippets."
         )
-        resp = self._llm.generate_content(prompt)
-        text = getattr(resp, "text", None)
-        if not text and hasattr(resp, "candidates") and resp.candidates:
-            # Fallback extraction
-            try:
-                text = resp.candidates[0].content.parts[0].text
-            except Exception:
-                text = ""
-        return (text or "").strip()
-
-    def _classify(self, query: str, answer: str, context: List[str]) -> Tuple[RagResponse, float, str]:
-        """
-        Ask the model to classify the verification outcome.
 
-        Returns (label, confidence, rationale).
-        """
+    @staticmethod
+    def _classify_prompt(query: str, answer: str, context: List[str]) -> str:
         label_options = [e.value for e in RagResponse]
         context_text = "\n\n".join(context) if context else ""
-
-        prompt = (
+        return (
             "You are a fact verification assistant. Classify the claim based on the context and answer. "
             f"Choose one of: {', '.join(label_options)}.\n\n"
-            "Classification guidelines:\n"
-            "- 'verified': Claim is factually correct and supported by evidence\n"
-            "- 'unverified': Insufficient evidence to determine truth\n"
-            "- 'misinformation': Claim is demonstrably false\n"
-            "- 'factual_error': Claim contains factual inaccuracies\n"
-            "- 'personal_opinion': Claim is subjective opinion, not factual\n"
-            "- 'other': Does not fit other categories\n\n"
-            "For well-known facts (historical events, scientific facts, geography, etc.), "
-            "classify as 'verified' even without extensive context.\n\n"
+            f"{CLASSIFICATION_GUIDELINES}"
             "Return ONLY a compact JSON object with keys: label, confidence (0-1), rationale. "
             "Do not include code fences, backticks, or any extra prose.\n"
             f"Claim: {query}\n"
             f"Answer: {answer}\n"
             f"Context: {context_text}"
         )
-        resp = self._llm.generate_content(
-            prompt,
-            generation_config={
-                "temperature": self._temperature,
-                "max_output_tokens": self._max_tokens,
-                "response_mime_type": "application/json",
-            },
+
+    @staticmethod
+    def _answer_classify_prompt(query: str, context: List[str]) -> str:
+        label_options = [e.value for e in RagResponse]
+        context_text = "\n\n".join(context) if context else ""
+        return (
+            "You are a fact verification assistant. Use the provided context to check the claim. "
+            "If it cannot be derived from the context, say you are unsure in the answer. "
+            f"Classify the claim as one of: {', '.join(label_options)}.\n\n"
+            f"{CLASSIFICATION_GUIDELINES}"
+            "Return ONLY a compact JSON object with keys: answer (a succinct answer citing specific "
+            "context snippets), label, confidence (0-1), rationale. "
+            "Do not include code fences, backticks, or any extra prose.\n"
+            f"Claim: {query}\n"
+            f"Context: {context_text}"
         )
-        text = getattr(resp, "text", None)
-        if not text and hasattr(resp, "candidates") and resp.candidates:
-            try:
-                text = resp.candidates[0].content.parts[0].text
-            except Exception:
-                text = ""
-        resp_text = (text or "").strip()
 
-        # Best-effort parse; fall back gracefully
-        parsed_label: RagResponse = RagResponse.OTHER
-        parsed_conf: float = 0.5
-        rationale: str = resp_text
+    @staticmethod
+    def _parse_answer_classification(resp_text: str) -> Tuple[str, RagResponse, float, str]:
+        data = _extract_json_block(resp_text)
+        label, confidence, rationale = _parse_classification(data, resp_text)
+        answer = str(data.get("answer", "")).strip() if isinstance(data, dict) else ""
+        return answer, label, confidence, rationale
 
-        def _extract_json_block(s: str):
-            try:
-                return json.loads(s)
-            except Exception:
-                pass
-            # Strip common fences
-            if "```" in s:
-                s2 = s.replace("```json", "```")
-                parts = s2.split("```")
-                for seg in parts:
-                    seg = seg.strip()
-                    if seg.startswith("{") and seg.endswith("}"):
-                        try:
-                            return json.loads(seg)
-                        except Exception:
-                            continue
-            # Fallback: first {...}
-            start = s.find("{")
-            end = s.rfind("}")
-            if start != -1 and end != -1 and end > start:
-                candidate = s[start:end+1]
-                try:
-                    return json.loads(candidate)
-                except Exception:
-                    pass
-            return None
+    def _generate_answer(self, query: str, context: List[str]) -> str:
+        return self._generate("answer", query, context, self._answer_prompt(query, context))
 
-        try:
-            data = _extract_json_block(resp_text) or {}
-            if data:
-                label_str = str(data.get("label", "other")).lower()
-                # Normalize to enum
-                for e in RagResponse:
-                    if e.value.lower() == label_str:
-                        parsed_label = e
-                        break
-                conf = float(data.get("confidence", 0.5))
-                parsed_conf = max(0.0, min(1.0, conf))
-                rationale = str(data.get("rationale", rationale))
-        except Exception:
-            # Keep defaults if parsing fails
-            pass
+    def _classify(self, query: str, answer: str, context: List[str]) -> Tuple[RagResponse, float, str]:
+        """
+        Ask the model to classify the verification outcome.
+
+        Returns (label, confidence, rationale).
+        """
+        prompt = self._classify_prompt(query, answer, context)
+        # The answer is part of the prompt, so it is part of the cached context
+        resp_text = self._generate("classify", query, [*context, answer], prompt, self._generation_config())
+        return _parse_classification(_extract_json_block(resp_text), resp_text)
+
+    def _answer_and_classify(self, query: str, context: List[str]) -> Tuple[str, RagResponse, float, str]:
+        """
+        Answer and classify in one structured generation (single-call mode).
+
+        Returns (answer, label, confidence, rationale).
+        """
+        prompt = self._answer_classify_prompt(query, context)
+        resp_text = self._generate("answer_classify", query, context, prompt, self._generation_config())
+        return self._parse_answer_classification(resp_text)
+
+    async def _agenerate(
+        self,
+        kind: str,
+        claim: str,
+        context: List[str],
+        prompt: str,
+        generation_config: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        """Async ``_generate``; cache lookups run in a worker thread (they may hit Redis)."""
+        key = None
+        if self._llm_cache is not None:
+            key = cache_key(kind, claim, context, self._model_name, generation_config)
+            cached = await asyncio.to_thread(self._llm_cache.get, key)
+            if cached is not None:
+                return cached
+
+        text = await self._backend.agenerate(prompt, generation_config)
 
-        return parsed_label, parsed_conf, rationale
+        if key is not None:
+            await asyncio.to_thread(self._llm_cache.set, key, text)
+        return text
+
+    async def _aretrieve(self, q_emb: List[float], k: int, index: Optional[VectorIndex]) -> List[str]:
+        if not q_emb:
+            return []
+        if index is not None and not self._use_knowledge_base:
+            return [doc for doc, _ in index.query(q_emb, k)]
+        # Chroma is blocking
+        return await asyncio.to_thread(self._rank, q_emb, k, index)
 
-    def verify(self, request: RagRequest, top_k: int = 4) -> Dict[str, Any]:
+    def verify(
+        self,
+        request: RagRequest,
+        top_k: int = 4,
+        progress: Optional[ProgressCallback] = None,
+    ) -> Dict[str, Any]:
         """
         Execute the RAG flow for a verification request.
+
+        ``progress`` receives an event after each stage (embeddings stored,
+        retrieval, answer, classification).
         """
         if not request or not request.post_content:
             return {
@@ -212,17 +446,96 @@ class VerificationRAGPipeline:
 
         # Use the post content itself as the claim; build corpus strictly from provided context (no leakage of claim)
         claim = request.post_content
-        # Ensure prior runs didn't persist the claim into the vector store
-        try:
-            self._collection.delete(where_document={"$contains": claim})
-        except Exception:
-            pass
         corpus_inputs = request.context or []
-        self._build_corpus(contents=corpus_inputs, summary=None)
-        retrieved = self._retrieve(query=claim, k=top_k)
-        answer = self._generate_answer(query=claim, context=retrieved)
-        label, confidence, rationale = self._classify(claim, answer, retrieved)
+        if self._retrieval_mode == "chroma":
+            # A re-verification replaces the passages stored for the post last time
+            self._forget_post(request.post_id)
+            index = None
+            stored = self._build_corpus(
+                contents=corpus_inputs, summary=None, post_id=request.post_id, sources=request.sources
+            )
+        else:
+            index = self._build_index(contents=corpus_inputs, summary=None)
+            stored = len(index)
+        emit_event(progress, "embeddings_stored", documents=stored)
+        retrieved = self._retrieve(query=claim, k=top_k, index=index)
+        emit_event(progress, "retrieved", count=len(retrieved), hits=[doc[:200] for doc in retrieved])
+        if self._generation_mode == "single":
+            answer, label, confidence, rationale = self._answer_and_classify(claim, retrieved)
+            emit_event(progress, "answer_generated", answer=answer)
+        else:
+            answer = self._generate_answer(query=claim, context=retrieved)
+            emit_event(progress, "answer_generated", answer=answer)
+            label, confidence, rationale = self._classify(claim, answer, retrieved)
+        emit_event(progress, "classified", status=label.value, confidence=confidence)
+        return self._result(request, label, confidence, answer, retrieved, rationale)
 
+    async def averify(
+        self,
+        request: RagRequest,
+        top_k: int = 4,
+        progress: Optional[ProgressCallback] = None,
+    ) -> Dict[str, Any]:
+        """
+        Async ``verify``: the same stages and events, without blocking the event loop.
+
+        In ephemeral mode the passages and the claim are embedded concurrently.
+        """
+        if not request or not request.post_content:
+            return {
+                "status": RagResponse.UNVERIFIED.value,
+                "reason": "No content provided for verification",
+            }
+
+        claim = request.post_content
+        corpus_inputs = request.context or []
+        if self._retrieval_mode == "chroma":
+            def store() -> int:
+                self._forget_post(request.post_id)
+                return self._build_corpus(
+                    contents=corpus_inputs, summary=None, post_id=request.post_id, sources=request.sources
+                )
+
+            index = None
+            stored, (q_emb,) = await asyncio.gather(asyncio.to_thread(store), _aembed_texts([claim], self._backend))
+        else:
+            index = VectorIndex()
+            dedup = self._corpus(corpus_inputs, None)
+            embeddings, (q_emb,) = await asyncio.gather(
+                _aembed_texts(dedup, self._backend), _aembed_texts([claim], self._backend)
+            )
+            index.add(dedup, embeddings)
+            stored = len(index)
+        emit_event(progress, "embeddings_stored", documents=stored)
+        retrieved = await self._aretrieve(q_emb, top_k, index)
+        emit_event(progress, "retrieved", count=len(retrieved), hits=[doc[:200] for doc in retrieved])
+        if self._generation_mode == "single":
+            resp_text = await self._agenerate(
+                "answer_classify", claim, retrieved,
+                self._answer_classify_prompt(claim, retrieved), self._generation_config(),
+            )
+            answer, label, confidence, rationale = self._parse_answer_classification(resp_text)
+            emit_event(progress, "answer_generated", answer=answer)
+        else:
+            answer = await self._agenerate("answer", claim, retrieved, self._answer_prompt(claim, retrieved))
+            emit_event(progress, "answer_generated", answer=answer)
+            resp_text = await self._agenerate(
+                "classify", claim, [*retrieved, answer],
+                self._classify_prompt(claim, answer, retrieved), self._generation_config(),
+            )
+            label, confidence, rationale = _parse_classification(_extract_json_block(resp_text), resp_text)
+        emit_event(progress, "classified", status=label.value, confidence=confidence)
+        return self._result(request, label, confidence, answer, retrieved, rationale)
+
+    def _result(
+        self,
+        request: RagRequest,
+        label: RagResponse,
+        confidence: float,
+        answer: str,
+        retrieved: List[str],
+        rationale: str,
+    ) -> Dict[str, Any]:
         return {
             "status": label.value,
             "confidence": confidence,
@@ -231,6 +544,7 @@ class VerificationRAGPipeline:
             "rationale": rationale,
             "metadata": {
                 "post_id": request.post_id,
+                "generation_mode": self._generation_mode,
             },
         }
 
@@ -0,0 +1,62 @@
+"""
+In-memory cosine similarity index for one verification request.
+
+A verification retrieves from a few dozen passages, so a brute-force dot
+product over L2-normalized vectors is faster than round-tripping through a
+persistent vector store, and every request gets its own index: concurrent
+verifications can never see each other's documents.
+"""
+
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+
+class VectorIndex:
+    """Brute-force cosine index over ``(document, embedding)`` pairs."""
+
+    def __init__(self) -> None:
+        self._documents: List[str] = []
+        self._vectors: List[np.ndarray] = []
+        self._matrix = None
+
+    def add(self, documents: Sequence[str], embeddings: Sequence[Sequence[float]]) -> int:
+        """Add documents with their embeddings; documents without an embedding are skipped.
+
+        Returns:
+            Number of documents added
+        """
+        added = 0
+        for document, embedding in zip(documents, embeddings):
+            if not embedding:
+                continue
+            vector = np.asarray(embedding, dtype=np.float32)
+            norm = np.linalg.norm(vector)
+            if not norm:
+                continue
+            self._documents.append(document)
+            self._vectors.append(vector / norm)
+            added += 1
+        if added:
+            self._matrix = None
+        return added
+
+    def query(self, embedding: Sequence[float], k: int = 4) -> List[Tuple[str, float]]:
+        """Top ``k`` documents by cosine similarity, best first, as ``(document, similarity)``."""
+        if not self._documents or not embedding:
+            return []
+        query = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        if not norm:
+            return []
+        if self._matrix is None:
+            self._matrix = np.vstack(self._vectors)
+
+        scores = self._matrix @ (query / norm)
+        k = min(max(1, k), len(self._documents))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(self._documents[i], float(scores[i])) for i in top]
+
+    def __len__(self) -> int:
+        return len(self._documents)
@@ -0,0 +1,49 @@
+"""
+HTML parsing for the scrapers.
+
+Pages are parsed with lxml, restricted by a ``SoupStrainer`` to the article
+container when the site layout is known, which skips building the tree for
+scripts, navigation and sidebars. html5lib is much slower but repairs broken
+markup the way browsers do (indiatoday serves such pages), so it is only used
+as a fallback when the fast parse does not contain the expected structure.
+"""
+
+from typing import Callable, Optional, TypeVar
+
+import bs4
+
+FAST_PARSER = "lxml"
+FALLBACK_PARSER = "html5lib"
+
+T = TypeVar("T")
+
+# Raised by extractors when an expected element is missing (``None.find`` etc.)
+STRUCTURE_ERRORS = (AttributeError, IndexError, KeyError, TypeError, ValueError)
+
+
+def parse_html(html, parser: str = FAST_PARSER, only: Optional[bs4.SoupStrainer] = None) -> bs4.BeautifulSoup:
+    if parser == FALLBACK_PARSER:
+        # html5lib always builds the full tree
+        only = None
+    return bs4.BeautifulSoup(html, parser, parse_only=only)
+
+
+def parse_with_fallback(
+    html,
+    extract: Callable[[bs4.BeautifulSoup], T],
+    only: Optional[bs4.SoupStrainer] = None,
+) -> T:
+    """Run ``extract`` on a fast (partial) lxml parse, re-parsing with html5lib if it fails.
+
+    Args:
+        html: Raw page bytes or text
+        extract: Pulls the result out of a parsed tree; raises if the structure is missing
+        only: Optional strainer limiting the fast parse to the article container
+
+    Returns:
+        Whatever ``extract`` returns
+    """
+    try:
+        return extract(parse_html(html, FAST_PARSER, only))
+    except STRUCTURE_ERRORS:
+        return extract(parse_html(html, FALLBACK_PARSER))
@@ -0,0 +1,239 @@
+"""
+Per-domain politeness for outbound scraping.
+
+Every page fetch takes a slot from the scheduler for its domain first:
+
+- At most ``SCRAPING_DOMAIN_CONCURRENCY`` requests to one domain are in flight
+  in this process; further requests queue until a slot frees up.
+- Consecutive requests to one domain start at least ``SCRAPING_DELAY`` seconds
+  apart. With ``SCRAPING_POLITENESS_BACKEND=redis`` the next free start time is
+  reserved in Redis, so the spacing holds across all API and worker processes.
+
+``slot`` blocks the calling thread; ``aslot`` is the asyncio equivalent for the
+async scraping path and shares the same per-domain caps and spacing.
+
+Time spent waiting for a slot is recorded per domain (and, with the Redis
+backend, summed across processes) to show how much scrape latency is politeness.
+"""
+
+import asyncio
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+from redis.exceptions import RedisError
+
+from app.core.config import settings
+from app.core.redis import get_redis_client
+
+NEXT_SLOT_KEY = "scrape_politeness:next:{domain}"
+STATS_KEY = "scrape_politeness:stats"
+
+# How often aslot retries a domain whose slots are all taken
+ASYNC_POLL_SECONDS = 0.05
+
+# KEYS: next slot of the domain
+# ARGV: delay_ms
+# Returns how many ms the caller has to wait before starting its request
+_RESERVE_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local start = math.max(now, tonumber(redis.call('GET', KEYS[1]) or '0'))
+local delay = tonumber(ARGV[1])
+redis.call('SET', KEYS[1], start + delay, 'PX', start - now + delay + 1000)
+return start - now
+"""
+
+
+def domain_of(url: str) -> str:
+    host = (urlsplit(url).hostname or "").lower()
+    return host[4:] if host.startswith("www.") else host
+
+
+class _DomainState:
+    def __init__(self, max_in_flight: int) -> None:
+        self.slots = threading.BoundedSemaphore(max_in_flight)
+        self.next_start = 0.0
+        self.requests = 0
+        self.waiting = 0
+        self.in_flight = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+
+class DomainScheduler:
+    """Spaces and caps concurrent requests per domain.
+
+    Args:
+        delay: Minimum seconds between request starts to one domain
+        max_per_domain: Concurrent requests to one domain in this process
+        use_redis: Reserve start times in Redis so spacing is shared across processes
+    """
+
+    def __init__(
+        self,
+        delay: Optional[float] = None,
+        max_per_domain: Optional[int] = None,
+        use_redis: Optional[bool] = None,
+    ) -> None:
+        self.delay = max(0.0, delay if delay is not None else settings.scraping.delay)
+        self.max_per_domain = max(1, max_per_domain or settings.scraping.domain_concurrency)
+        if use_redis is None:
+            use_redis = settings.scraping.politeness_backend == "redis"
+        self.use_redis = use_redis
+        self._domains: Dict[str, _DomainState] = {}
+        self._lock = threading.Lock()
+        self._reserve_script = None
+
+    def _state(self, domain: str) -> _DomainState:
+        with self._lock:
+            state = self._domains.get(domain)
+            if state is None:
+                state = self._domains[domain] = _DomainState(self.max_per_domain)
+            return state
+
+    def _reserve_local(self, state: _DomainState) -> float:
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, state.next_start)
+            state.next_start = start + self.delay
+            return start - now
+
+    def _reserve(self, domain: str, state: _DomainState) -> float:
+        """Seconds to sleep before this request may start."""
+        if self.use_redis:
+            try:
+                if self._reserve_script is None:
+                    self._reserve_script = get_redis_client().register_script(_RESERVE_SCRIPT)
+                wait_ms = self._reserve_script(
+                    keys=[NEXT_SLOT_KEY.format(domain=domain)], args=[int(self.delay * 1000)]
+                )
+                return int(wait_ms) / 1000
+            except RedisError as e:
+                print(f"Politeness reservation in Redis failed for {domain}, spacing locally: {e}")
+        return self._reserve_local(state)
+
+    def _record(self, domain: str, waited: float) -> None:
+        if not self.use_redis:
+            return
+        try:
+            pipe = get_redis_client().pipeline(transaction=False)
+            pipe.hincrby(STATS_KEY, f"{domain}:requests", 1)
+            pipe.hincrbyfloat(STATS_KEY, f"{domain}:wait_seconds", round(waited, 4))
+            pipe.execute()
+        except RedisError as e:
+            print(f"Failed to record politeness stats for {domain}: {e}")
+
+    def _queue(self, url: str):
+        domain = domain_of(url)
+        state = self._state(domain)
+        with self._lock:
+            state.waiting += 1
+        return domain, state, time.monotonic()
+
+    def _start(self, state: _DomainState, queued_at: float) -> float:
+        waited = time.monotonic() - queued_at
+        with self._lock:
+            state.waiting -= 1
+            state.in_flight += 1
+            state.requests += 1
+            state.total_wait += waited
+            state.max_wait = max(state.max_wait, waited)
+        return waited
+
+    def _finish(self, state: _DomainState, started: bool) -> None:
+        with self._lock:
+            if started:
+                state.in_flight -= 1
+            else:
+                state.waiting -= 1
+        state.slots.release()
+
+    @contextmanager
+    def slot(self, url: str):
+        """Hold a request slot for the URL's domain; yields the seconds spent waiting."""
+        domain, state, queued_at = self._queue(url)
+        state.slots.acquire()
+        started = False
+        try:
+            pause = self._reserve(domain, state)
+            if pause > 0:
+                time.sleep(pause)
+            waited = self._start(state, queued_at)
+            started = True
+            self._record(domain, waited)
+            yield waited
+        finally:
+            self._finish(state, started)
+
+    @asynccontextmanager
+    async def aslot(self, url: str):
+        """``slot`` for coroutines: waits on the event loop instead of blocking a thread."""
+        domain, state, queued_at = self._queue(url)
+        try:
+            # The slots are shared with threads using slot(), so poll rather than block
+            while not state.slots.acquire(blocking=False):
+                await asyncio.sleep(ASYNC_POLL_SECONDS)
+        except BaseException:
+            with self._lock:
+                state.waiting -= 1
+            raise
+        started = False
+        try:
+            if self.use_redis:
+                pause = await asyncio.to_thread(self._reserve, domain, state)
+            else:
+                pause = self._reserve_local(state)
+            if pause > 0:
+                await asyncio.sleep(pause)
+            waited = self._start(state, queued_at)
+            started = True
+            if self.use_redis:
+                await asyncio.to_thread(self._record, domain, waited)
+            yield waited
+        finally:
+            self._finish(state, started)
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Per-domain request and wait counters of this process."""
+        with self._lock:
+            return {
+                domain: {
+                    "requests": s.requests,
+                    "waiting": s.waiting,
+                    "in_flight": s.in_flight,
+                    "total_wait_seconds": round(s.total_wait, 3),
+                    "avg_wait_seconds": round(s.total_wait / s.requests, 3) if s.requests else 0.0,
+                    "max_wait_seconds": round(s.max_wait, 3),
+                }
+                for domain, s in self._domains.items()
+            }
+
+
+def shared_stats() -> Dict[str, Dict[str, float]]:
+    """Per-domain requests and wait time summed over all processes (Redis backend only)."""
+    raw = get_redis_client().hgetall(STATS_KEY)
+    domains: Dict[str, Dict[str, float]] = {}
+    for field, value in raw.items():
+        domain, _, name = field.rpartition(":")
+        domains.setdefault(domain, {})[name] = float(value)
+    for counters in domains.values():
+        requests = counters.get("requests", 0)
+        counters["avg_wait_seconds"] = round(counters.get("wait_seconds", 0) / requests, 3) if requests else 0.0
+    return domains
+
+
+_scheduler: Optional[DomainScheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler() -> DomainScheduler:
+    """Get the process-wide scheduler shared by every WebScraper."""
+    global _scheduler
+    if _scheduler is None:
+        with _scheduler_lock:
+            if _scheduler is None:
+                _scheduler = DomainScheduler()
+    return _scheduler
@@ -0,0 +1,278 @@
+"""
+Persistent, URL-keyed cache of scraped articles (SQLite).
+
+Many posts about the same event link to the same news articles, so scraped
+``ScraperResult``s are kept on disk keyed by normalized URL:
+
+- Entries younger than ``SCRAPE_CACHE_TTL`` are served without any request.
+- Older entries are revalidated with ``If-None-Match`` / ``If-Modified-Since``
+  when the site sent an ETag or Last-Modified; a 304 refreshes the entry.
+- The table is capped at ``SCRAPE_CACHE_MAX_ENTRIES``, least recently used
+  entries are evicted first.
+
+Hit/miss counters live in the same database file, so every process on the host
+(API and workers) reports into one set of stats.
+
+Lookups only read, so concurrent scrapers never queue on SQLite's write lock
+for a cache hit or miss. Access times and counters are buffered in memory and
+written in one transaction with the next store, or once ``ACCESS_FLUSH_SIZE``
+of them pile up or ``ACCESS_FLUSH_INTERVAL`` seconds pass. SQLite errors
+(e.g. ``database is locked``) count as a miss or a skipped store; they never
+fail the scrape.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from app.core.config import settings
+from app.models.scraper import ScraperResult
+
+TRACKING_PARAMS = {"fbclid", "gclid", "dclid", "msclkid", "mc_cid", "mc_eid", "ref", "ref_src", "cmpid"}
+STAT_NAMES = ("hits", "stale", "misses", "revalidated", "stores", "evictions")
+
+# Buffered access times and counter bumps are written once this many pile up...
+ACCESS_FLUSH_SIZE = 100
+# ...or this many seconds after the last write
+ACCESS_FLUSH_INTERVAL = 10.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS scrape_cache (
+    url TEXT PRIMARY KEY,
+    result TEXT NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    fetched_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS scrape_cache_accessed_at ON scrape_cache (accessed_at);
+CREATE TABLE IF NOT EXISTS scrape_cache_stats (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+
+def normalize_url(url: str) -> str:
+    """Canonical cache key for a URL.
+
+    Lowercases scheme and host, drops default ports, fragments, tracking
+    parameters (``utm_*``, ``fbclid``, ...) and trailing slashes, and sorts the
+    remaining query parameters.
+    """
+    parts = urlsplit(url.strip())
+    scheme = (parts.scheme or "https").lower()
+    host = (parts.hostname or "").lower()
+    port = parts.port
+    netloc = host if port is None or (scheme, port) in (("http", 80), ("https", 443)) else f"{host}:{port}"
+
+    path = parts.path or "/"
+    if len(path) > 1:
+        path = path.rstrip("/")
+
+    query = urlencode(sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not k.lower().startswith("utm_") and k.lower() not in TRACKING_PARAMS
+    ))
+    return urlunsplit((scheme, netloc, path, query, ""))
+
+
+@dataclass
+class CacheEntry:
+    result: ScraperResult
+    etag: Optional[str]
+    last_modified: Optional[str]
+    fetched_at: float
+    fresh: bool
+
+    @property
+    def revalidatable(self) -> bool:
+        return bool(self.etag or self.last_modified)
+
+    def conditional_headers(self) -> Dict[str, str]:
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ScrapeCache:
+    """SQLite-backed cache of ``ScraperResult`` keyed by normalized URL."""
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        ttl: Optional[float] = None,
+        max_entries: Optional[int] = None,
+    ) -> None:
+        self.path = path or settings.scraping.cache_path
+        self.ttl = ttl if ttl is not None else settings.scraping.cache_ttl
+        self.max_entries = max_entries if max_entries is not None else settings.scraping.cache_max_entries
+        self._local = threading.local()
+        self._pending_lock = threading.Lock()
+        self._accessed: Dict[str, float] = {}
+        self._counts: Dict[str, int] = {}
+        self._last_write = time.time()
+
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        conn = self._conn()
+        conn.executescript(_SCHEMA)
+        conn.executemany(
+            "INSERT OR IGNORE INTO scrape_cache_stats (name, value) VALUES (?, 0)",
+            [(name,) for name in STAT_NAMES],
+        )
+        conn.commit()
+
+    def _conn(self) -> sqlite3.Connection:
+        # One connection per thread; scraping runs on a thread pool
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _bump(self, conn: sqlite3.Connection, name: str, amount: int = 1) -> None:
+        conn.execute("UPDATE scrape_cache_stats SET value = value + ? WHERE name = ?", (amount, name))
+
+    def _record(self, name: str, key: Optional[str] = None, now: Optional[float] = None) -> None:
+        """Buffer a counter bump (and an access time); write the buffer when it is due."""
+        now = now or time.time()
+        with self._pending_lock:
+            self._counts[name] = self._counts.get(name, 0) + 1
+            if key is not None:
+                self._accessed[key] = now
+            due = (
+                len(self._accessed) + len(self._counts) >= ACCESS_FLUSH_SIZE
+                or now - self._last_write >= ACCESS_FLUSH_INTERVAL
+            )
+        if due:
+            self.flush_pending()
+
+    def _write_pending(self, conn: sqlite3.Connection) -> None:
+        """Write buffered access times and counters inside the caller's transaction."""
+        with self._pending_lock:
+            accessed, self._accessed = self._accessed, {}
+            counts, self._counts = self._counts, {}
+            self._last_write = time.time()
+        if accessed:
+            conn.executemany(
+                "UPDATE scrape_cache SET accessed_at = MAX(accessed_at, ?) WHERE url = ?",
+                [(at, key) for key, at in accessed.items()],
+            )
+        for name, amount in counts.items():
+            self._bump(conn, name, amount)
+
+    def flush_pending(self) -> None:
+        """Write buffered access times and counters now."""
+        conn = self._conn()
+        try:
+            with conn:
+                self._write_pending(conn)
+        except sqlite3.Error as e:
+            print(f"Scrape cache stats write failed: {str(e)}")
+
+    def get(self, url: str) -> Optional[CacheEntry]:
+        """Look up a URL; stale entries are returned with ``fresh=False`` for revalidation.
+
+        A database error is reported as a miss.
+        """
+        key = normalize_url(url)
+        now = time.time()
+        try:
+            row = self._conn().execute(
+                "SELECT result, etag, last_modified, fetched_at FROM scrape_cache WHERE url = ?",
+                (key,),
+            ).fetchone()
+        except sqlite3.Error as e:
+            print(f"Scrape cache lookup failed: {str(e)}")
+            self._record("misses")
+            return None
+        if row is None:
+            self._record("misses")
+            return None
+        fresh = now - row[3] < self.ttl
+        self._record("hits" if fresh else "stale", key, now)
+
+        return CacheEntry(
+            result=ScraperResult.model_validate_json(row[0]),
+            etag=row[1],
+            last_modified=row[2],
+            fetched_at=row[3],
+            fresh=fresh,
+        )
+
+    def put(
+        self,
+        url: str,
+        result: ScraperResult,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> None:
+        """Store a scraped page; a database error skips the store."""
+        key = normalize_url(url)
+        now = time.time()
+        conn = self._conn()
+        try:
+            with conn:
+                # Buffered access times first, so eviction sees the real LRU order
+                self._write_pending(conn)
+                conn.execute(
+                    "INSERT OR REPLACE INTO scrape_cache (url, result, etag, last_modified, fetched_at, accessed_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, result.model_dump_json(), etag, last_modified, now, now),
+                )
+                self._bump(conn, "stores")
+                evicted = conn.execute(
+                    "DELETE FROM scrape_cache WHERE url IN ("
+                    "SELECT url FROM scrape_cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                    (max(0, self.max_entries),),
+                ).rowcount
+                if evicted:
+                    self._bump(conn, "evictions", evicted)
+        except sqlite3.Error as e:
+            print(f"Scrape cache store failed: {str(e)}")
+
+    def mark_revalidated(self, url: str) -> None:
+        """Record a 304: the cached copy is current again for another TTL."""
+        key = normalize_url(url)
+        conn = self._conn()
+        try:
+            with conn:
+                self._write_pending(conn)
+                conn.execute("UPDATE scrape_cache SET fetched_at = ? WHERE url = ?", (time.time(), key))
+                self._bump(conn, "revalidated")
+        except sqlite3.Error as e:
+            print(f"Scrape cache revalidation failed: {str(e)}")
+
+    def stats(self) -> Dict[str, float]:
+        self.flush_pending()
+        conn = self._conn()
+        counters = dict(conn.execute("SELECT name, value FROM scrape_cache_stats").fetchall())
+        entries = conn.execute("SELECT COUNT(*) FROM scrape_cache").fetchone()[0]
+        lookups = counters.get("hits", 0) + counters.get("stale", 0) + counters.get("misses", 0)
+        served = counters.get("hits", 0) + counters.get("revalidated", 0)
+        return {
+            **{name: counters.get(name, 0) for name in STAT_NAMES},
+            "entries": entries,
+            "lookups": lookups,
+            "hit_ratio": round(counters.get("hits", 0) / lookups, 4) if lookups else 0.0,
+            # Fresh hits plus 304 revalidations: lookups that did not re-download the page
+            "served_from_cache_ratio": round(served / lookups, 4) if lookups else 0.0,
+        }
+
+    def clear(self) -> None:
+        with self._pending_lock:
+            self._accessed, self._counts = {}, {}
+        conn = self._conn()
+        with conn:
+            conn.execute("DELETE FROM scrape_cache")
+            conn.execute("UPDATE scrape_cache_stats SET value = 0")
@@ -10,152 +10,212 @@
 # - Implement error handling and rate limiting
 # - Integration with RAG pipeline for data processing
 
+import asyncio
 import bs4, sys, os
+import httpx
 import requests, datetime
+from dataclasses import dataclass
+from typing import Mapping
 from newspaper import Article
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../..")))
+from app.core.config import settings
+from app.core.http import get_async_http_client, get_http_session
 from app.models.scraper import ScraperResult
+from app.agents.scraper_agent.scrape_cache import ScrapeCache
+from app.agents.scraper_agent.parsing import FALLBACK_PARSER, parse_html, parse_with_fallback
+from app.agents.scraper_agent.sites import site_for_url
+from app.agents.scraper_agent.politeness import get_scheduler
 
-class WebScraper:
+HTML_CONTENT_TYPES = ("text/html", "application/xhtml+xml")
 
-    def __init__(self):
-        pass
 
-    def webscrape(self, url):
-        # detect base url
-        if url.startswith("https://www.indiatoday.in/"):
-            return self._indiatoday_webscrape(url)
-        elif url.startswith("https://www.livemint.com/"):
-            return self._livemint_webscrape(url)
-        elif url.startswith("https://www.ndtv.com/"):
-            return self._ndtv_webscrape(url)
-        else:
-            return self._generic_webscrape(url)
+@dataclass
+class FetchedPage:
+    """Status, headers and (possibly truncated) body of a fetched page."""
+    status_code: int
+    headers: Mapping[str, str]
+    content: bytes = b""
+    truncated: bool = False
 
 
-    def _indiatoday_webscrape(self, url):
-        
-        response = requests.get(url)
-        if response.status_code != 200:
-            raise ValueError("Failed to retrieve content")
-
-        soup = bs4.BeautifulSoup(response.content, "html5lib") # to fix broken tags returned by indiatoday
-        # body -> div#__next -> div#main -> div.temp__container -> div.temp__layout -> div.content__section  -> main
-        div_main = soup.body.find("div", id="__next").find("div", id="main")
-        div_temp_container = div_main.find("div", class_="temp__container")
-        content_section = div_temp_container.find("div", class_="temp__layout").find("div", class_="content__section")
-        main_tag = content_section.find("main").find("div", class_ = "lhs__section")
-
-        title = main_tag.find("h1").text.strip().strip("\"")
-        summary = main_tag.find("div", class_ = "Story_w__100__e1YfC").find("div", class_ = "wapper__kicker").find("h2").text.strip().strip("\"")
-
-        content_body = main_tag.find("div", class_ = "widgetgap")
-
-        time_posted = content_body.find("div", class_ = "Story_story__byline__7MVK3").find("div", class_ = "Story_profile__details__wyZj7")
-        time_posted = time_posted.find("div", class_ = "Story_stryupdates__wdMz_").find("span", class_ = "strydate").text.strip().replace("UPDATED: ", "")
-        # May 20, 2025 16:22 IST - format
-        time_posted = datetime.datetime.strptime(time_posted, "%b %d, %Y %H:%M IST") # assumtion always IST since indian website
-
-        articles = []
-        paras = content_body.find("div", class_ = "story-with-main-sec").find("div", class_ = "description")      
-        paras = paras.find_all("p")
-        for p in paras:
-            articles.append(p.text.strip())
-        
+class WebScraper:
 
-        return ScraperResult(
-            source=url,
-            title=title,
-            article_summary=summary,
-            date_published=time_posted,
-            content=articles
+    def __init__(self, cache=None, max_bytes=None, max_paragraphs=None):
+        # Pass a ScrapeCache to override the configured one (e.g. in tests)
+        if cache is None and settings.scraping.cache_enabled:
+            cache = ScrapeCache()
+        self.cache = cache
+        # 0 disables either cap
+        self.max_bytes = settings.scraping.max_bytes if max_bytes is None else max_bytes
+        self.max_paragraphs = settings.scraping.max_paragraphs if max_paragraphs is None else max_paragraphs
 
+    def webscrape(self, url):
+        if self.cache is None:
+            response = self._fetch(url)
+            return self._extract(url, response.content)
+
+        entry = self.cache.get(url)
+        if entry is not None and entry.fresh:
+            return entry.result
+
+        if entry is not None and entry.revalidatable:
+            response = self._fetch(url, entry.conditional_headers())
+            if response.status_code == 304:
+                self.cache.mark_revalidated(url)
+                return entry.result
+        else:
+            response = self._fetch(url)
+
+        result = self._extract(url, response.content)
+        self.cache.put(
+            url,
+            result,
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
         )
-    
-    def _livemint_webscrape(self, url):
-
-        response = requests.get(url)
-        if response.status_code != 200:
-            raise ValueError("Failed to retrieve content")
-
-        soup = bs4.BeautifulSoup(response.content, "html5lib")
-        # div#__next -> div.containerNew -> div.midSec -> div.storyPage_storyBox__9iWpG
-        content_body = soup.body.find("div", id="__next").find("div", class_="clearfix")
-        content_body = content_body.find("div", class_="midSec")
-        content_body = content_body.find("div", class_="storyPage_storyBox__9iWpG")
+        return result
 
-        title = content_body.find("h1", id="article-0").text.strip().strip("\"")
-        summary = content_body.find("h2", class_="storyPage_summary__K7jOt").text.strip().strip("\"")
+    async def awebscrape(self, url):
+        """``webscrape`` for the async pipeline.
 
-        time_posted = content_body.find("div", class_ = "storyPage_authorSocial__z7nHm").find("div", class_ = "storyPage_authorInfo__Dj3b4").find("div", class_ = "storyPage_authorDesc__cKKWd").find("div", class_ = "storyPage_date__iM8Kb").find("span").text.strip().strip("\"")
-        # 27 Aug 2025, 12:09 AM IST - format
-        time_posted = datetime.datetime.strptime(time_posted, "%d %b %Y, %I:%M %p IST")
-
-        articles = []
-        paras = content_body.find("div", class_ = "storyPage_storyContent__3xuFc").find_all("div", class_ = "storyParagraph")
-
-        for item in paras:
-            articles.append(item.find("p").text.strip().strip("\""))
-        
-
-        return ScraperResult(
-            source=url,
-            title=title,
-            article_summary=summary,
-            date_published=time_posted,
-            content=articles
+        The download waits on the event loop; cache lookups and parsing (CPU
+        bound, newspaper can take a second on a large page) run in worker
+        threads so they don't stall other verifications.
+        """
+        if self.cache is None:
+            response = await self._afetch(url)
+            return await asyncio.to_thread(self._extract, url, response.content)
+
+        entry = await asyncio.to_thread(self.cache.get, url)
+        if entry is not None and entry.fresh:
+            return entry.result
+
+        if entry is not None and entry.revalidatable:
+            response = await self._afetch(url, entry.conditional_headers())
+            if response.status_code == 304:
+                await asyncio.to_thread(self.cache.mark_revalidated, url)
+                return entry.result
+        else:
+            response = await self._afetch(url)
+
+        result = await asyncio.to_thread(self._extract, url, response.content)
+        await asyncio.to_thread(
+            self.cache.put,
+            url,
+            result,
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
         )
+        return result
 
+    def _site_scraper(self, url):
+        # hostname -> site spec, None for sites without a dedicated extractor
+        return site_for_url(url)
 
-    def _ndtv_webscrape(self, url):
-
-        headers = {
-            "Sec-CH-UA": '"Not;A=Brand";v="99", "Google Chrome";v="139", "Chromium";v="139"',
-            "Sec-Fetch-Site": "same-origin",
-            "Sec-Fetch-User": "?1",
-            "Upgrade-Insecure-Requests": "1",
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/139.0.0.0 Safari/537.36"
-        }
-
-        response = requests.get(url, headers=headers)
-        if response.status_code != 200:
-            # more descriptive
-            print(f"Failed to retrieve: {response.status_code}")
-            print(response.text)
-            raise ValueError("Failed to retrieve content")
+    def _fetch(self, url, extra_headers=None):
+        """GET a page with the site's headers, once the domain's politeness slot is free.
 
-        soup = bs4.BeautifulSoup(response.content, "html5lib")
-        # div.vjl-cnt -> div.vjl-cntr -> div.vjl-row -> div.vjl-Mid-1 -> div.vjl-row -> div.vjl-Mid-2 -> div.stp-wr -> div.sp-hd -> div.sp-cn -> 
-        content_body = soup.body.find("div", class_="vjl-cnt").find("div", class_="vjl-cntr").find("div", class_="vjl-row").find("div", class_="vjl-Mid-1")
+        The body is streamed and cut off at ``max_bytes``; non-HTML responses are
+        rejected from their headers before any of the body is downloaded. A 304 is
+        returned without a body for revalidation.
+        """
+        site = self._site_scraper(url)
+        headers = {**((site and site.headers) or {}), **(extra_headers or {})}
+        try:
+            with get_scheduler().slot(url):
+                with get_http_session().get(url, headers=headers, stream=True) as response:
+                    if response.status_code == 304 and extra_headers:
+                        return FetchedPage(status_code=304, headers=response.headers)
+                    if response.status_code != 200:
+                        # more descriptive
+                        print(f"Failed to retrieve {url}: {response.status_code}")
+                        raise ValueError("Failed to retrieve content")
+
+                    content_type = response.headers.get("Content-Type", "").split(";")[0].strip().lower()
+                    if content_type and content_type not in HTML_CONTENT_TYPES:
+                        print(f"Skipping {url}: unsupported content type {content_type}")
+                        raise ValueError(f"Unsupported content type {content_type}")
+
+                    content, truncated = self._read_capped(response)
+        except requests.RequestException as e:
+            print(f"Failed to retrieve content from {url}: {e}")
+            raise ValueError(f"Failed to retrieve content from {url}")
 
-        title = content_body.find("h1", class_="sp-ttl").text.strip().strip("\"").strip()
-        summary = content_body.find("h2", class_="sp-descp").text.strip().strip("\"").strip()
-        time_posted = content_body.find("nav", class_ = "pst-by").find("ul", class_ = "pst-by_ul").find_all("li")[2].find("span").text.strip().strip("\"").strip()
-        # format - Sep 02, 2025 16:11 pm IST
-        time_posted = datetime.datetime.strptime(time_posted, "%b %d, %Y %H:%M %p IST")
+        if truncated:
+            print(f"Truncated {url} at {self.max_bytes} bytes")
+        return FetchedPage(status_code=200, headers=response.headers, content=content, truncated=truncated)
 
-        paras = content_body.find("div", class_ = "sp_txt").find("div", class_ = "Art-exp_cn").find("div", class_ = "Art-exp_wr").find_all("p")
+    async def _afetch(self, url, extra_headers=None):
+        """Async ``_fetch`` on the event loop's ``httpx`` client, same checks and byte cap."""
+        site = self._site_scraper(url)
+        headers = {**((site and site.headers) or {}), **(extra_headers or {})}
+        try:
+            async with get_scheduler().aslot(url):
+                async with get_async_http_client().stream("GET", url, headers=headers) as response:
+                    if response.status_code == 304 and extra_headers:
+                        return FetchedPage(status_code=304, headers=response.headers)
+                    if response.status_code != 200:
+                        print(f"Failed to retrieve {url}: {response.status_code}")
+                        raise ValueError("Failed to retrieve content")
+
+                    content_type = response.headers.get("Content-Type", "").split(";")[0].strip().lower()
+                    if content_type and content_type not in HTML_CONTENT_TYPES:
+                        print(f"Skipping {url}: unsupported content type {content_type}")
+                        raise ValueError(f"Unsupported content type {content_type}")
+
+                    content, truncated = await self._aread_capped(response)
+        except httpx.HTTPError as e:
+            print(f"Failed to retrieve content from {url}: {e}")
+            raise ValueError(f"Failed to retrieve content from {url}")
 
-        articles = []
-        for item in paras:
-            articles.append(item.text.strip().strip("\""))
-        
-        return ScraperResult(
-            source=url,
-            title=title,
-            article_summary=summary,
-            date_published=time_posted,
-            content=articles
+        if truncated:
+            print(f"Truncated {url} at {self.max_bytes} bytes")
+        return FetchedPage(status_code=200, headers=response.headers, content=content, truncated=truncated)
+
+    async def _aread_capped(self, response):
+        chunks, size = [], 0
+        async for chunk in response.aiter_bytes(chunk_size=64 * 1024):
+            chunks.append(chunk)
+            size += len(chunk)
+            if self.max_bytes and size >= self.max_bytes:
+                return b"".join(chunks)[:self.max_bytes], True
+        return b"".join(chunks), False
+
+    def _read_capped(self, response):
+        """Read the body up to ``max_bytes``; returns (content, truncated)."""
+        chunks, size = [], 0
+        for chunk in response.iter_content(chunk_size=64 * 1024):
+            chunks.append(chunk)
+            size += len(chunk)
+            if self.max_bytes and size >= self.max_bytes:
+                return b"".join(chunks)[:self.max_bytes], True
+        return b"".join(chunks), False
+
+    def _cap(self, paragraphs):
+        return paragraphs[:self.max_paragraphs] if self.max_paragraphs else paragraphs
+
+    def _extract(self, url, html):
+        site = self._site_scraper(url)
+        if site is None:
+            return self._generic_webscrape(url, html)
+        return self._site_webscrape(site, url, html)
+
+    def _site_webscrape(self, site, url, html):
+        # Some sites (indiatoday) serve broken tags; parse_with_fallback re-parses those with html5lib
+        return parse_with_fallback(
+            html, lambda soup: site.extract(url, soup, self.max_paragraphs), site.strainer
         )
-    
-    def _generic_webscrape(self, url):
+
+    def _generic_webscrape(self, url, html):
         """
         A generic fallback scraper that uses the newspaper library to extract content.
         """
         try:
-            article = Article(url)
-            article.download()
+            # fetch_images would download the page's images to pick a top image we never use
+            article = Article(url, fetch_images=False)
+            # Parse the page we already fetched instead of letting newspaper download it again
+            article.download(input_html=bs4.UnicodeDammit(html).unicode_markup)
             article.parse()
 
             # Extract content
@@ -169,31 +229,26 @@ class WebScraper:
                 title=title,
                 article_summary=summary,
                 date_published=date_published,
-                content=content.split('\n')
+                content=self._cap(content.split('\n'))
             )
         except Exception as e:
             print(f"Failed to process {url} with newspaper3k: {e}")
             # Fallback to the previous generic scraper if newspaper fails
-            return self._old_generic_webscrape(url)
+            return self._old_generic_webscrape(url, html)
         
 
-    def _old_generic_webscrape(self, url):
+    def _old_generic_webscrape(self, url, html):
         """
-        A generic fallback scraper that extracts all meaningful text from a URL.
+        A generic fallback scraper that extracts all meaningful text from a page.
         It tries to remove common non-content elements like ads, scripts, and navigation.
         """
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/139.0.0.0 Safari/537.36"
-        }
-        try:
-            response = requests.get(url, headers=headers, timeout=10)
-            response.raise_for_status()  # Raise an exception for bad status codes
-        except requests.RequestException as e:
-            print(f"Failed to retrieve content from {url}: {e}")
-            raise ValueError(f"Failed to retrieve content from {url}")
-
-        soup = bs4.BeautifulSoup(response.content, "html5lib")
+        soup = parse_html(html)
+        if soup.body is None:
+            # lxml gave up on the markup; let html5lib repair it
+            soup = parse_html(html, FALLBACK_PARSER)
+        return self._old_generic_extract(url, soup)
 
+    def _old_generic_extract(self, url, soup):
         # Remove non-content tags
         for tag in soup(["script", "style", "footer", "header", "iframe", "noscript"]):
             tag.decompose()
@@ -211,7 +266,7 @@ class WebScraper:
         body_text = soup.body.get_text(separator="\n", strip=True)
         
         # Split text into a list of non-empty lines
-        articles = [line for line in body_text.split("\n") if line]
+        articles = self._cap([line for line in body_text.split("\n") if line])
 
         title = soup.title.string.strip() if soup.title else "No title found"
 
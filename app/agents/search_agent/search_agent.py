@@ -1,28 +1,39 @@
+import httpx
 import requests
 import os
 
+from app.core.http import get_async_http_client, get_http_session
 from app.models.post import PostContentRequest
 
-def search_web(post_content: str):
-    """Search for web links related to the post content using Google Custom Search API."""
+SEARCH_URL = "https://www.googleapis.com/customsearch/v1"
+
+
+def _search_params(post_content: str):
+    """Query parameters for the Custom Search API, or None without credentials."""
     api_key = os.getenv("GOOGLE_CUSTOM_SEARCH_API")
     search_engine_id = os.getenv("SEARCH_ENGINE_ID")
     
     # Check if API credentials are available
     if not api_key or not search_engine_id:
         print(f"Warning: Google Custom Search API credentials not found. API Key: {bool(api_key)}, Search Engine ID: {bool(search_engine_id)}")
-        return []
+        return None
     
-    url = "https://www.googleapis.com/customsearch/v1"
-    params = {
+    return {
         "q": post_content,
         "key": api_key,
         "cx": search_engine_id,
         "num": 5,
     }
+
+
+def search_web(post_content: str):
+    """Search for web links related to the post content using Google Custom Search API."""
+    params = _search_params(post_content)
+    if params is None:
+        return []
     
     try:
-        response = requests.get(url, params=params, timeout=10)
+        response = get_http_session().get(SEARCH_URL, params=params)
         response.raise_for_status()
         
         if response.status_code == 200:
@@ -39,16 +50,33 @@ def search_web(post_content: str):
         return []
 
 
+async def asearch_web(post_content: str):
+    """Async ``search_web``, on the event loop's pooled ``httpx`` client."""
+    params = _search_params(post_content)
+    if params is None:
+        return []
+
+    try:
+        response = await get_async_http_client().get(SEARCH_URL, params=params)
+        response.raise_for_status()
+        return response.json().get("items", [])
+    except httpx.HTTPError as e:
+        print(f"Error searching for links: {str(e)}")
+        return []
+    except Exception as e:
+        print(f"Unexpected error during search: {str(e)}")
+        return []
+
+
+def _links(search_results):
+    return [item["link"] for item in search_results or [] if item.get("link")]
+
+
 def get_links(post_data: PostContentRequest):
     """Get links from search results for post verification."""
-    search_results = search_web(post_data.content)
-    
-    if not search_results:
-        return []
-    
-    links = []
-    for item in search_results:
-        if item.get("link"):
-            links.append(item["link"])
-    
-    return links
\ No newline at end of file
+    return _links(search_web(post_data.content))
+
+
+async def aget_links(post_data: PostContentRequest):
+    """Async ``get_links``."""
+    return _links(await asearch_web(post_data.content))
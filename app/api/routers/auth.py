@@ -6,7 +6,9 @@ from app.core.config import APISettings
 from app.core.supabase import get_supabase_client
 from datetime import datetime,timedelta,timezone
 from app.core.config import settings
+from app.services.profile_service import invalidate_profile
 import traceback
+import hmac
 
 supabase = get_supabase_client()
 
@@ -80,6 +82,7 @@ async def login(credentials: HTTPAuthorizationCredentials = Depends(HTTPBearer()
         if not insert_response or not getattr(insert_response, "data", None):
             print(insert_response)
             raise HTTPException(status_code=500, detail=insert_response.error.message)
+        invalidate_profile(uid)
 
         return {"message": "User created successfully", "uid": uid}
         
@@ -107,6 +110,34 @@ def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(HTTPBea
         raise HTTPException(status_code=401, detail=f"Invalid token or user not found: {str(e)}")
 
 
+def get_optional_user(credentials: Optional[HTTPAuthorizationCredentials] = Depends(HTTPBearer(auto_error=False))):
+    """Resolve the caller for routes that also serve anonymous users.
+
+    Only the auth lookup is done (no profile query); returns ``{"uid": ...}`` or
+    ``None`` when no valid token was sent.
+    """
+    if not credentials:
+        return None
+    try:
+        user_from_jwt = supabase.auth.get_user(credentials.credentials)
+        if not user_from_jwt or not user_from_jwt.user:
+            return None
+        return {"uid": user_from_jwt.user.id}
+    except Exception as e:
+        print(f"Ignoring invalid token on public route: {str(e)}")
+        return None
+
+
+def require_operator(x_operator_key: Optional[str] = Header(None)):
+    """Allow only callers presenting ``VERIFICATION_BATCH_API_KEY`` (operator / service credential)."""
+    expected = settings.queue.batch_api_key
+    if not expected:
+        raise HTTPException(status_code=403, detail="Batch verification is only available from the CLI")
+    if not x_operator_key or not hmac.compare_digest(x_operator_key, expected):
+        raise HTTPException(status_code=403, detail="Operator key required")
+    return True
+
+
 @router.get("/me")
 def get_current_logged_in_user(user=Depends(get_current_user)):
     return {"message": "User is authenticated.", "user": user}
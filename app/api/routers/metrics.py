@@ -0,0 +1,60 @@
+from fastapi import APIRouter, HTTPException
+
+from app.agents.rag_agent.llm_cache import get_llm_cache
+from app.agents.scraper_agent import politeness
+from app.agents.scraper_agent.scrape_cache import ScrapeCache
+from app.core.config import settings
+from app.services import counter_service
+
+router = APIRouter(
+    prefix='/metrics',
+    tags=['Metrics']
+)
+
+
+@router.get('/counters')
+def counter_metrics():
+    """Buffered like/dislike deltas and how far Postgres lags behind them."""
+    try:
+        return counter_service.get_metrics()
+    except Exception as e:
+        raise HTTPException(status_code=503, detail=f"Counter metrics unavailable: {str(e)}")
+
+
+@router.get('/scrape-cache')
+def scrape_cache_metrics():
+    """Hit/miss counters of the on-disk scrape cache shared by this host's processes."""
+    if not settings.scraping.cache_enabled:
+        return {"enabled": False}
+    return {"enabled": True, **ScrapeCache().stats()}
+
+
+@router.get('/scraping')
+def scraping_metrics():
+    """Per-domain politeness wait times: this process, and all processes with the Redis backend."""
+    scheduler = politeness.get_scheduler()
+    shared = None
+    if scheduler.use_redis:
+        try:
+            shared = politeness.shared_stats()
+        except Exception as e:
+            raise HTTPException(status_code=503, detail=f"Scraping metrics unavailable: {str(e)}")
+    return {
+        "delay": scheduler.delay,
+        "max_per_domain": scheduler.max_per_domain,
+        "backend": "redis" if scheduler.use_redis else "local",
+        "process": scheduler.stats(),
+        "all_processes": shared,
+    }
+
+
+@router.get('/llm-cache')
+def llm_cache_metrics():
+    """Size of the Gemini response cache and this process's hit/miss counts."""
+    cache = get_llm_cache()
+    if cache is None:
+        return {"enabled": False}
+    try:
+        return {"enabled": True, **cache.stats()}
+    except Exception as e:
+        raise HTTPException(status_code=503, detail=f"LLM cache metrics unavailable: {str(e)}")
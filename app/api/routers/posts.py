@@ -1,11 +1,18 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Query
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from app.models import post
 from app.core.config import settings
 from app.core.supabase import get_supabase_client
 from . import auth
 from datetime import datetime
-from typing import List
-from app.services.verification_service import verify_post
+from typing import List, Optional
+from app.services.verification_service import averify_post, forget_claim
+from app.services.verification_stream import stream_verification
+from app.services.profile_service import hydrate_authors
+from app.core.pagination import apply_keyset, split_page
+from app.services import counter_service, reaction_service, verification_queue
+from redis.exceptions import RedisError
 
 
 router = APIRouter(
@@ -15,6 +22,9 @@ router = APIRouter(
 
 supabase = get_supabase_client()
 
+# Columns needed to build a ShowPost; author fields are hydrated separately
+POST_COLUMNS = 'pid, owner_id, content, likes, dislikes, verification_status, created_at'
+
 
 #  Upload media + create a post
 @router.post('/', response_model=post.ShowPost)
@@ -28,26 +38,25 @@ def create_post(
         'created_at': datetime.utcnow().isoformat(),
         'likes': 0,
         'dislikes': 0,
-        "verification_status": "unverified",
+        "verification_status": "pending",
     }
 
     res = supabase.table('posts').insert(new_post).execute()
     if not res.data:
         raise HTTPException(status_code=400, detail='Error creating the post')
-    
-    # Run verification directly (synchronous) for now
+
+    pid = res.data[0]["pid"]
+    verification_status = "pending"
     try:
-        verify_post(post.PostContentRequest(pid=res.data[0]["pid"], content=post_data.content))
+        verification_queue.enqueue_verification(pid, post_data.content)
     except Exception as e:
-        # Log the error but don't fail the post creation
-        print(f"Verification failed for post {res.data[0]['pid']}: {str(e)}")
-        # Optionally, you could set verification status to error here
-        # supabase.table('posts').update({"verification_status": "error"}).eq("pid", res.data[0]["pid"]).execute()
-    # Get the updated post data with verification status
-    updated_post = supabase.table('posts').select('*').eq('pid', res.data[0]["pid"]).single().execute()
-    
+        # Don't fail the post creation if the queue is unreachable
+        print(f"Failed to enqueue verification for post {pid}: {str(e)}")
+        verification_status = "unverified"
+        supabase.table('posts').update({"verification_status": verification_status}).eq("pid", pid).execute()
+
     return {
-        "pid": res.data[0]["pid"],
+        "pid": pid,
         "content": res.data[0]["content"],
         "owner_id": user["uid"],
         "author_name": user.get("username"),
@@ -55,46 +64,56 @@ def create_post(
         "dislikes": 0,
         "score": 0,
         "comments_count": 0,
-        "verification_status": updated_post.data.get("verification_status", "unverified"),
+        "verification_status": verification_status,
         "created_at": res.data[0]["created_at"],
     }
 
 
-def insert_author_name(posts: List[dict]) -> List[dict]:
-    for post in posts:
-        user_res = supabase.table('users').select('username, full_name, profile_pic_url').eq('uid', post['owner_id']).single().execute()
-        if user_res.data:
-            post['author_name'] = user_res.data.get('username')
-            post['author_display_name'] = user_res.data.get('full_name')
-            post['author_avatar'] = user_res.data.get('profile_pic_url')
-        else:
-            post['author_name'] = 'Unknown'
-            post['author_display_name'] = None
-            post['author_avatar'] = None
-    
-    return posts
+def _present(posts: List[dict], user: Optional[dict]) -> List[dict]:
+    posts = counter_service.overlay_live_counts(hydrate_authors(posts))
+    return reaction_service.mark_liked(posts, user['uid'] if user else None)
+
+
+def _list_posts(query, limit: int, cursor: Optional[str], user: Optional[dict]) -> dict:
+    try:
+        query = apply_keyset(query, cursor, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    res = query.execute()
+    items, next_cursor = split_page(res.data, limit)
+    return {"items": _present(items, user), "next_cursor": next_cursor}
+
 
 #  Get all posts
-@router.get('/', response_model=List[post.ShowPost])
-def get_all_posts():
-    res = supabase.table('posts').select('*').execute()
-    return insert_author_name(res.data)
+@router.get('/', response_model=post.PostPage)
+def get_all_posts(
+    limit: int = Query(settings.pagination.default_page_size, ge=1, le=settings.pagination.max_page_size),
+    cursor: Optional[str] = None,
+    user=Depends(auth.get_optional_user),
+):
+    query = supabase.table('posts').select(POST_COLUMNS)
+    return _list_posts(query, limit, cursor, user)
 
 
 #  Get user's posts
-@router.get('/users/{uid}/posts', response_model=List[post.ShowPost])
-def user_posts(uid: str):
-    res = supabase.table('posts').select('*').eq('owner_id', uid).execute()
-    return insert_author_name(res.data)
+@router.get('/users/{uid}/posts', response_model=post.PostPage)
+def user_posts(
+    uid: str,
+    limit: int = Query(settings.pagination.default_page_size, ge=1, le=settings.pagination.max_page_size),
+    cursor: Optional[str] = None,
+    user=Depends(auth.get_optional_user),
+):
+    query = supabase.table('posts').select(POST_COLUMNS).eq('owner_id', uid)
+    return _list_posts(query, limit, cursor, user)
 
 
 #  Get single post by pid
 @router.get('/{pid}', response_model=post.ShowPost)
-def get_single_post(pid: str):
-    res = supabase.table('posts').select('*').eq('pid', pid).single().execute()
+def get_single_post(pid: str, user=Depends(auth.get_optional_user)):
+    res = supabase.table('posts').select(POST_COLUMNS).eq('pid', pid).single().execute()
     if not res.data:
         raise HTTPException(status_code=404, detail="Post not found")
-    return insert_author_name([res.data])[0]
+    return _present([res.data], user)[0]
 
 
 #  Delete post
@@ -106,6 +125,11 @@ def delete_post(pid: str, user = Depends(auth.get_current_user)):
         raise HTTPException(status_code=403, detail='Not authorized')
 
     supabase.table('posts').delete().eq('pid', pid).execute()
+    try:
+        counter_service.forget(pid)
+        reaction_service.forget(pid)
+    except RedisError as e:
+        print(f"Failed to drop live counters and reactions for post {pid}: {str(e)}")
     return {"message": f"Post with id {pid} deleted successfully"}
 
 @router.put('/{pid}', response_model=post.ShowPost)
@@ -118,50 +142,149 @@ def update_post(
     if not res.data or res.data['owner_id'] != user['uid']:
         raise HTTPException(status_code=403, detail='Not authorized')
 
-    updated = supabase.table('posts').update({
-        'content': post_content,
-    }).eq('pid', pid).execute()
+    content_changed = post_content != res.data.get('content')
+    changes = {'content': post_content}
+    if content_changed:
+        changes['verification_status'] = 'pending'
+    updated = supabase.table('posts').update(changes).eq('pid', pid).execute()
+
+    if content_changed:
+        # The old verdict no longer applies: near-duplicates of the old text must not
+        # inherit it, and the new text is verified like a new post
+        try:
+            forget_claim(pid)
+        except Exception as e:
+            print(f"Failed to drop claim index entry of post {pid}: {str(e)}")
+        try:
+            verification_queue.enqueue_verification(pid, post_content)
+        except Exception as e:
+            print(f"Failed to enqueue verification for post {pid}: {str(e)}")
+            updated = supabase.table('posts').update({"verification_status": "unverified"}).eq("pid", pid).execute()
+
+    return _present([updated.data[0]], user)[0]
 
-    return insert_author_name([updated.data[0]])[0]
 
 
+def _react(pid: str, user: dict, kind: str) -> dict:
+    try:
+        result = reaction_service.react(user['uid'], pid, kind)
+    except counter_service.PostNotFound:
+        raise HTTPException(status_code=404, detail="Post not found")
+    except counter_service.CounterBusy:
+        raise HTTPException(status_code=503, detail="Reactions are temporarily unavailable, try again")
+    except RedisError as e:
+        print(f"Reaction update failed for post {pid}: {str(e)}")
+        raise HTTPException(status_code=503, detail="Reactions are temporarily unavailable")
+    return {
+        "pid": pid,
+        "likes": result["likes"],
+        "dislikes": result["dislikes"],
+        "reaction": result["reaction"],
+    }
+
 
 @router.post("/{pid}/like")
 def like_post(pid: str, user=Depends(auth.get_current_user)):
-    res = supabase.table("posts").select("likes").eq("pid", pid).single().execute()
+    return _react(pid, user, reaction_service.LIKE)
+
+
+@router.post("/{pid}/dislike")
+def dislike_post(pid: str, user=Depends(auth.get_current_user)):
+    return _react(pid, user, reaction_service.DISLIKE)
+
+
+@router.delete("/{pid}/reaction")
+def clear_reaction(pid: str, user=Depends(auth.get_current_user)):
+    return _react(pid, user, reaction_service.NONE)
+
+
+@router.get("/{pid}/verification")
+def verification_status(pid: str):
+    """Current verification status of a post and its background job, if any."""
+    res = supabase.table("posts").select("verification_status").eq("pid", pid).single().execute()
     if not res.data:
         raise HTTPException(status_code=404, detail="Post not found")
 
-    new_likes = res.data["likes"] + 1
-    supabase.table("posts").update({"likes": new_likes}).eq("pid", pid).execute()
-    return {"pid": pid, "likes": new_likes}
+    try:
+        job = verification_queue.get_verification_job_status(pid)
+    except RedisError as e:
+        print(f"Failed to read verification job for post {pid}: {str(e)}")
+        job = None
 
+    return {
+        "pid": pid,
+        "verification_status": res.data.get("verification_status", "unverified"),
+        "job": job,
+    }
 
-@router.post("/{pid}/dislike")
-def dislike_post(pid: str, user=Depends(auth.get_current_user)):
-    res = supabase.table("posts").select("dislikes").eq("pid", pid).single().execute()
+
+@router.get("/{pid}/verify/stream")
+async def verify_post_stream(pid: str, user=Depends(auth.get_current_user)):
+    """Verify a post and stream each pipeline stage as a Server-Sent Event."""
+    res = await run_in_threadpool(
+        lambda: supabase.table("posts").select("content").eq("pid", pid).single().execute()
+    )
     if not res.data:
         raise HTTPException(status_code=404, detail="Post not found")
 
-    new_dislikes = res.data["dislikes"] + 1
-    supabase.table("posts").update({"dislikes": new_dislikes}).eq("pid", pid).execute()
-    return {"pid": pid, "dislikes": new_dislikes}
+    # An explicit re-verification runs the pipeline instead of reusing a near-duplicate's verdict
+    return StreamingResponse(
+        stream_verification(post.PostContentRequest(pid=pid, content=res.data["content"]), reuse=False),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.post("/verify/batch", status_code=202)
+def verify_batch(request: post.BatchVerificationRequest, operator=Depends(auth.require_operator)):
+    """Queue verification of many posts, selected by id or by verification status (operators only)."""
+    if not request.post_ids and not request.status:
+        raise HTTPException(status_code=400, detail="Provide post_ids or a status to select posts by")
+
+    try:
+        job = verification_queue.enqueue_batch_verification(
+            post_ids=request.post_ids,
+            status=request.status,
+            limit=request.limit,
+            concurrency=request.concurrency,
+        )
+    except RedisError as e:
+        raise HTTPException(status_code=503, detail=f"Verification queue unavailable: {str(e)}")
+
+    return {"job_id": job.id, "status": "queued"}
+
+
+@router.get("/verify/batch/{job_id}")
+def verify_batch_status(job_id: str, operator=Depends(auth.require_operator)):
+    """Status, progress and (once finished) summary of a batch verification job."""
+    try:
+        job = verification_queue.get_batch_job_status(job_id)
+    except RedisError as e:
+        raise HTTPException(status_code=503, detail=f"Verification queue unavailable: {str(e)}")
+    if job is None:
+        raise HTTPException(status_code=404, detail="Batch job not found")
+    return job
 
 
 @router.post("/{pid}/verify")
-def verify_post_directly(pid: str, user=Depends(auth.get_current_user)):
+async def verify_post_directly(pid: str, user=Depends(auth.get_current_user)):
     """Test endpoint to verify a post directly without background queue"""
     try:
         # Get the post content
-        res = supabase.table("posts").select("content").eq("pid", pid).single().execute()
+        res = await run_in_threadpool(
+            lambda: supabase.table("posts").select("content").eq("pid", pid).single().execute()
+        )
         if not res.data:
             raise HTTPException(status_code=404, detail="Post not found")
         
-        # Run verification directly
-        result = verify_post(post.PostContentRequest(pid=pid, content=res.data["content"]))
+        # Run verification directly, on the event loop rather than a threadpool thread;
+        # an explicit re-verification does not reuse a near-duplicate's verdict
+        result = await averify_post(post.PostContentRequest(pid=pid, content=res.data["content"]), reuse=False)
         
         # Get updated post data
-        updated_post = supabase.table("posts").select("*").eq("pid", pid).single().execute()
+        updated_post = await run_in_threadpool(
+            lambda: supabase.table("posts").select("*").eq("pid", pid).single().execute()
+        )
         
         return {
             "message": "Verification completed",
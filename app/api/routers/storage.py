@@ -1,6 +1,7 @@
 from fastapi import APIRouter, File, UploadFile, HTTPException, Depends
 from app.core.supabase import get_supabase_client
 from app.api.routers.auth import get_current_user
+from app.services.profile_service import invalidate_profile
 import uuid
 
 supabase = get_supabase_client()
@@ -41,6 +42,7 @@ async def upload_profile_pic(
                 status_code=500,
                 detail="Failed to update profile picture."
             )
+        invalidate_profile(user_id)
 
         return {"profile_pic_url": url}
 
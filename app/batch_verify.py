@@ -0,0 +1,57 @@
+"""
+Batch verification from the command line.
+
+Verifies posts selected by id or by verification status in this process
+(see ``app/services/batch_verification.py``), printing progress as it goes:
+
+    python -m app.batch_verify --status unverified --limit 500 --concurrency 8
+    python -m app.batch_verify --ids 12 15 42
+
+With ``--enqueue`` the batch is queued for the verification worker
+(``python -m app.worker``) instead, and the job id is printed.
+"""
+
+import argparse
+import json
+
+from app.core.config import settings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Verify a batch of Hive posts")
+    selection = parser.add_mutually_exclusive_group(required=True)
+    selection.add_argument("--ids", nargs="+", help="Post ids to verify")
+    selection.add_argument("--status", help="Verify every post with this verification_status, e.g. unverified")
+    parser.add_argument("--limit", type=int, help=f"At most this many posts (max {settings.queue.batch_max_posts})")
+    parser.add_argument("--concurrency", type=int, help="Distinct claims verified at once")
+    parser.add_argument("--enqueue", action="store_true", help="Queue the batch for the worker instead of running it here")
+    args = parser.parse_args()
+
+    if args.enqueue:
+        from app.services.verification_queue import enqueue_batch_verification
+
+        job = enqueue_batch_verification(
+            post_ids=args.ids, status=args.status, limit=args.limit, concurrency=args.concurrency
+        )
+        print(f"Queued batch verification job {job.id} on '{settings.queue.verification_queue}'")
+        return
+
+    from app.services.batch_verification import verify_batch
+
+    def on_progress(summary):
+        print(
+            f"\r{summary['done']}/{summary['total']} posts ({summary['unique']} distinct), "
+            f"{summary['errors']} errors, {summary['posts_per_second']} posts/s",
+            end="",
+            flush=True,
+        )
+
+    summary = verify_batch(
+        post_ids=args.ids, status=args.status, limit=args.limit, concurrency=args.concurrency, progress=on_progress
+    )
+    print()
+    print(json.dumps(summary, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""
+Chroma compaction from the command line.
+
+Deletes stored passages older than ``CHROMA_DOC_TTL``, verified claims older
+than ``CLAIM_REUSE_MAX_AGE`` and the oldest passages beyond
+``CHROMA_MAX_DOCUMENTS`` (see ``app/agents/rag_agent/compaction.py``):
+
+    python -m app.compact_chroma
+    python -m app.compact_chroma --ttl 86400 --max-documents 20000
+
+Run it where the Chroma directory lives, e.g. from cron on the worker host, or
+pass ``--enqueue`` to have the verification worker (``python -m app.worker``)
+run it.
+"""
+
+import argparse
+import json
+
+from app.core.config import settings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compact the Hive Chroma collections")
+    parser.add_argument("--ttl", type=int, help=f"Passage TTL in seconds (default {settings.vectordb.doc_ttl}, 0 keeps them)")
+    parser.add_argument(
+        "--max-documents", type=int,
+        help=f"Passage collection size cap (default {settings.vectordb.max_documents}, 0 for no limit)",
+    )
+    parser.add_argument("--enqueue", action="store_true", help="Queue the compaction for the worker instead of running it here")
+    args = parser.parse_args()
+
+    if args.enqueue:
+        from app.services.verification_queue import enqueue_compaction
+
+        job = enqueue_compaction(ttl=args.ttl, max_documents=args.max_documents)
+        print(f"Queued Chroma compaction job {job.id} on '{settings.queue.verification_queue}'")
+        return
+
+    from app.agents.rag_agent.compaction import compact
+
+    print(json.dumps(compact(ttl=args.ttl, max_documents=args.max_documents), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -47,18 +47,45 @@ class GeminiSettings(BaseSettings):
     api_key: str = os.getenv("GEMINI_API_KEY", "")
     model: str = os.getenv("GEMINI_MODEL", "gemini-pro")
     embed_model: str = os.getenv("GEMINI_EMBED_MODEL", "models/embedding-001")
+    embed_batch_size: int = int(os.getenv("GEMINI_EMBED_BATCH_SIZE", "100"))
+    embed_cache_enabled: bool = os.getenv("EMBED_CACHE_ENABLED", "True").lower() == "true"
+    embed_cache_path: str = os.getenv("EMBED_CACHE_PATH", ".embed_cache/embeddings.sqlite3")
+    embed_cache_max_entries: int = int(os.getenv("EMBED_CACHE_MAX_ENTRIES", "50000"))
     max_output_tokens: int = int(os.getenv("GEMINI_MAX_TOKENS", "1000"))
     temperature: float = float(os.getenv("GEMINI_TEMPERATURE", "0.7"))
+    generation_mode: str = os.getenv("RAG_GENERATION_MODE", "single")
+    backend: str = os.getenv("RAG_BACKEND", "gemini")
     
     class Config:
         env_prefix = "GEMINI_"
 
 
+class LocalLLMSettings(BaseSettings):
+    """Offline deterministic RAG backend (RAG_BACKEND=local) for benchmarks and tests."""
+    
+    latency: float = float(os.getenv("LOCAL_LLM_LATENCY", "0"))
+    embed_latency: float = float(os.getenv("LOCAL_LLM_EMBED_LATENCY", "0"))
+    jitter: float = float(os.getenv("LOCAL_LLM_JITTER", "0"))
+    embed_dim: int = int(os.getenv("LOCAL_LLM_EMBED_DIM", "256"))
+    
+    class Config:
+        env_prefix = "LOCAL_LLM_"
+
+
 class VectorDBSettings(BaseSettings):
     """Vector database configuration (Chroma)."""
     
     chroma_persist_path: str = os.getenv("CHROMA_PERSIST_PATH", ".chroma")
     collection_name: str = os.getenv("CHROMA_COLLECTION", "verification_docs")
+    retrieval_mode: str = os.getenv("RAG_RETRIEVAL_MODE", "ephemeral")
+    knowledge_base_enabled: bool = os.getenv("CHROMA_KNOWLEDGE_BASE", "False").lower() == "true"
+    claim_collection: str = os.getenv("CHROMA_CLAIM_COLLECTION", "verified_claims")
+    claim_reuse_enabled: bool = os.getenv("CLAIM_REUSE_ENABLED", "True").lower() == "true"
+    claim_reuse_threshold: float = float(os.getenv("CLAIM_REUSE_THRESHOLD", "0.92"))
+    claim_reuse_max_age: int = int(os.getenv("CLAIM_REUSE_MAX_AGE", "604800"))
+    doc_ttl: int = int(os.getenv("CHROMA_DOC_TTL", "604800"))
+    max_documents: int = int(os.getenv("CHROMA_MAX_DOCUMENTS", "50000"))
+    compaction_job_timeout: int = int(os.getenv("CHROMA_COMPACTION_JOB_TIMEOUT", "1800"))
     
     class Config:
         env_prefix = "CHROMA_"
@@ -66,14 +93,96 @@ class VectorDBSettings(BaseSettings):
 class ScrapingSettings(BaseSettings):
     """Web scraping configuration settings."""
     
-    delay: int = int(os.getenv("SCRAPING_DELAY", "1"))
+    delay: float = float(os.getenv("SCRAPING_DELAY", "1"))
     timeout: int = int(os.getenv("SCRAPING_TIMEOUT", "30"))
     user_agent: str = os.getenv("SCRAPING_USER_AGENT", "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36")
     max_concurrent: int = int(os.getenv("MAX_CONCURRENT_SCRAPES", "5"))
+    min_results: int = int(os.getenv("SCRAPING_MIN_RESULTS", "3"))
+    connect_timeout: float = float(os.getenv("SCRAPING_CONNECT_TIMEOUT", "5"))
+    max_connections_per_host: int = int(os.getenv("SCRAPING_MAX_CONNECTIONS_PER_HOST", "4"))
+    pool_hosts: int = int(os.getenv("SCRAPING_POOL_HOSTS", "32"))
+    retries: int = int(os.getenv("SCRAPING_RETRIES", "2"))
+    domain_concurrency: int = int(os.getenv("SCRAPING_DOMAIN_CONCURRENCY", "2"))
+    politeness_backend: str = os.getenv("SCRAPING_POLITENESS_BACKEND", "local")
+    max_bytes: int = int(os.getenv("SCRAPING_MAX_BYTES", str(2 * 1024 * 1024)))
+    max_paragraphs: int = int(os.getenv("SCRAPING_MAX_PARAGRAPHS", "50"))
+    cache_enabled: bool = os.getenv("SCRAPE_CACHE_ENABLED", "True").lower() == "true"
+    cache_path: str = os.getenv("SCRAPE_CACHE_PATH", ".scrape_cache/scrape_cache.sqlite3")
+    cache_ttl: int = int(os.getenv("SCRAPE_CACHE_TTL", "21600"))
+    cache_max_entries: int = int(os.getenv("SCRAPE_CACHE_MAX_ENTRIES", "5000"))
     
     class Config:
         env_prefix = "SCRAPING_"
 
+class LLMCacheSettings(BaseSettings):
+    """Cache of Gemini responses in the RAG pipeline."""
+    
+    backend: str = os.getenv("LLM_CACHE_BACKEND", "sqlite")
+    path: str = os.getenv("LLM_CACHE_PATH", ".llm_cache/llm_cache.sqlite3")
+    ttl: int = int(os.getenv("LLM_CACHE_TTL", "86400"))
+    max_entries: int = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "10000"))
+    
+    class Config:
+        env_prefix = "LLM_CACHE_"
+
+class ContextSettings(BaseSettings):
+    """Packing of scraped articles into the verification prompt."""
+    
+    token_budget: int = int(os.getenv("CONTEXT_TOKEN_BUDGET", "2000"))
+    chunk_chars: int = int(os.getenv("CONTEXT_CHUNK_CHARS", "600"))
+    dedupe_threshold: float = float(os.getenv("CONTEXT_DEDUPE_THRESHOLD", "0.8"))
+    
+    class Config:
+        env_prefix = "CONTEXT_"
+
+class CacheSettings(BaseSettings):
+    """In-process cache configuration."""
+    
+    profile_ttl: int = int(os.getenv("PROFILE_CACHE_TTL", "300"))
+    profile_max_entries: int = int(os.getenv("PROFILE_CACHE_SIZE", "10000"))
+    profile_batch_size: int = int(os.getenv("PROFILE_BATCH_SIZE", "100"))
+    
+    class Config:
+        env_prefix = "CACHE_"
+
+class CounterSettings(BaseSettings):
+    """Write-behind like/dislike counter configuration."""
+    
+    flush_interval: float = float(os.getenv("COUNTER_FLUSH_INTERVAL", "5"))
+    flush_batch_size: int = int(os.getenv("COUNTER_FLUSH_BATCH_SIZE", "500"))
+    value_ttl: int = int(os.getenv("COUNTER_VALUE_TTL", "86400"))
+    flusher_in_api: bool = os.getenv("COUNTER_FLUSHER_IN_API", "True").lower() == "true"
+    
+    class Config:
+        env_prefix = "COUNTER_"
+
+class QueueSettings(BaseSettings):
+    """Background job queue (RQ) configuration."""
+    
+    verification_queue: str = os.getenv("VERIFICATION_QUEUE", "verification")
+    job_timeout: int = int(os.getenv("VERIFICATION_JOB_TIMEOUT", "600"))
+    max_retries: int = int(os.getenv("VERIFICATION_MAX_RETRIES", "3"))
+    retry_intervals: List[int] = [int(i) for i in os.getenv("VERIFICATION_RETRY_INTERVALS", "30,120,300").split(",") if i.strip()]
+    result_ttl: int = int(os.getenv("VERIFICATION_RESULT_TTL", "86400"))
+    batch_concurrency: int = int(os.getenv("VERIFICATION_BATCH_CONCURRENCY", "8"))
+    batch_write_size: int = int(os.getenv("VERIFICATION_BATCH_WRITE_SIZE", "100"))
+    batch_max_posts: int = int(os.getenv("VERIFICATION_BATCH_MAX_POSTS", "5000"))
+    batch_job_timeout: int = int(os.getenv("VERIFICATION_BATCH_JOB_TIMEOUT", "14400"))
+    # Operator key for the batch endpoints (X-Operator-Key); empty disables them
+    batch_api_key: str = os.getenv("VERIFICATION_BATCH_API_KEY", "")
+    
+    class Config:
+        env_prefix = "QUEUE_"
+
+class PaginationSettings(BaseSettings):
+    """Listing page size configuration."""
+    
+    default_page_size: int = int(os.getenv("PAGE_SIZE_DEFAULT", "20"))
+    max_page_size: int = int(os.getenv("PAGE_SIZE_MAX", "100"))
+    
+    class Config:
+        env_prefix = "PAGE_SIZE_"
+
 class APISettings(BaseSettings):
     """External API configuration."""
     
@@ -153,8 +262,15 @@ class Settings(BaseSettings):
     supabase: SupabaseSettings = SupabaseSettings()
     security: SecuritySettings = SecuritySettings()
     gemini: GeminiSettings = GeminiSettings()
+    local_llm: LocalLLMSettings = LocalLLMSettings()
     vectordb: VectorDBSettings = VectorDBSettings()
     scraping: ScrapingSettings = ScrapingSettings()
+    context: ContextSettings = ContextSettings()
+    cache: CacheSettings = CacheSettings()
+    llm_cache: LLMCacheSettings = LLMCacheSettings()
+    pagination: PaginationSettings = PaginationSettings()
+    counters: CounterSettings = CounterSettings()
+    queue: QueueSettings = QueueSettings()
     api: APISettings = APISettings()
     logging: LoggingSettings = LoggingSettings()
     rate_limit: RateLimitSettings = RateLimitSettings()
@@ -0,0 +1,72 @@
+"""
+Keyset (cursor) pagination helpers.
+
+Cursors are opaque to clients: the sort key of the last row of a page is
+JSON-encoded and wrapped in URL-safe base64. Pages are fetched with a
+``(created_at, pid) < (cursor.created_at, cursor.pid)`` predicate, so each page
+is an index range scan regardless of how deep the client has paged.
+
+Cursors come back from clients, so both values are validated (``created_at``
+as an ISO timestamp, ``pid`` as a UUID) and re-serialized before they are
+placed in the PostgREST filter string.
+"""
+
+import base64
+import json
+import uuid
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+
+
+def encode_cursor(created_at: str, pid: Any) -> str:
+    """Encode the sort key of the last row of a page into an opaque cursor."""
+    raw = json.dumps([created_at, pid], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, str]:
+    """Decode a cursor produced by :func:`encode_cursor`.
+
+    Returns:
+        Tuple[str, str]: ``created_at`` in ISO format and ``pid`` as a canonical UUID
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, pid = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        # Re-serialized, so nothing from the client reaches the filter string verbatim
+        created_at = datetime.fromisoformat(created_at).isoformat()
+        pid = str(uuid.UUID(pid))
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+    return created_at, pid
+
+
+def apply_keyset(query, cursor: Optional[str], limit: int):
+    """Order a PostgREST query newest first and restrict it to the page after ``cursor``.
+
+    One extra row is requested so the caller can tell whether another page exists.
+    """
+    if cursor:
+        created_at, pid = decode_cursor(cursor)
+        query = query.or_(
+            f'created_at.lt."{created_at}",'
+            f'and(created_at.eq."{created_at}",pid.lt."{pid}")'
+        )
+    return (
+        query.order("created_at", desc=True)
+        .order("pid", desc=True)
+        .limit(limit + 1)
+    )
+
+
+def split_page(rows: List[dict], limit: int) -> Tuple[List[dict], Optional[str]]:
+    """Trim the look-ahead row and build the cursor for the next page."""
+    rows = rows or []
+    if len(rows) <= limit:
+        return rows, None
+    page = rows[:limit]
+    last = page[-1]
+    return page, encode_cursor(last["created_at"], last["pid"])
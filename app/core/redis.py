@@ -0,0 +1,20 @@
+from typing import Dict
+
+from redis import Redis
+
+from app.core.config import settings
+
+_redis_clients: Dict[bool, Redis] = {}
+
+
+def get_redis_client(decode_responses: bool = True) -> Redis:
+    """Get the shared Redis client for ``settings.redis_url``.
+
+    RQ stores pickled payloads and needs a client that returns raw bytes, so pass
+    ``decode_responses=False`` for queue connections.
+    """
+    client = _redis_clients.get(decode_responses)
+    if client is None:
+        client = Redis.from_url(settings.redis_url, decode_responses=decode_responses)
+        _redis_clients[decode_responses] = client
+    return client
@@ -1,18 +1,36 @@
+from contextlib import asynccontextmanager
 from fastapi import APIRouter, FastAPI
-from app.api.routers import posts, storage, auth
+from app.api.routers import posts, storage, auth, metrics
 from app.core.config import settings, is_development
+from app.core.http import close_async_http_client
+from app.services import counter_service, reaction_service
 
 routes = [
     posts.router,
     storage.router,
-    auth.router
+    auth.router,
+    metrics.router
 ]
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    flusher = None
+    if settings.counters.flusher_in_api:
+        flusher = counter_service.CounterFlusher(tasks=[counter_service.flush, reaction_service.flush])
+        flusher.start()
+    yield
+    if flusher:
+        flusher.stop()
+    await close_async_http_client()
+
+
 app = FastAPI(
     title=settings.app_name,
     description="A Reddit-like app with verification system",
     version=settings.app_version,
-    debug=settings.debug
+    debug=settings.debug,
+    lifespan=lifespan
 )
 
 
@@ -1,8 +1,11 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, field_validator
 from typing import Optional
 from datetime import datetime, timezone
 from typing import List
 
+from app.core.config import settings
+from app.models.rag import RagResponse
+
 
 class Post(BaseModel):
     owner_id: str
@@ -21,6 +24,22 @@ class PostVerificationRequest(BaseModel):
     content: str
     context: List[str]
 
+class BatchVerificationRequest(BaseModel):
+    # Either explicit post ids or a verification_status to select posts by
+    post_ids: Optional[List[str]] = Field(None, max_length=settings.queue.batch_max_posts)
+    status: Optional[str] = None
+    limit: Optional[int] = Field(None, ge=1, le=settings.queue.batch_max_posts)
+    concurrency: Optional[int] = Field(None, ge=1, le=settings.queue.batch_concurrency)
+
+    @field_validator("status")
+    @classmethod
+    def known_status(cls, value: Optional[str]) -> Optional[str]:
+        # "pending" is what create_post stores until the worker has run
+        allowed = [r.value for r in RagResponse] + ["pending"]
+        if value is not None and value not in allowed:
+            raise ValueError(f"status must be one of {allowed}")
+        return value
+
 class ShowPost(BaseModel):
     pid : str
     content: str
@@ -55,5 +74,6 @@ class ShowPost(BaseModel):
         from_attributes = True
 
 
-
-
+class PostPage(BaseModel):
+    items: List[ShowPost]
+    next_cursor: Optional[str] = None
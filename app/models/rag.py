@@ -1,5 +1,6 @@
+import time
 from datetime import datetime
-from typing import List, Optional, Dict, Any
+from typing import Any, Callable, Dict, List, Optional
 from pydantic import BaseModel, Field, HttpUrl
 from enum import Enum
 
@@ -20,4 +21,27 @@ class RagRequest(BaseModel):
     """
     post_id: str = Field(..., description="The ID of the post to be verified")
     post_content: str = Field(..., description="The content of the post to be verified")
-    context: List[str] = Field(..., description="The context to be used for verification")
\ No newline at end of file
+    context: List[str] = Field(..., description="The context to be used for verification")
+    sources: List[str] = Field(default_factory=list, description="Source URL of each context passage, when known")
+
+
+class VerificationEvent(BaseModel):
+    """
+    A progress event emitted while a post is being verified.
+    """
+    stage: str = Field(..., description="Pipeline stage that just finished, e.g. search_done")
+    data: Dict[str, Any] = Field(default_factory=dict, description="Stage-specific details")
+    timestamp: float = Field(default_factory=time.time, description="Unix time the event was emitted")
+
+
+ProgressCallback = Callable[[VerificationEvent], None]
+
+
+def emit_event(progress: Optional[ProgressCallback], stage: str, **data: Any) -> None:
+    """Send a progress event if a callback was given; callback errors never break verification."""
+    if progress is None:
+        return
+    try:
+        progress(VerificationEvent(stage=stage, data=data))
+    except Exception as e:
+        print(f"Progress callback failed at stage {stage}: {str(e)}")
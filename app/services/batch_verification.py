@@ -0,0 +1,211 @@
+"""
+Batch verification of many posts (e.g. a backlog after an outage or a model change).
+
+Posts are selected by id or by ``verification_status`` and then:
+
+1. grouped by normalized content, so copies of the same claim are verified once
+   and every post in the group gets the verdict,
+2. the distinct claims are embedded up front in batched calls, which fills the
+   embedding cache used by claim reuse and retrieval,
+3. verified with ``averify_content`` on one event loop, at most
+   ``VERIFICATION_BATCH_CONCURRENCY`` claims at a time. Claim reuse is
+   bypassed: a batch exists to re-run the pipeline (e.g. after a model
+   change), so every claim is verified afresh and its index entry replaced,
+4. saved in bulk: status updates are buffered and written as one
+   ``update ... where pid in (...)`` per status every
+   ``VERIFICATION_BATCH_WRITE_SIZE`` posts.
+
+Progress (done/total, statuses, errors, throughput) is reported through a
+callback; the RQ job stores it in the job's meta.
+"""
+
+import asyncio
+import time
+from collections import Counter
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from app.agents.rag_agent.llm_cache import normalize_claim
+from app.core.config import settings
+from app.core.supabase import get_supabase_client
+from app.models.post import PostContentRequest
+from app.models.rag import RagResponse
+
+# Supabase returns at most this many rows per request
+SELECT_PAGE_SIZE = 1000
+# Keeps ``pid in (...)`` filters well inside URL length limits
+IN_FILTER_SIZE = 200
+
+BatchProgressCallback = Callable[[Dict[str, Any]], None]
+
+
+def select_posts(
+    post_ids: Optional[Sequence[str]] = None,
+    status: Optional[str] = None,
+    limit: Optional[int] = None,
+) -> List[Dict[str, str]]:
+    """``pid`` and ``content`` of the posts to verify.
+
+    Args:
+        post_ids: Explicit post ids; takes precedence over ``status``
+        status: Select every post with this ``verification_status``
+        limit: At most this many posts (capped at ``VERIFICATION_BATCH_MAX_POSTS``)
+
+    Returns:
+        List[dict]: Posts with non-empty content, in id order
+    """
+    limit = min(limit or settings.queue.batch_max_posts, settings.queue.batch_max_posts)
+    table = get_supabase_client().table("posts")
+    posts: List[Dict[str, str]] = []
+
+    if post_ids:
+        ids = list(dict.fromkeys(post_ids))[:limit]
+        for i in range(0, len(ids), IN_FILTER_SIZE):
+            res = table.select("pid, content").in_("pid", ids[i:i + IN_FILTER_SIZE]).execute()
+            posts.extend(res.data or [])
+    else:
+        start = 0
+        while len(posts) < limit:
+            end = start + min(SELECT_PAGE_SIZE, limit - len(posts)) - 1
+            query = table.select("pid, content")
+            if status:
+                query = query.eq("verification_status", status)
+            rows = query.order("pid").range(start, end).execute().data or []
+            posts.extend(rows)
+            if len(rows) < end - start + 1:
+                break
+            start = end + 1
+
+    posts = [p for p in posts if p.get("content") and p["content"].strip()]
+    return sorted(posts, key=lambda p: p["pid"])[:limit]
+
+
+def group_by_content(posts: Sequence[Dict[str, str]]) -> Dict[str, List[Dict[str, str]]]:
+    """Posts grouped by normalized content; the first post of a group is verified for all."""
+    groups: Dict[str, List[Dict[str, str]]] = {}
+    for post in posts:
+        groups.setdefault(normalize_claim(post["content"]), []).append(post)
+    return groups
+
+
+class StatusWriter:
+    """Buffers post status updates and writes them as one query per status."""
+
+    def __init__(self, batch_size: Optional[int] = None) -> None:
+        self.batch_size = max(1, batch_size or settings.queue.batch_write_size)
+        self.pending: Dict[str, List[str]] = {}
+        self.writes = 0
+
+    def add(self, pids: Sequence[str], status: str) -> bool:
+        """Buffer an update; True when the buffer is full and should be flushed."""
+        self.pending.setdefault(status, []).extend(pids)
+        return sum(len(p) for p in self.pending.values()) >= self.batch_size
+
+    async def flush(self) -> None:
+        # Swap the buffer on the event loop; only the writes run in a thread
+        pending, self.pending = self.pending, {}
+        if pending:
+            await asyncio.to_thread(self._write, pending)
+
+    def _write(self, pending: Dict[str, List[str]]) -> None:
+        table = get_supabase_client().table("posts")
+        for status, pids in pending.items():
+            for i in range(0, len(pids), IN_FILTER_SIZE):
+                table.update({"verification_status": status}).in_("pid", pids[i:i + IN_FILTER_SIZE]).execute()
+                self.writes += 1
+
+
+async def averify_batch(
+    posts: Sequence[Dict[str, str]],
+    concurrency: Optional[int] = None,
+    progress: Optional[BatchProgressCallback] = None,
+) -> Dict[str, Any]:
+    """Verify posts, once per distinct content, and save their statuses in bulk.
+
+    Args:
+        posts: Posts with ``pid`` and ``content`` (see ``select_posts``)
+        concurrency: Distinct claims verified at once (``VERIFICATION_BATCH_CONCURRENCY``)
+        progress: Receives the running summary after every verified claim
+
+    Returns:
+        dict: Summary with totals, status counts, errors and throughput
+    """
+    # Imported here so selecting posts or enqueueing does not load the pipeline
+    from app.agents.rag_agent.rag_agent import _aembed_texts, _get_embedding_cache
+    from app.services.verification_service import averify_content, get_claim_index
+
+    claim_index = get_claim_index()
+    started = time.monotonic()
+    groups = group_by_content(posts)
+    writer = StatusWriter()
+    statuses: Counter = Counter()
+    summary: Dict[str, Any] = {
+        "total": len(posts),
+        "unique": len(groups),
+        "done": 0,
+        "errors": 0,
+        "statuses": statuses,
+    }
+
+    def report() -> None:
+        elapsed = time.monotonic() - started
+        summary["elapsed_seconds"] = round(elapsed, 2)
+        summary["posts_per_second"] = round(summary["done"] / elapsed, 2) if elapsed else 0.0
+        if progress is not None:
+            try:
+                progress({**summary, "statuses": dict(statuses)})
+            except Exception as e:
+                print(f"Batch progress callback failed: {str(e)}")
+
+    # One batched embedding call for every distinct claim instead of one per post
+    if groups and _get_embedding_cache() is not None:
+        try:
+            await _aembed_texts([members[0]["content"] for members in groups.values()])
+        except Exception as e:
+            print(f"Batch claim embedding failed, embedding per claim: {str(e)}")
+
+    limit = asyncio.Semaphore(max(1, concurrency or settings.queue.batch_concurrency))
+
+    async def verify(members: List[Dict[str, str]]) -> None:
+        post = PostContentRequest(pid=members[0]["pid"], content=members[0]["content"])
+        async with limit:
+            try:
+                response = await averify_content(post, reuse=False)
+                error = bool((response.get("metadata") or {}).get("error"))
+            except Exception as e:
+                print(f"Batch verification failed for post {post.pid}: {str(e)}")
+                response, error = {}, True
+
+        status = response.get("status")
+        if error or status not in {e.value for e in RagResponse}:
+            status = RagResponse.UNVERIFIED.value
+        if error:
+            summary["errors"] += len(members)
+        elif claim_index is not None:
+            try:
+                await asyncio.to_thread(claim_index.add, post.pid, post.content, response)
+            except Exception as e:
+                print(f"Failed to index claim of post {post.pid}: {str(e)}")
+
+        statuses[status] += len(members)
+        summary["done"] += len(members)
+        if writer.add([m["pid"] for m in members], status):
+            await writer.flush()
+        report()
+
+    await asyncio.gather(*(verify(members) for members in groups.values()))
+    await writer.flush()
+    summary["writes"] = writer.writes
+    report()
+    return {**summary, "statuses": dict(statuses)}
+
+
+def verify_batch(
+    post_ids: Optional[Sequence[str]] = None,
+    status: Optional[str] = None,
+    limit: Optional[int] = None,
+    concurrency: Optional[int] = None,
+    progress: Optional[BatchProgressCallback] = None,
+) -> Dict[str, Any]:
+    """Select posts by id or status and verify them (blocking; runs its own event loop)."""
+    posts = select_posts(post_ids=post_ids, status=status, limit=limit)
+    return asyncio.run(averify_batch(posts, concurrency=concurrency, progress=progress))
@@ -0,0 +1,183 @@
+"""
+Token-budget-aware packing of scraped articles into verification context.
+
+Instead of cutting every article to its first 500 characters and the whole
+context to 8000, scraped articles are:
+
+1. split into paragraph chunks (long paragraphs split on sentence boundaries),
+   dropping fragments too short to be evidence ("Advertisement", "Also read"),
+2. scored against the claim with BM25 over the chunks, plus a small bonus for
+   the article's title/summary and for higher ranked sources,
+3. deduplicated: a chunk whose word shingles overlap an already selected
+   chunk by ``CONTEXT_DEDUPE_THRESHOLD`` or more (syndicated copies, quoted
+   wire text) is skipped,
+4. added best first until ``CONTEXT_TOKEN_BUDGET`` is reached.
+
+Tokens are estimated at four characters per token, which is close enough for
+budgeting English news text without a tokenizer.
+"""
+
+import math
+import re
+from collections import Counter
+from dataclasses import dataclass
+from typing import FrozenSet, List, Optional, Sequence
+
+from app.core.config import settings
+from app.models.scraper import ScraperResult
+
+MIN_CHUNK_CHARS = 40
+CHARS_PER_TOKEN = 4
+SHINGLE_SIZE = 3
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+# Too common to say anything about relevance
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or that the this to was were will with".split()
+)
+
+
+@dataclass
+class Chunk:
+    text: str
+    source: str
+    title: str
+    rank: int
+    lead: bool = False
+    score: float = 0.0
+
+    def render(self) -> str:
+        return f"{self.text}\nSource: {self.title} ({self.source})" if self.title else f"{self.text}\nSource: {self.source}"
+
+
+def estimate_tokens(text: str) -> int:
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def _terms(text: str) -> List[str]:
+    return [w for w in _WORD.findall(text.lower()) if w not in STOPWORDS]
+
+
+def _shingles(text: str) -> FrozenSet[str]:
+    words = _WORD.findall(text.lower())
+    if len(words) <= SHINGLE_SIZE:
+        return frozenset([" ".join(words)])
+    return frozenset(" ".join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1))
+
+
+def _split(paragraph: str, max_chars: int) -> List[str]:
+    """Split a paragraph into pieces of at most ``max_chars``, on sentence boundaries where possible."""
+    paragraph = " ".join(paragraph.split())
+    if len(paragraph) <= max_chars:
+        return [paragraph]
+    pieces, current = [], ""
+    for sentence in _SENTENCE_END.split(paragraph):
+        while len(sentence) > max_chars:
+            if current:
+                pieces.append(current)
+                current = ""
+            pieces.append(sentence[:max_chars])
+            sentence = sentence[max_chars:]
+        if current and len(current) + 1 + len(sentence) > max_chars:
+            pieces.append(current)
+            current = sentence
+        else:
+            current = f"{current} {sentence}".strip()
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+def chunk_results(results: Sequence[ScraperResult], max_chars: Optional[int] = None) -> List[Chunk]:
+    """Paragraph chunks of the scraped articles, in source ranking order."""
+    max_chars = max_chars or settings.context.chunk_chars
+    chunks: List[Chunk] = []
+    for rank, result in enumerate(results):
+        if not result:
+            continue
+        title = (result.title or "").strip()
+        lead = " ".join(part for part in (title, (result.article_summary or "").strip()) if part)
+        if len(lead) >= MIN_CHUNK_CHARS:
+            chunks.extend(Chunk(piece, result.source, title, rank, lead=True) for piece in _split(lead, max_chars))
+        for paragraph in result.content or []:
+            if not paragraph or len(paragraph.strip()) < MIN_CHUNK_CHARS:
+                continue
+            chunks.extend(Chunk(piece, result.source, title, rank) for piece in _split(paragraph, max_chars))
+    return chunks
+
+
+def score_chunks(claim: str, chunks: List[Chunk], k1: float = 1.5, b: float = 0.75) -> None:
+    """Set each chunk's ``score``: BM25 against the claim terms plus lead and source-rank bonuses."""
+    query = set(_terms(claim))
+    if not chunks:
+        return
+    docs = [Counter(_terms(chunk.text)) for chunk in chunks]
+    avg_len = sum(sum(doc.values()) for doc in docs) / len(docs) or 1.0
+    df = Counter(term for doc in docs for term in query if term in doc)
+
+    for chunk, doc in zip(chunks, docs):
+        length = sum(doc.values())
+        bm25 = 0.0
+        for term in query:
+            tf = doc.get(term, 0)
+            if not tf:
+                continue
+            idf = math.log(1 + (len(docs) - df[term] + 0.5) / (df[term] + 0.5))
+            bm25 += idf * tf * (k1 + 1) / (tf + k1 * (1 - b + b * length / avg_len))
+        # Ties (and claims with no overlap at all) go to leads and better ranked sources
+        chunk.score = bm25 + (0.5 if chunk.lead else 0.0) + 0.1 / (1 + chunk.rank)
+
+
+def select_chunks(
+    claim: str,
+    results: Sequence[ScraperResult],
+    token_budget: Optional[int] = None,
+    dedupe_threshold: Optional[float] = None,
+) -> List[Chunk]:
+    """Best chunks of the scraped articles for the claim, within the token budget.
+
+    Args:
+        claim: Post content being verified
+        results: Scraped articles, in search ranking order
+        token_budget: Estimated tokens the packed context may use (``CONTEXT_TOKEN_BUDGET``)
+        dedupe_threshold: Shingle overlap above which a chunk counts as a duplicate
+
+    Returns:
+        List[Chunk]: Selected chunks, most relevant first
+    """
+    token_budget = token_budget or settings.context.token_budget
+    if dedupe_threshold is None:
+        dedupe_threshold = settings.context.dedupe_threshold
+
+    chunks = chunk_results(results)
+    score_chunks(claim, chunks)
+    chunks.sort(key=lambda c: c.score, reverse=True)
+
+    packed: List[Chunk] = []
+    seen: List[FrozenSet[str]] = []
+    used = 0
+    for chunk in chunks:
+        rendered = chunk.render()
+        cost = estimate_tokens(rendered)
+        if used + cost > token_budget:
+            continue
+        shingles = _shingles(chunk.text)
+        # Overlap coefficient, so a passage quoted inside a longer one also counts as a duplicate
+        if any(len(shingles & other) / min(len(shingles), len(other)) >= dedupe_threshold for other in seen):
+            continue
+        packed.append(chunk)
+        seen.append(shingles)
+        used += cost
+    return packed
+
+
+def pack_context(
+    claim: str,
+    results: Sequence[ScraperResult],
+    token_budget: Optional[int] = None,
+    dedupe_threshold: Optional[float] = None,
+) -> List[str]:
+    """Rendered chunks (text plus source line) of ``select_chunks``, most relevant first."""
+    return [chunk.render() for chunk in select_chunks(claim, results, token_budget, dedupe_threshold)]
@@ -0,0 +1,345 @@
+"""
+Write-behind aggregation of post like/dislike counters.
+
+Reactions never touch Postgres on the request path. Each increment is applied
+atomically in Redis to two places:
+
+- ``post_counters:{pid}``: the live value (database value + buffered deltas),
+  returned to the client straight away.
+- ``post_counters:pending``: deltas not yet written to Postgres, one hash field
+  per ``{pid}:{column}``.
+
+A flusher periodically snapshots the pending hash (atomic RENAME into a
+``post_counters:flushing:*`` key recorded in ``post_counters:snapshots``) and
+applies it in batches through the ``apply_post_counter_deltas`` RPC, which does
+``likes = likes + delta`` inside Postgres. Because the buffer lives in Redis, a
+restart of the API or flusher loses nothing: a snapshot left behind by a crashed
+flush is picked up again on the next run, and rows are removed from it batch by
+batch only after the RPC succeeded.
+
+When a live value expires while deltas for the post are still buffered, it is
+re-seeded from Postgres plus those deltas, under the flush lock so none of them
+move from the buffer to Postgres while they are being added up. If a running
+flush holds the lock for longer than ``SEED_LOCK_WAIT`` seconds the reaction is
+refused (``CounterBusy``) rather than seeded from a possibly stale value.
+"""
+
+import threading
+import time
+import uuid
+from typing import Callable, Dict, Iterable, List, Optional
+
+from app.core.config import settings
+from app.core.redis import get_redis_client
+from app.core.supabase import get_supabase_client
+
+COUNTER_COLUMNS = ("likes", "dislikes")
+
+VALUE_KEY = "post_counters:{pid}"
+PENDING_KEY = "post_counters:pending"
+PENDING_SINCE_KEY = "post_counters:pending_since"
+FLUSHING_PREFIX = "post_counters:flushing:"
+SNAPSHOTS_KEY = "post_counters:snapshots"
+FLUSH_LOCK_KEY = "post_counters:flush_lock"
+LAST_FLUSH_KEY = "post_counters:last_flush"
+
+# How long seeding waits for a running flush before giving up
+SEED_LOCK_WAIT = 5
+
+# KEYS: value, pending, pending_since
+# ARGV: now, ttl, pid, column_1, delta_1, column_2, delta_2, ...
+_APPLY_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return false
+end
+for i = 4, #ARGV, 2 do
+    redis.call('HINCRBY', KEYS[1], ARGV[i], ARGV[i + 1])
+    redis.call('HINCRBY', KEYS[2], ARGV[3] .. ':' .. ARGV[i], ARGV[i + 1])
+end
+redis.call('EXPIRE', KEYS[1], ARGV[2])
+redis.call('SET', KEYS[3], ARGV[1], 'NX')
+return redis.call('HMGET', KEYS[1], 'likes', 'dislikes')
+"""
+
+# KEYS: pending, flushing, pending_since, snapshots
+_SNAPSHOT_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return false
+end
+redis.call('RENAME', KEYS[1], KEYS[2])
+redis.call('SADD', KEYS[4], KEYS[2])
+local since = redis.call('GET', KEYS[3])
+redis.call('DEL', KEYS[3])
+return since
+"""
+
+supabase = get_supabase_client()
+
+
+class PostNotFound(LookupError):
+    pass
+
+
+class CounterBusy(RuntimeError):
+    """A flush held the lock for too long to seed a counter safely."""
+
+
+def _redis():
+    return get_redis_client()
+
+
+def _flush_lock(r, blocking: bool):
+    return r.lock(
+        FLUSH_LOCK_KEY,
+        timeout=max(60, settings.counters.flush_interval * 4),
+        blocking=blocking,
+        blocking_timeout=SEED_LOCK_WAIT if blocking else None,
+    )
+
+
+def _buffered_deltas(r, pid: str) -> Dict[str, int]:
+    """Deltas for a post not yet written to Postgres: pending plus any flush snapshots."""
+    fields = [f"{pid}:{column}" for column in COUNTER_COLUMNS]
+    totals = {column: 0 for column in COUNTER_COLUMNS}
+    pipe = r.pipeline(transaction=False)
+    for key in [PENDING_KEY, *r.smembers(SNAPSHOTS_KEY)]:
+        pipe.hmget(key, fields)
+    for values in pipe.execute():
+        for column, value in zip(COUNTER_COLUMNS, values):
+            totals[column] += int(value or 0)
+    return totals
+
+
+def seed(pid: str) -> None:
+    """Seed the live counter for a post from Postgres plus its buffered deltas.
+
+    Raises:
+        PostNotFound: If the post does not exist
+        CounterBusy: If a flush kept the lock for more than ``SEED_LOCK_WAIT`` seconds
+    """
+    r = _redis()
+    lock = _flush_lock(r, blocking=True)
+    if not lock.acquire():
+        raise CounterBusy(pid)
+    try:
+        res = supabase.table("posts").select("likes, dislikes").eq("pid", pid).single().execute()
+        if not res.data:
+            raise PostNotFound(pid)
+        # No new deltas are buffered for the post until its value key exists again
+        buffered = _buffered_deltas(r, pid)
+        key = VALUE_KEY.format(pid=pid)
+        pipe = r.pipeline()
+        for column in COUNTER_COLUMNS:
+            # HSETNX: a concurrent first reaction may already have seeded the key
+            pipe.hsetnx(key, column, (res.data.get(column) or 0) + buffered[column])
+        pipe.expire(key, settings.counters.value_ttl)
+        pipe.execute()
+    finally:
+        try:
+            lock.release()
+        except Exception:
+            pass
+
+
+def apply(pid: str, deltas: Dict[str, int]) -> Dict[str, int]:
+    """Atomically apply counter deltas to a post and buffer them for flushing.
+
+    Args:
+        pid (str): Post id
+        deltas (Dict[str, int]): Column name to delta, e.g. ``{"likes": 1}``
+
+    Returns:
+        Dict[str, int]: Live ``likes`` and ``dislikes`` after the change
+
+    Raises:
+        PostNotFound: If the post does not exist
+        CounterBusy: If the post's counter could not be seeded in time
+    """
+    args: List = [time.time(), settings.counters.value_ttl, pid]
+    for column, delta in deltas.items():
+        if column not in COUNTER_COLUMNS:
+            raise ValueError(f"Unknown counter column: {column}")
+        if delta:
+            args.extend([column, int(delta)])
+
+    keys = [VALUE_KEY.format(pid=pid), PENDING_KEY, PENDING_SINCE_KEY]
+    script = _redis().register_script(_APPLY_SCRIPT)
+    values = script(keys=keys, args=args)
+    if values is None:
+        seed(pid)
+        values = script(keys=keys, args=args)
+    return {column: int(value or 0) for column, value in zip(COUNTER_COLUMNS, values)}
+
+
+def increment(pid: str, column: str, amount: int = 1) -> int:
+    """Increment a single counter and return its live value."""
+    return apply(pid, {column: amount})[column]
+
+
+def overlay_live_counts(posts: List[dict]) -> List[dict]:
+    """Replace database counts with live values for posts that have buffered reactions.
+
+    Uses one Redis round trip for the whole page. Posts without a live counter
+    keep their database values.
+    """
+    if not posts:
+        return posts
+    try:
+        pipe = _redis().pipeline(transaction=False)
+        for post in posts:
+            pipe.hmget(VALUE_KEY.format(pid=post["pid"]), *COUNTER_COLUMNS)
+        results = pipe.execute()
+    except Exception as e:
+        print(f"Failed to read live counters: {str(e)}")
+        return posts
+
+    for post, values in zip(posts, results):
+        for column, value in zip(COUNTER_COLUMNS, values):
+            if value is not None:
+                post[column] = int(value)
+    return posts
+
+
+def forget(pid: str) -> None:
+    """Drop the live counter and the pending deltas of a deleted post."""
+    r = _redis()
+    r.delete(VALUE_KEY.format(pid=pid))
+    r.hdel(PENDING_KEY, *[f"{pid}:{column}" for column in COUNTER_COLUMNS])
+
+
+def _parse_deltas(raw: Dict[str, str]) -> Dict[str, Dict[str, int]]:
+    rows: Dict[str, Dict[str, int]] = {}
+    for field, delta in raw.items():
+        pid, _, column = field.rpartition(":")
+        if not pid or column not in COUNTER_COLUMNS:
+            continue
+        rows.setdefault(pid, {c: 0 for c in COUNTER_COLUMNS})[column] += int(delta)
+    return rows
+
+
+def _batches(items: List, size: int) -> Iterable[List]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _flush_snapshot(key: str) -> int:
+    """Write one snapshot hash to Postgres batch by batch; returns rows written."""
+    r = _redis()
+    rows = _parse_deltas(r.hgetall(key))
+    written = 0
+    payload = [{"pid": pid, **counts} for pid, counts in rows.items() if any(counts.values())]
+    for batch in _batches(payload, max(1, settings.counters.flush_batch_size)):
+        supabase.rpc("apply_post_counter_deltas", {"deltas": batch}).execute()
+        # Drop only what was applied so a retry never double-counts
+        r.hdel(key, *[f"{row['pid']}:{column}" for row in batch for column in COUNTER_COLUMNS])
+        written += len(batch)
+    pipe = r.pipeline()
+    pipe.delete(key)
+    pipe.srem(SNAPSHOTS_KEY, key)
+    pipe.execute()
+    return written
+
+
+def flush() -> int:
+    """Flush buffered deltas to Postgres.
+
+    Safe to call from several processes at once: a Redis lock ensures only one
+    flusher works at a time and the others return immediately.
+
+    Returns:
+        int: Number of post rows updated
+    """
+    r = _redis()
+    lock = _flush_lock(r, blocking=False)
+    if not lock.acquire():
+        return 0
+
+    started = time.time()
+    written = 0
+    try:
+        # Snapshots orphaned by a crashed flush come first
+        for leftover in r.smembers(SNAPSHOTS_KEY):
+            written += _flush_snapshot(leftover)
+
+        flushing_key = f"{FLUSHING_PREFIX}{uuid.uuid4().hex}"
+        snapshot = r.register_script(_SNAPSHOT_SCRIPT)
+        since = snapshot(keys=[PENDING_KEY, flushing_key, PENDING_SINCE_KEY, SNAPSHOTS_KEY])
+        if since is not None:
+            written += _flush_snapshot(flushing_key)
+            r.hset(LAST_FLUSH_KEY, mapping={
+                "at": time.time(),
+                "rows": written,
+                "duration_seconds": round(time.time() - started, 4),
+                "lag_seconds": round(time.time() - float(since), 4),
+            })
+    finally:
+        try:
+            lock.release()
+        except Exception:
+            pass
+    return written
+
+
+def get_metrics() -> Dict[str, Optional[float]]:
+    """Report buffered state and flush lag.
+
+    ``flush_lag_seconds`` is the age of the oldest increment that has not been
+    written to Postgres yet (0 when the buffer is empty).
+    """
+    r = _redis()
+    pipe = r.pipeline(transaction=False)
+    pipe.hlen(PENDING_KEY)
+    pipe.get(PENDING_SINCE_KEY)
+    pipe.hgetall(LAST_FLUSH_KEY)
+    pending, since, last_flush = pipe.execute()
+
+    return {
+        "pending_fields": pending,
+        "flush_lag_seconds": round(time.time() - float(since), 4) if since else 0.0,
+        "last_flush_at": float(last_flush["at"]) if last_flush else None,
+        "last_flush_rows": int(last_flush["rows"]) if last_flush else None,
+        "last_flush_duration_seconds": float(last_flush["duration_seconds"]) if last_flush else None,
+        "last_flush_lag_seconds": float(last_flush["lag_seconds"]) if last_flush else None,
+    }
+
+
+class CounterFlusher(threading.Thread):
+    """Background thread that runs write-behind flushes every ``flush_interval`` seconds.
+
+    ``tasks`` defaults to the counter flush; other write-behind buffers (e.g.
+    reactions) can be flushed on the same schedule.
+    """
+
+    def __init__(self, interval: Optional[float] = None, tasks: Optional[List[Callable[[], int]]] = None):
+        super().__init__(name="counter-flusher", daemon=True)
+        self.interval = interval or settings.counters.flush_interval
+        self.tasks = tasks or [flush]
+        self._stop_event = threading.Event()
+
+    def run(self) -> None:
+        while not self._stop_event.wait(self.interval):
+            self._flush_once()
+
+    def stop(self) -> None:
+        """Stop the loop and write out whatever is still buffered."""
+        self._stop_event.set()
+        self._flush_once()
+
+    def _flush_once(self) -> None:
+        for task in self.tasks:
+            try:
+                task()
+            except Exception as e:
+                print(f"Write-behind flush {getattr(task, '__module__', task)} failed: {str(e)}")
+
+
+if __name__ == "__main__":
+    # Standalone flusher, e.g. when the API runs with the in-process flusher disabled
+    from app.services import reaction_service
+
+    flusher = CounterFlusher(tasks=[flush, reaction_service.flush])
+    print(f"Flushing post counters and reactions every {flusher.interval}s")
+    try:
+        flusher.run()
+    except KeyboardInterrupt:
+        flusher.stop()
@@ -0,0 +1,80 @@
+"""
+Author profile lookups for post listings.
+
+Posts only carry ``owner_id``; listings need the author's username, display name
+and avatar. Profiles are fetched for all distinct owners in a single ``in_``
+filtered query (chunked for large pages) and kept in a short-lived in-process
+cache that is invalidated whenever a profile changes.
+"""
+
+from typing import Dict, Iterable, List
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.supabase import get_supabase_client
+
+PROFILE_COLUMNS = "uid, username, full_name, profile_pic_url"
+
+supabase = get_supabase_client()
+
+_profile_cache = TTLCache(
+    maxsize=settings.cache.profile_max_entries,
+    ttl=settings.cache.profile_ttl,
+)
+
+
+def _chunks(items: List[str], size: int) -> Iterable[List[str]]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def get_profiles(uids: Iterable[str]) -> Dict[str, dict]:
+    """Fetch author profiles for the given user ids.
+
+    Args:
+        uids (Iterable[str]): User ids, duplicates are allowed
+
+    Returns:
+        Dict[str, dict]: Profiles keyed by uid; unknown users are omitted
+    """
+    distinct = list(dict.fromkeys(uid for uid in uids if uid))
+    profiles: Dict[str, dict] = {}
+    missing: List[str] = []
+
+    for uid in distinct:
+        cached = _profile_cache.get(uid)
+        if cached is not None:
+            profiles[uid] = cached
+        else:
+            missing.append(uid)
+
+    for chunk in _chunks(missing, max(1, settings.cache.profile_batch_size)):
+        res = supabase.table('users').select(PROFILE_COLUMNS).in_('uid', chunk).execute()
+        for row in res.data or []:
+            profiles[row['uid']] = row
+            _profile_cache.set(row['uid'], row)
+
+    return profiles
+
+
+def hydrate_authors(posts: List[dict]) -> List[dict]:
+    """Attach author name, display name and avatar to each post in place."""
+    profiles = get_profiles(post.get('owner_id') for post in posts)
+
+    for post in posts:
+        profile = profiles.get(post.get('owner_id'))
+        if profile:
+            post['author_name'] = profile.get('username')
+            post['author_display_name'] = profile.get('full_name')
+            post['author_avatar'] = profile.get('profile_pic_url')
+        else:
+            post['author_name'] = 'Unknown'
+            post['author_display_name'] = None
+            post['author_avatar'] = None
+
+    return posts
+
+
+def invalidate_profile(uid: str) -> None:
+    """Drop a cached profile after the user's row has changed."""
+    _profile_cache.delete(uid)
@@ -0,0 +1,283 @@
+"""
+Per-user post reactions (like / dislike).
+
+The source of truth is the ``post_reactions`` table, one row per
+``(user_id, post_id)``. Reads and writes go through a Redis index instead:
+
+- ``reactions:{uid}:like`` / ``reactions:{uid}:dislike``: sets of post ids.
+  A whole feed page is answered with one SMISMEMBER.
+- ``reactions:pending``: reaction changes not yet written to Postgres, one field
+  per ``{uid}:{pid}`` holding the final kind (``none`` for a removed reaction).
+
+A user's index is loaded from Postgres once (their reactions, paged by
+``INDEX_PAGE_SIZE`` rows) and kept for ``COUNTER_VALUE_TTL`` seconds after their last reaction. Changing a
+reaction updates the index, the post's live counters and the pending buffer in a
+single Lua script, so repeated likes are no-ops and a like replaces a dislike
+without any database round trip.
+
+The flusher snapshots the pending hash into ``reactions:flushing`` (RENAME) and
+writes it to ``post_reactions``. Reactions to posts deleted in the meantime are
+dropped, since they would fail the ``post_id`` foreign key and block every later
+flush behind the same snapshot.
+"""
+
+import time
+from typing import Dict, Iterable, List, Optional, Set
+
+from app.core.config import settings
+from app.core.redis import get_redis_client
+from app.core.supabase import get_supabase_client
+from app.services import counter_service
+
+LIKE = "like"
+DISLIKE = "dislike"
+NONE = "none"
+KINDS = (LIKE, DISLIKE)
+
+INDEX_KEY = "reactions:{uid}:{kind}"
+LOADED_KEY = "reactions:{uid}:loaded"
+PENDING_KEY = "reactions:pending"
+FLUSHING_KEY = "reactions:flushing"
+FLUSH_LOCK_KEY = "reactions:flush_lock"
+
+# Keeps ``pid in (...)`` filters well inside URL length limits
+IN_FILTER_SIZE = 200
+# PostgREST's default ``max-rows``: an unpaginated select is silently cut off there
+INDEX_PAGE_SIZE = 1000
+
+# KEYS: like_set, dislike_set, loaded, counter_value, counter_pending, counter_pending_since, reactions_pending
+# ARGV: pid, kind, now, ttl, uid
+_REACT_SCRIPT = """
+if redis.call('EXISTS', KEYS[4]) == 0 then
+    return false
+end
+local pid = ARGV[1]
+local kind = ARGV[2]
+local liked = redis.call('SISMEMBER', KEYS[1], pid)
+local disliked = redis.call('SISMEMBER', KEYS[2], pid)
+local dl = 0
+local dd = 0
+local changed = 0
+if kind == 'like' then
+    if liked == 0 then redis.call('SADD', KEYS[1], pid); dl = 1 end
+    if disliked == 1 then redis.call('SREM', KEYS[2], pid); dd = -1 end
+elseif kind == 'dislike' then
+    if disliked == 0 then redis.call('SADD', KEYS[2], pid); dd = 1 end
+    if liked == 1 then redis.call('SREM', KEYS[1], pid); dl = -1 end
+else
+    if liked == 1 then redis.call('SREM', KEYS[1], pid); dl = -1 end
+    if disliked == 1 then redis.call('SREM', KEYS[2], pid); dd = -1 end
+end
+if dl ~= 0 then
+    redis.call('HINCRBY', KEYS[4], 'likes', dl)
+    redis.call('HINCRBY', KEYS[5], pid .. ':likes', dl)
+end
+if dd ~= 0 then
+    redis.call('HINCRBY', KEYS[4], 'dislikes', dd)
+    redis.call('HINCRBY', KEYS[5], pid .. ':dislikes', dd)
+end
+if dl ~= 0 or dd ~= 0 then
+    changed = 1
+    redis.call('SET', KEYS[6], ARGV[3], 'NX')
+    redis.call('HSET', KEYS[7], ARGV[5] .. ':' .. pid, kind)
+end
+for i = 1, 4 do
+    redis.call('EXPIRE', KEYS[i], ARGV[4])
+end
+local counts = redis.call('HMGET', KEYS[4], 'likes', 'dislikes')
+return {counts[1], counts[2], changed}
+"""
+
+supabase = get_supabase_client()
+
+
+def _redis():
+    return get_redis_client()
+
+
+def _index_keys(uid: str) -> List[str]:
+    return [INDEX_KEY.format(uid=uid, kind=kind) for kind in KINDS]
+
+
+def _stored_reactions(uid: str) -> List[dict]:
+    """All of a user's rows in ``post_reactions``, fetched page by page."""
+    rows: List[dict] = []
+    while True:
+        res = (
+            supabase.table("post_reactions")
+            .select("post_id, kind")
+            .eq("user_id", uid)
+            .order("post_id")
+            .range(len(rows), len(rows) + INDEX_PAGE_SIZE - 1)
+            .execute()
+        )
+        page = res.data or []
+        rows.extend(page)
+        if len(page) < INDEX_PAGE_SIZE:
+            return rows
+
+
+def _ensure_index(uid: str) -> None:
+    """Load a user's reactions into Redis unless they are already indexed."""
+    r = _redis()
+    loaded_key = LOADED_KEY.format(uid=uid)
+    if r.exists(loaded_key):
+        return
+
+    members: Dict[str, Set[str]] = {kind: set() for kind in KINDS}
+    for row in _stored_reactions(uid):
+        if row.get("kind") in members:
+            members[row["kind"]].add(str(row["post_id"]))
+
+    # Changes that have not been flushed yet are newer than the table: first a
+    # snapshot being (or left behind by a crashed) flush, then the pending ones
+    for key in (FLUSHING_KEY, PENDING_KEY):
+        for field, kind in r.hscan_iter(key, match=f"{uid}:*"):
+            pid = field.split(":", 1)[1]
+            for known in members.values():
+                known.discard(pid)
+            if kind in members:
+                members[kind].add(pid)
+
+    ttl = settings.counters.value_ttl
+    pipe = r.pipeline()
+    for kind, key in zip(KINDS, _index_keys(uid)):
+        pipe.delete(key)
+        if members[kind]:
+            pipe.sadd(key, *members[kind])
+            pipe.expire(key, ttl)
+    pipe.set(loaded_key, 1, ex=ttl)
+    pipe.execute()
+
+
+def react(uid: str, pid: str, kind: str) -> Dict[str, object]:
+    """Set a user's reaction to a post.
+
+    Args:
+        uid (str): Reacting user
+        pid (str): Post id
+        kind (str): ``like``, ``dislike`` or ``none`` to clear the reaction
+
+    Returns:
+        Dict[str, object]: Live ``likes``/``dislikes``, the user's ``reaction``
+        and whether anything ``changed``
+
+    Raises:
+        counter_service.PostNotFound: If the post does not exist
+        counter_service.CounterBusy: If the post's counter could not be seeded in time
+    """
+    if kind not in KINDS + (NONE,):
+        raise ValueError(f"Unknown reaction kind: {kind}")
+
+    _ensure_index(uid)
+    keys = _index_keys(uid) + [
+        LOADED_KEY.format(uid=uid),
+        counter_service.VALUE_KEY.format(pid=pid),
+        counter_service.PENDING_KEY,
+        counter_service.PENDING_SINCE_KEY,
+        PENDING_KEY,
+    ]
+    args = [pid, kind, time.time(), settings.counters.value_ttl, uid]
+
+    script = _redis().register_script(_REACT_SCRIPT)
+    result = script(keys=keys, args=args)
+    if result is None:
+        counter_service.seed(pid)
+        result = script(keys=keys, args=args)
+
+    likes, dislikes, changed = result
+    return {
+        "likes": int(likes or 0),
+        "dislikes": int(dislikes or 0),
+        "reaction": kind,
+        "changed": bool(changed),
+    }
+
+
+def liked_post_ids(uid: str, pids: Iterable[str]) -> Set[str]:
+    """Return which of ``pids`` the user has liked, in one Redis round trip."""
+    pids = [str(pid) for pid in pids]
+    if not uid or not pids:
+        return set()
+    _ensure_index(uid)
+    flags = _redis().smismember(INDEX_KEY.format(uid=uid, kind=LIKE), pids)
+    return {pid for pid, flag in zip(pids, flags) if flag}
+
+
+def mark_liked(posts: List[dict], uid: Optional[str]) -> List[dict]:
+    """Fill ``is_liked_by_current_user`` for a page of posts."""
+    if not uid or not posts:
+        return posts
+    try:
+        liked = liked_post_ids(uid, (post["pid"] for post in posts))
+    except Exception as e:
+        print(f"Failed to read reactions for user {uid}: {str(e)}")
+        return posts
+    for post in posts:
+        post["is_liked_by_current_user"] = str(post["pid"]) in liked
+    return posts
+
+
+def forget(pid: str) -> None:
+    """Drop buffered reactions to a deleted post so they are never flushed."""
+    r = _redis()
+    for key in (PENDING_KEY, FLUSHING_KEY):
+        fields = [field for field, _ in r.hscan_iter(key, match=f"*:{pid}")]
+        if fields:
+            r.hdel(key, *fields)
+
+
+def _existing_posts(pids: List[str]) -> Set[str]:
+    existing: Set[str] = set()
+    for i in range(0, len(pids), IN_FILTER_SIZE):
+        res = supabase.table("posts").select("pid").in_("pid", pids[i:i + IN_FILTER_SIZE]).execute()
+        existing.update(str(row["pid"]) for row in res.data or [])
+    return existing
+
+
+def flush() -> int:
+    """Write buffered reaction changes to ``post_reactions``.
+
+    Returns:
+        int: Number of reaction changes written
+    """
+    r = _redis()
+    lock = r.lock(FLUSH_LOCK_KEY, timeout=max(60, settings.counters.flush_interval * 4), blocking=False)
+    if not lock.acquire():
+        return 0
+
+    try:
+        # A snapshot left by a crashed flush is retried before taking a new one
+        if not r.exists(FLUSHING_KEY):
+            try:
+                r.rename(PENDING_KEY, FLUSHING_KEY)
+            except Exception:
+                # Nothing pending
+                return 0
+
+        changes = r.hgetall(FLUSHING_KEY)
+        upserts: List[dict] = []
+        removals: Dict[str, List[str]] = {}
+        for field, kind in changes.items():
+            uid, _, pid = field.partition(":")
+            if kind in KINDS:
+                upserts.append({"user_id": uid, "post_id": pid, "kind": kind})
+            else:
+                removals.setdefault(uid, []).append(pid)
+
+        if upserts:
+            # A post deleted after its reaction was buffered would fail the foreign key
+            existing = _existing_posts(sorted({row["post_id"] for row in upserts}))
+            upserts = [row for row in upserts if row["post_id"] in existing]
+        if upserts:
+            supabase.table("post_reactions").upsert(upserts, on_conflict="user_id,post_id").execute()
+        for uid, pids in removals.items():
+            supabase.table("post_reactions").delete().eq("user_id", uid).in_("post_id", pids).execute()
+
+        r.delete(FLUSHING_KEY)
+        return len(changes)
+    finally:
+        try:
+            lock.release()
+        except Exception:
+            pass
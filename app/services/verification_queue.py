@@ -0,0 +1,253 @@
+"""
+Background verification jobs (RQ).
+
+``create_post`` enqueues a job here instead of running the verification
+pipeline on the request path. Jobs run in a separate worker process
+(``python -m app.worker``) that calls ``verification_service.verify_post``.
+
+Each post has at most one live job for its current content. The post's job id
+is kept in ``verify-post:{pid}:job`` and read and replaced under a per-post
+Redis lock, so concurrent requests never queue the same post twice. Enqueueing
+the content the live job already has returns that job. New content (an edit)
+replaces a job that has not started yet; a job that is already running is left
+to finish and the new one waits for it, so the newest content is verified last.
+
+Batch jobs (``enqueue_batch_verification``) verify many posts in one job with
+``batch_verification.verify_batch``; their progress is kept in the job's meta.
+
+``enqueue_compaction`` queues compaction of the Chroma collections, which live
+next to the worker (see ``app/agents/rag_agent/compaction.py``).
+"""
+
+import uuid
+from typing import Any, Dict, List, Optional
+
+from rq import Queue, Retry
+from rq.exceptions import NoSuchJobError
+from rq import get_current_job
+from rq.job import Dependency, Job, JobStatus
+
+from app.core.config import settings
+from app.core.redis import get_redis_client
+
+ACTIVE_STATUSES = {
+    JobStatus.QUEUED,
+    JobStatus.STARTED,
+    JobStatus.DEFERRED,
+    JobStatus.SCHEDULED,
+}
+
+
+def get_queue() -> Queue:
+    """Get the verification queue on the shared (binary) Redis connection."""
+    return Queue(settings.queue.verification_queue, connection=get_redis_client(decode_responses=False))
+
+
+def job_id_for(pid: str) -> str:
+    return f"verify-post-{pid}-{uuid.uuid4().hex[:12]}"
+
+
+BATCH_JOB_PREFIX = "verify-batch-"
+COMPACTION_JOB_ID = "compact-chroma"
+
+POST_JOB_KEY = "verify-post:{pid}:job"
+POST_LOCK_KEY = "verify-post:{pid}:lock"
+# Outlives any job it can point to (queued, retried, then kept for result_ttl)
+POST_JOB_KEY_TTL = 7 * 86400
+
+
+def fetch_job(pid: str) -> Optional[Job]:
+    job_id = get_redis_client(decode_responses=False).get(POST_JOB_KEY.format(pid=pid))
+    if job_id is None:
+        return None
+    return _fetch(job_id.decode() if isinstance(job_id, bytes) else job_id)
+
+
+def _fetch(job_id: str) -> Optional[Job]:
+    try:
+        return Job.fetch(job_id, connection=get_redis_client(decode_responses=False))
+    except NoSuchJobError:
+        return None
+
+
+def enqueue_verification(pid: str, content: str) -> Job:
+    """Queue verification of a post's current content.
+
+    Reuses the post's active job if it verifies the same content. An active job
+    for older content is replaced when it has not started yet, and waited for
+    when it has.
+
+    Args:
+        pid (str): Post id
+        content (str): Post content to verify
+
+    Returns:
+        Job: The queued (or already active) job
+
+    Raises:
+        redis.exceptions.LockError: If another request held the post's lock for too long
+    """
+    r = get_redis_client(decode_responses=False)
+    with r.lock(POST_LOCK_KEY.format(pid=pid), timeout=30, blocking_timeout=5):
+        depends_on = None
+        existing = fetch_job(pid)
+        status = existing.get_status() if existing is not None else None
+        if status in ACTIVE_STATUSES:
+            if tuple(existing.args) == (pid, content):
+                return existing
+            if status == JobStatus.STARTED:
+                # Its verdict for the old content must not land after the new one
+                depends_on = Dependency(jobs=[existing], allow_failure=True)
+            else:
+                if existing.dependency_ids:
+                    depends_on = Dependency(jobs=existing.dependency_ids, allow_failure=True)
+                existing.delete()
+
+        intervals = settings.queue.retry_intervals or [0]
+        retry = Retry(max=settings.queue.max_retries, interval=intervals) if settings.queue.max_retries > 0 else None
+
+        job = get_queue().enqueue_call(
+            func=run_verification,
+            args=(pid, content),
+            job_id=job_id_for(pid),
+            timeout=settings.queue.job_timeout,
+            result_ttl=settings.queue.result_ttl,
+            failure_ttl=settings.queue.result_ttl,
+            retry=retry,
+            depends_on=depends_on,
+            description=f"verify post {pid}",
+        )
+        r.set(POST_JOB_KEY.format(pid=pid), job.id, ex=POST_JOB_KEY_TTL)
+        return job
+
+
+def get_verification_job_status(pid: str) -> Optional[Dict[str, Any]]:
+    """Summarize the post's verification job, or ``None`` if there is none."""
+    job = fetch_job(pid)
+    if job is None:
+        return None
+    return _summarize(job)
+
+
+def _summarize(job: Job) -> Dict[str, Any]:
+    status = job.get_status()
+    summary: Dict[str, Any] = {
+        "job_id": job.id,
+        "status": status.value if hasattr(status, "value") else status,
+        "enqueued_at": job.enqueued_at,
+        "started_at": job.started_at,
+        "ended_at": job.ended_at,
+        "retries_left": job.retries_left,
+    }
+    if status == JobStatus.FINISHED:
+        summary["result"] = job.return_value()
+    elif status == JobStatus.FAILED:
+        result = job.latest_result()
+        summary["error"] = result.exc_string.strip().splitlines()[-1] if result and result.exc_string else None
+    return summary
+
+
+def run_verification(pid: str, content: str) -> Dict[str, Any]:
+    """RQ job: verify a post and store its status.
+
+    Raises when the pipeline reports an error so RQ retries the job with backoff.
+    """
+    # Imported here so enqueueing from the API does not load the pipeline
+    from app.models.post import PostContentRequest
+    from app.services.verification_service import verify_post
+
+    response = verify_post(PostContentRequest(pid=pid, content=content))
+    if response.get("metadata", {}).get("error"):
+        raise RuntimeError(response.get("rationale") or f"Verification failed for post {pid}")
+    return response
+
+
+def enqueue_batch_verification(
+    post_ids: Optional[List[str]] = None,
+    status: Optional[str] = None,
+    limit: Optional[int] = None,
+    concurrency: Optional[int] = None,
+) -> Job:
+    """Queue a batch verification of posts selected by id or by ``verification_status``.
+
+    Args:
+        post_ids (List[str], optional): Posts to verify; takes precedence over ``status``
+        status (str, optional): Verify every post with this status
+        limit (int, optional): At most this many posts
+        concurrency (int, optional): Distinct claims verified at once
+
+    Returns:
+        Job: The queued job; its id is ``verify-batch-<uuid>``
+    """
+    return get_queue().enqueue_call(
+        func=run_batch_verification,
+        kwargs={"post_ids": post_ids, "status": status, "limit": limit, "concurrency": concurrency},
+        job_id=f"{BATCH_JOB_PREFIX}{uuid.uuid4().hex}",
+        timeout=settings.queue.batch_job_timeout,
+        result_ttl=settings.queue.result_ttl,
+        failure_ttl=settings.queue.result_ttl,
+        description=f"verify batch ({len(post_ids)} posts)" if post_ids else f"verify batch (status={status})",
+    )
+
+
+def get_batch_job_status(job_id: str) -> Optional[Dict[str, Any]]:
+    """Summarize a batch job with its progress, or ``None`` if there is none."""
+    if not job_id.startswith(BATCH_JOB_PREFIX):
+        return None
+    job = _fetch(job_id)
+    if job is None:
+        return None
+    summary = _summarize(job)
+    summary["progress"] = job.get_meta().get("progress")
+    return summary
+
+
+def run_batch_verification(
+    post_ids: Optional[List[str]] = None,
+    status: Optional[str] = None,
+    limit: Optional[int] = None,
+    concurrency: Optional[int] = None,
+) -> Dict[str, Any]:
+    """RQ job: verify a batch of posts, saving progress in the job's meta as it goes."""
+    from app.services.batch_verification import verify_batch
+
+    job = get_current_job()
+
+    def on_progress(summary: Dict[str, Any]) -> None:
+        if job is not None:
+            job.meta["progress"] = summary
+            job.save_meta()
+
+    return verify_batch(post_ids=post_ids, status=status, limit=limit, concurrency=concurrency, progress=on_progress)
+
+
+def enqueue_compaction(ttl: Optional[int] = None, max_documents: Optional[int] = None) -> Job:
+    """Queue compaction of the Chroma collections, reusing the job if one is still active.
+
+    Args:
+        ttl (int, optional): Passage TTL in seconds (default ``CHROMA_DOC_TTL``)
+        max_documents (int, optional): Passage collection size cap (default ``CHROMA_MAX_DOCUMENTS``)
+
+    Returns:
+        Job: The queued (or already active) job
+    """
+    existing = _fetch(COMPACTION_JOB_ID)
+    if existing is not None and existing.get_status(refresh=False) in ACTIVE_STATUSES:
+        return existing
+
+    return get_queue().enqueue_call(
+        func=run_compaction,
+        kwargs={"ttl": ttl, "max_documents": max_documents},
+        job_id=COMPACTION_JOB_ID,
+        timeout=settings.vectordb.compaction_job_timeout,
+        result_ttl=settings.queue.result_ttl,
+        failure_ttl=settings.queue.result_ttl,
+        description="compact chroma collections",
+    )
+
+
+def run_compaction(ttl: Optional[int] = None, max_documents: Optional[int] = None) -> List[Dict[str, Any]]:
+    """RQ job: delete expired and excess entries from the Chroma collections."""
+    from app.agents.rag_agent.compaction import compact
+
+    return compact(ttl=ttl, max_documents=max_documents)
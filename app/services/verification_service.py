@@ -10,186 +10,406 @@
 # - Integration with post service
 # - Verification result storage and retrieval
 
-from app.agents.scraper_agent.web_scraper import WebScraper
-from app.agents.search_agent.search_agent import get_links, search_web
-from app.models.rag import RagRequest
+from app.agents.search_agent.search_agent import aget_links, get_links, search_web
+from app.models.rag import ProgressCallback, RagRequest, RagResponse, emit_event
 from app.models.scraper import ScraperResult
 from app.models.post import PostContentRequest, PostVerificationRequest
-from app.agents.rag_agent.rag_agent import VerificationRAGPipeline
 from app.core.supabase import get_supabase_client
+from app.core.config import settings
+from app.services.context_packer import estimate_tokens, select_chunks
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import asyncio
+import threading
+from typing import TYPE_CHECKING, Optional
 
-pipeline = VerificationRAGPipeline()
-web_scraper = WebScraper()
+if TYPE_CHECKING:
+    from app.agents.rag_agent.claim_index import ClaimIndex
+    from app.agents.rag_agent.rag_agent import VerificationRAGPipeline
+    from app.agents.scraper_agent.web_scraper import WebScraper
 
+# Built on first use: importing the pipeline pulls in chromadb, google.generativeai
+# and newspaper, which the API should not pay for before it can serve requests
+_pipeline: Optional["VerificationRAGPipeline"] = None
+_web_scraper: Optional["WebScraper"] = None
+_claim_index: Optional["ClaimIndex"] = None
+_init_lock = threading.Lock()
 
-def get_context(post_data: PostContentRequest):
+
+def get_pipeline() -> "VerificationRAGPipeline":
+    """Get the process-wide RAG pipeline, creating it on first use."""
+    global _pipeline
+    if _pipeline is None:
+        with _init_lock:
+            if _pipeline is None:
+                from app.agents.rag_agent.rag_agent import VerificationRAGPipeline
+                _pipeline = VerificationRAGPipeline()
+    return _pipeline
+
+
+def get_web_scraper() -> "WebScraper":
+    """Get the process-wide web scraper, creating it on first use."""
+    global _web_scraper
+    if _web_scraper is None:
+        with _init_lock:
+            if _web_scraper is None:
+                from app.agents.scraper_agent.web_scraper import WebScraper
+                _web_scraper = WebScraper()
+    return _web_scraper
+
+
+def get_claim_index() -> Optional["ClaimIndex"]:
+    """Get the process-wide claim index, or None when ``CLAIM_REUSE_ENABLED`` is off."""
+    global _claim_index
+    if not settings.vectordb.claim_reuse_enabled:
+        return None
+    if _claim_index is None:
+        with _init_lock:
+            if _claim_index is None:
+                from app.agents.rag_agent.claim_index import ClaimIndex
+                _claim_index = ClaimIndex()
+    return _claim_index
+
+
+def warm_up(connect: bool = True) -> None:
+    """Import and build the pipeline components ahead of the first verification.
+
+    Args:
+        connect (bool): Also create the components, which opens their SQLite caches and
+            the claim index collection. Leave off in a process that forks afterwards
+            (the RQ worker forks per job); connections must not cross a fork.
+    """
+    import app.agents.rag_agent.claim_index  # noqa: F401  (imports rag_agent, chromadb, genai)
+    import app.agents.scraper_agent.web_scraper  # noqa: F401  (newspaper, lxml)
+
+    if not connect:
+        return
+    get_pipeline()
+    get_web_scraper()
+    claim_index = get_claim_index()
+    if claim_index is not None:
+        claim_index._get_collection()
+
+
+def _is_usable(result: Optional[ScraperResult]) -> bool:
+    return bool(result and any(p and p.strip() for p in result.content or []))
+
+
+def get_context(post_data: PostContentRequest, progress: Optional[ProgressCallback] = None):
     """Get context for post verification by scraping relevant links.
+
+    Links are scraped concurrently (at most ``MAX_CONCURRENT_SCRAPES`` at a time).
+    Scraping stops once ``SCRAPING_MIN_RESULTS`` pages returned usable content or
+    ``SCRAPING_TIMEOUT`` seconds have passed, whichever comes first; slower sites
+    are abandoned.
     
     Args:
         post_data (PostContentRequest): The post data to get context for
+        progress (ProgressCallback, optional): Receives search and per-link scrape events
         
     Returns:
-        List[ScraperResult]: List of scraped content results
+        List[ScraperResult]: List of scraped content results, in search ranking order
     """
     try:
         links = get_links(post_data)
+        emit_event(progress, "search_done", links=links)
         
         if not links:
             return []
-        
-        context = []
-        for link in links:
-            try:
-                result = web_scraper.webscrape(link)
-                if result:  # Only add non-None results
-                    context.append(result)
-            except Exception as e:
-                print(f"Failed to scrape link {link} for post {post_data.pid}: {str(e)}")
-                continue
-        
-        return context
+
+        enough = max(1, min(settings.scraping.min_results, len(links)))
+        workers = max(1, min(settings.scraping.max_concurrent, len(links)))
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="scraper")
+        web_scraper = get_web_scraper()
+        futures = {executor.submit(web_scraper.webscrape, link): (rank, link) for rank, link in enumerate(links)}
+
+        results = {}
+        try:
+            for future in as_completed(futures, timeout=settings.scraping.timeout):
+                rank, link = futures[future]
+                try:
+                    result = future.result()
+                    if _is_usable(result):
+                        results[rank] = result
+                    emit_event(progress, "scrape_done", url=link, ok=_is_usable(result),
+                               paragraphs=len(result.content) if result else 0)
+                except Exception as e:
+                    print(f"Failed to scrape link {link} for post {post_data.pid}: {str(e)}")
+                    emit_event(progress, "scrape_done", url=link, ok=False, error=str(e))
+                if len(results) >= enough:
+                    break
+        except TimeoutError:
+            print(f"Scraping for post {post_data.pid} hit the {settings.scraping.timeout}s deadline "
+                  f"with {len(results)} usable results")
+        finally:
+            # Don't wait for the slowest sites; their threads finish in the background
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        return [results[rank] for rank in sorted(results)]
     except Exception as e:
         print(f"Error getting context for post {post_data.pid}: {str(e)}")
         return []
 
 
-def scraperresult_to_context_string(result: ScraperResult) -> str:
-    """Convert a ScraperResult to a formatted context string.
-    
-    Args:
-        result (ScraperResult): The scraped result to convert
-        
+async def aget_context(post_data: PostContentRequest, progress: Optional[ProgressCallback] = None):
+    """Async ``get_context``: links are scraped as concurrent tasks on the event loop.
+
+    Same limits as ``get_context``: at most ``MAX_CONCURRENT_SCRAPES`` downloads
+    per post, done after ``SCRAPING_MIN_RESULTS`` usable pages or
+    ``SCRAPING_TIMEOUT`` seconds; remaining scrapes are cancelled.
+
     Returns:
-        str: Formatted context string
+        List[ScraperResult]: Scraped content results, in search ranking order
     """
-    if not result:
-        return ""
-    
     try:
-        title = result.title or "No title"
-        summary = result.article_summary or "No summary"
-        source = result.source or "Unknown source"
-        content = result.content or []
-        
-        # Create a more concise context string
-        context_parts = []
-        
-        # Add title and summary (most important)
-        if title != "No title":
-            context_parts.append(f"Title: {title}")
-        if summary != "No summary":
-            context_parts.append(f"Summary: {summary}")
-        
-        # Add source
-        if source != "Unknown source":
-            context_parts.append(f"Source: {source}")
-        
-        # Add limited content (first few paragraphs)
-        if content:
-            # Limit content to first 3 paragraphs or 500 characters
-            content_text = "\n".join(content[:3])  # First 3 paragraphs
-            if len(content_text) > 500:
-                content_text = content_text[:500] + "..."
-            context_parts.append(f"Content: {content_text}")
-        
-        return "\n".join(context_parts)
+        links = await aget_links(post_data)
+        emit_event(progress, "search_done", links=links)
+
+        if not links:
+            return []
+
+        enough = max(1, min(settings.scraping.min_results, len(links)))
+        limit = asyncio.Semaphore(max(1, min(settings.scraping.max_concurrent, len(links))))
+
+        async def scrape(rank, link):
+            async with limit:
+                try:
+                    result = await get_web_scraper().awebscrape(link)
+                except Exception as e:
+                    print(f"Failed to scrape link {link} for post {post_data.pid}: {str(e)}")
+                    emit_event(progress, "scrape_done", url=link, ok=False, error=str(e))
+                    return rank, None
+            emit_event(progress, "scrape_done", url=link, ok=_is_usable(result),
+                       paragraphs=len(result.content) if result else 0)
+            return rank, result
+
+        tasks = [asyncio.create_task(scrape(rank, link)) for rank, link in enumerate(links)]
+        results = {}
+        try:
+            for next_done in asyncio.as_completed(tasks, timeout=settings.scraping.timeout):
+                rank, result = await next_done
+                if _is_usable(result):
+                    results[rank] = result
+                if len(results) >= enough:
+                    break
+        except asyncio.TimeoutError:
+            print(f"Scraping for post {post_data.pid} hit the {settings.scraping.timeout}s deadline "
+                  f"with {len(results)} usable results")
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        return [results[rank] for rank in sorted(results)]
     except Exception as e:
-        print(f"Error converting scraper result to context string: {str(e)}")
-        return f"Error processing content: {str(e)}"
+        print(f"Error getting context for post {post_data.pid}: {str(e)}")
+        return []
+
+
+def _find_reusable(post_data: PostContentRequest, progress: Optional[ProgressCallback] = None):
+    """Response reusing the verdict of a near-duplicate verified claim, or None; emits ``claim_reused``.
+
+    The post's own entry never matches, so its previous verdict is not handed back to it.
+    """
+    claim_index = get_claim_index()
+    if claim_index is None:
+        return None
+    try:
+        match = claim_index.lookup(post_data.content, exclude_post_id=post_data.pid)
+    except Exception as e:
+        print(f"Claim index lookup failed for post {post_data.pid}: {str(e)}")
+        return None
+    if match is None:
+        return None
+
+    response = match.to_response(post_data.pid)
+    emit_event(progress, "claim_reused", **response["metadata"]["reused_from"])
+    return response
+
+
+def forget_claim(pid: str) -> None:
+    """Drop a post's claim index entry, e.g. after its content was edited."""
+    claim_index = get_claim_index()
+    if claim_index is not None:
+        claim_index.remove(pid)
+
+
+def _reuse_verdict(post_data: PostContentRequest, progress: Optional[ProgressCallback] = None):
+    """Response reusing the verdict of a near-duplicate verified claim, or None.
+
+    Args:
+        post_data (PostContentRequest): The post being verified
+        progress (ProgressCallback, optional): Receives ``claim_reused`` and ``completed`` on reuse
+
+    Returns:
+        dict | None: Verification response with ``metadata.reused_from`` provenance
+    """
+    response = _find_reusable(post_data, progress)
+    if response is None:
+        return None
+
+    get_supabase_client().table('posts').update({
+        "verification_status": response["status"],
+    }).eq("pid", post_data.pid).execute()
+    emit_event(progress, "completed", status=response["status"], confidence=response["confidence"])
+    return response
+
+
+def _build_request(post_data: PostContentRequest, context, progress: Optional[ProgressCallback] = None) -> RagRequest:
+    """RAG request with the scraped context packed for the claim; emits ``context_ready``."""
+    # Best passages for the claim across all sources, within the prompt token budget
+    chunks = select_chunks(post_data.content, context)
+    context_strings = [chunk.render() for chunk in chunks]
+    sources = [chunk.source for chunk in chunks]
+    
+    # If no context found, add a general knowledge context for well-known facts
+    if not context_strings or all(not ctx.strip() for ctx in context_strings):
+        context_strings = [
+            "This is a general knowledge verification context. "
+            "Consider well-known facts, historical events, scientific principles, "
+            "and commonly accepted information when evaluating the claim."
+        ]
+        sources = []
 
+    emit_event(progress, "context_ready", sources=len(context), chunks=len(context_strings),
+               characters=sum(len(ctx) for ctx in context_strings),
+               tokens=sum(estimate_tokens(ctx) for ctx in context_strings))
 
+    return RagRequest(
+        post_id=post_data.pid,
+        post_content=post_data.content,
+        context=context_strings,
+        sources=sources,
+    )
 
-def verify_post(post_data: PostContentRequest):
+
+def _save_result(post_data: PostContentRequest, response: dict, progress: Optional[ProgressCallback] = None) -> None:
+    """Store the verdict on the post, index the claim for reuse and emit ``completed``."""
+    # Get the verification status from the response (already a string)
+    verification_status = response.get('status', 'unverified')
+    
+    # Validate that the status is one of the expected values
+    valid_statuses = [status.value for status in RagResponse]
+    if verification_status not in valid_statuses:
+        verification_status = 'unverified'
+
+    # Update the database with the string value
+    update_result = get_supabase_client().table('posts').update({
+        "verification_status": verification_status,
+    }).eq("pid", post_data.pid).execute()
+    
+    if not update_result.data:
+        print(f"Warning: Failed to update verification status for post {post_data.pid}")
+
+    claim_index = get_claim_index()
+    if claim_index is not None:
+        try:
+            claim_index.add(post_data.pid, post_data.content, response)
+        except Exception as e:
+            print(f"Failed to index claim of post {post_data.pid}: {str(e)}")
+    
+    emit_event(progress, "completed", status=verification_status,
+               confidence=response.get('confidence', 0.0))
+
+
+def _fail(post_data: PostContentRequest, error: Exception, progress: Optional[ProgressCallback] = None) -> dict:
+    """Mark the post unverified after a pipeline error and build the error response."""
+    print(f"Error during verification for post {post_data.pid}: {str(error)}")
+    emit_event(progress, "error", message=str(error))
+    
+    # Update database with error status
+    try:
+        supabase = get_supabase_client()
+        supabase.table('posts').update({
+            "verification_status": "unverified",
+        }).eq("pid", post_data.pid).execute()
+    except Exception as db_error:
+        print(f"Failed to update error status in database: {str(db_error)}")
+    
+    # Return error response
+    return {
+        "status": "unverified",
+        "confidence": 0.0,
+        "answer": "Verification failed due to an error",
+        "supporting_context": [],
+        "rationale": f"Error during verification: {str(error)}",
+        "metadata": {
+            "post_id": post_data.pid,
+            "error": True
+        },
+    }
+
+
+def verify_post(post_data: PostContentRequest, progress: Optional[ProgressCallback] = None, reuse: bool = True):
     """Verify a post using the RAG pipeline.
 
     Args:
         post_data (PostContentRequest): The post data to verify.
+        progress (ProgressCallback, optional): Receives an event as each stage finishes.
+        reuse (bool): Reuse the verdict of a near-duplicate claim; off for explicit re-verification.
 
     Returns:
         dict: Verification response with status, confidence, and metadata
     """
     try:
-        supabase = get_supabase_client()
+        # A near-identical claim was verified recently: reuse its verdict
+        reused = _reuse_verdict(post_data, progress) if reuse else None
+        if reused is not None:
+            return reused
         
         # Get context for verification
-        context = get_context(post_data)
-        context_strings = [scraperresult_to_context_string(result) for result in context]
-        
-        # Limit context size to avoid API payload limits
-        max_context_length = 8000  # Limit total context to ~8KB
-        total_length = sum(len(ctx) for ctx in context_strings)
-        if total_length > max_context_length:
-            print(f"Context too large ({total_length} chars), truncating to {max_context_length} chars")
-            truncated_contexts = []
-            current_length = 0
-            for ctx in context_strings:
-                if current_length + len(ctx) <= max_context_length:
-                    truncated_contexts.append(ctx)
-                    current_length += len(ctx)
-                else:
-                    # Add partial context if there's space
-                    remaining = max_context_length - current_length
-                    if remaining > 100:  # Only add if there's meaningful space
-                        truncated_contexts.append(ctx[:remaining] + "...")
-                    break
-            context_strings = truncated_contexts
-        
-        # If no context found, add a general knowledge context for well-known facts
-        if not context_strings or all(not ctx.strip() for ctx in context_strings):
-            context_strings = [
-                "This is a general knowledge verification context. "
-                "Consider well-known facts, historical events, scientific principles, "
-                "and commonly accepted information when evaluating the claim."
-            ]
-
-        request = RagRequest(
-            post_id=post_data.pid,
-            post_content=post_data.content,
-            context=context_strings
-        )
-        
-        response = pipeline.verify(request, top_k=4)
-        
-        # Get the verification status from the response (already a string)
-        verification_status = response.get('status', 'unverified')
-        
-        # Validate that the status is one of the expected values
-        from app.models.rag import RagResponse
-        valid_statuses = [status.value for status in RagResponse]
-        if verification_status not in valid_statuses:
-            verification_status = 'unverified'
-
-        # Update the database with the string value
-        update_result = supabase.table('posts').update({
-            "verification_status": verification_status,
-        }).eq("pid", post_data.pid).execute()
-        
-        if not update_result.data:
-            print(f"Warning: Failed to update verification status for post {post_data.pid}")
+        context = get_context(post_data, progress)
+        request = _build_request(post_data, context, progress)
         
+        # The packer already picked what fits the budget; retrieval only orders it
+        response = get_pipeline().verify(request, top_k=max(4, len(request.context)), progress=progress)
+        _save_result(post_data, response, progress)
         return response
         
     except Exception as e:
-        print(f"Error during verification for post {post_data.pid}: {str(e)}")
-        
-        # Update database with error status
-        try:
-            supabase = get_supabase_client()
-            supabase.table('posts').update({
-                "verification_status": "unverified",
-            }).eq("pid", post_data.pid).execute()
-        except Exception as db_error:
-            print(f"Failed to update error status in database: {str(db_error)}")
-        
-        # Return error response
-        return {
-            "status": "unverified",
-            "confidence": 0.0,
-            "answer": "Verification failed due to an error",
-            "supporting_context": [],
-            "rationale": f"Error during verification: {str(e)}",
-            "metadata": {
-                "post_id": post_data.pid,
-                "error": True
-            },
-        }
\ No newline at end of file
+        return _fail(post_data, e, progress)
+
+
+async def averify_post(
+    post_data: PostContentRequest, progress: Optional[ProgressCallback] = None, reuse: bool = True
+):
+    """Async ``verify_post`` for the event loop.
+
+    Search, scraping, embeddings and generation are awaited, so one process can
+    run many verifications concurrently. Steps that only have blocking clients
+    (claim index, Supabase writes) run in worker threads.
+
+    Args:
+        post_data (PostContentRequest): The post data to verify.
+        progress (ProgressCallback, optional): Receives an event as each stage finishes.
+        reuse (bool): Reuse the verdict of a near-duplicate claim; off for explicit re-verification.
+
+    Returns:
+        dict: Verification response with status, confidence, and metadata
+    """
+    try:
+        response = await averify_content(post_data, progress, reuse=reuse)
+        # Reused verdicts are saved the same way; the claim index skips them
+        await asyncio.to_thread(_save_result, post_data, response, progress)
+        return response
+
+    except Exception as e:
+        return await asyncio.to_thread(_fail, post_data, e, progress)
+
+
+async def averify_content(
+    post_data: PostContentRequest, progress: Optional[ProgressCallback] = None, reuse: bool = True
+):
+    """Run the async pipeline for a post without storing anything (batch verification saves in bulk).
+
+    Returns:
+        dict: Verification response; pipeline errors are raised
+    """
+    if reuse:
+        reused = await asyncio.to_thread(_find_reusable, post_data, progress)
+        if reused is not None:
+            return reused
+
+    context = await aget_context(post_data, progress)
+    # Chunking and BM25 scoring are CPU bound
+    request = await asyncio.to_thread(_build_request, post_data, context, progress)
+
+    return await get_pipeline().averify(request, top_k=max(4, len(request.context)), progress=progress)
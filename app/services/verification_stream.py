@@ -0,0 +1,78 @@
+"""
+Server-Sent Events stream of verification progress.
+
+``averify_post`` runs as a task on the event loop and reports each finished
+stage through its ``progress`` callback (some stages run in worker threads, so
+events are queued thread-safely). They are written to the client as they
+happen, so the first event arrives right away instead of after the whole
+pipeline, and a stream no longer holds a threadpool thread.
+
+If the client disconnects, the verification keeps running until its result is
+saved; only the stream stops.
+"""
+
+import asyncio
+import json
+from typing import AsyncIterator, Optional, Set
+
+from app.models.post import PostContentRequest
+from app.models.rag import VerificationEvent
+from app.services.verification_service import averify_post
+
+# Comment line sent when no event was emitted for a while, keeps proxies from
+# closing an idle connection
+KEEPALIVE_SECONDS = 15.0
+
+_DONE = object()
+
+# Verifications whose client went away; referenced so they are not garbage collected
+_orphaned: Set[asyncio.Task] = set()
+
+
+def format_sse(event: VerificationEvent) -> str:
+    payload = json.dumps(event.model_dump(), default=str)
+    return f"event: {event.stage}\ndata: {payload}\n\n"
+
+
+async def stream_verification(post_data: PostContentRequest, reuse: bool = True) -> AsyncIterator[str]:
+    """Verify a post and yield SSE frames for every stage.
+
+    The last frame is ``result`` with the full verification response (or
+    ``error`` if the pipeline raised). ``reuse`` is passed to ``averify_post``.
+    """
+    loop = asyncio.get_running_loop()
+    events: asyncio.Queue = asyncio.Queue()
+
+    def on_event(event: VerificationEvent) -> None:
+        loop.call_soon_threadsafe(events.put_nowait, event)
+
+    async def run() -> Optional[dict]:
+        try:
+            return await averify_post(post_data, progress=on_event, reuse=reuse)
+        finally:
+            loop.call_soon_threadsafe(events.put_nowait, _DONE)
+
+    task = asyncio.create_task(run())
+    try:
+        yield format_sse(VerificationEvent(stage="started", data={"post_id": post_data.pid}))
+
+        while True:
+            try:
+                event = await asyncio.wait_for(events.get(), timeout=KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            if event is _DONE:
+                break
+            yield format_sse(event)
+    finally:
+        # Client disconnected mid-stream: let the verification finish on its own
+        if not task.done():
+            _orphaned.add(task)
+            task.add_done_callback(_orphaned.discard)
+
+    try:
+        result = await task
+        yield format_sse(VerificationEvent(stage="result", data=result or {}))
+    except Exception as e:
+        yield format_sse(VerificationEvent(stage="error", data={"message": str(e)}))
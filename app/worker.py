@@ -0,0 +1,42 @@
+"""
+Verification worker process.
+
+Runs queued verification jobs (see ``app/services/verification_queue.py``):
+
+    python -m app.worker
+
+The RQ scheduler is enabled so failed jobs are retried after their backoff
+interval. The verification pipeline modules are imported before the worker
+starts listening (``--no-warm-up`` skips this), so each job's forked work horse
+inherits them instead of importing chromadb, google.generativeai and newspaper
+again.
+"""
+
+import argparse
+
+from rq import Worker
+
+from app.core.config import settings
+from app.core.redis import get_redis_client
+from app.services.verification_queue import get_queue
+from app.services.verification_service import warm_up
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run the Hive verification worker")
+    parser.add_argument("--burst", action="store_true", help="Exit once the queue is empty")
+    parser.add_argument("--no-warm-up", action="store_true", help="Import the pipeline in the first job instead")
+    args = parser.parse_args()
+
+    if not args.no_warm_up:
+        # Imports only: RQ forks a work horse per job, and the SQLite caches and
+        # Chroma client must be opened after the fork, not shared across it
+        warm_up(connect=False)
+
+    worker = Worker([get_queue()], connection=get_redis_client(decode_responses=False))
+    print(f"Verification worker listening on '{settings.queue.verification_queue}' ({settings.redis_url})")
+    worker.work(with_scheduler=True, burst=args.burst)
+
+
+if __name__ == "__main__":
+    main()
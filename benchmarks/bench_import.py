@@ -0,0 +1,140 @@
+"""
+Cold-start cost of the API: time to ``import app.main`` in a fresh interpreter.
+
+Each run starts a new Python process, so nothing is cached in ``sys.modules``.
+Rows:
+
+- ``import app.main``: the API as it is now, with the verification components
+  built on first use. The heavy modules column lists which of chromadb,
+  google.generativeai and newspaper ended up imported.
+- ``+ warm_up(connect=False)``: the imports the worker pays before forking.
+- ``eager import (before)``: ``import app.main`` followed, in the same timed
+  step, by building ``VerificationRAGPipeline()``, ``WebScraper()`` and
+  ``ClaimIndex()`` the way ``verification_service`` did at module level before
+  they were made lazy.
+- ``import app.main @ REV`` (with ``--baseline REV``): the same import, timed in
+  a ``git archive`` export of an older commit, e.g. the one before the change.
+
+Caches and Chroma go to a throwaway directory.
+
+Usage:
+    python -m benchmarks.bench_import [--runs 5] [--baseline REV]
+"""
+
+import argparse
+import io
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tarfile
+import tempfile
+from typing import Optional
+
+HEAVY_MODULES = ("chromadb", "google.generativeai", "newspaper")
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_LAZY_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import app.main
+app_ms = (time.perf_counter() - start) * 1000
+heavy_after_app = [m for m in {heavy!r} if m in sys.modules]
+start = time.perf_counter()
+from app.services.verification_service import warm_up
+warm_up(connect=False)
+warm_ms = (time.perf_counter() - start) * 1000
+print(json.dumps({{"app": app_ms, "warm": warm_ms, "heavy": heavy_after_app,
+                   "heavy_after_warm": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+# What importing verification_service cost before the components were built lazily
+_EAGER_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import app.main
+from app.core.config import settings
+from app.agents.rag_agent.rag_agent import VerificationRAGPipeline
+from app.agents.rag_agent.claim_index import ClaimIndex
+from app.agents.scraper_agent.web_scraper import WebScraper
+pipeline = VerificationRAGPipeline()
+web_scraper = WebScraper()
+claim_index = ClaimIndex() if settings.vectordb.claim_reuse_enabled else None
+app_ms = (time.perf_counter() - start) * 1000
+print(json.dumps({{"app": app_ms, "heavy": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+_IMPORT_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import app.main
+app_ms = (time.perf_counter() - start) * 1000
+print(json.dumps({{"app": app_ms, "heavy": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def _probe(code: str, workdir: str, cwd: str = ROOT) -> dict:
+    env = {
+        "SUPABASE_URL": "https://example.supabase.co",
+        "SUPABASE_ANON_KEY": "anon",
+        "CHROMA_PERSIST_PATH": os.path.join(workdir, "chroma"),
+        "EMBED_CACHE_PATH": os.path.join(workdir, "embeddings.sqlite3"),
+        "SCRAPE_CACHE_PATH": os.path.join(workdir, "scrape_cache.sqlite3"),
+        "LLM_CACHE_PATH": os.path.join(workdir, "llm_cache.sqlite3"),
+        **os.environ,
+        "PYTHONPATH": cwd,
+    }
+    out = subprocess.run(
+        [sys.executable, "-c", code.format(heavy=HEAVY_MODULES)],
+        capture_output=True, text=True, check=True, env=env, cwd=cwd,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def _median(code: str, runs: int, workdir: str, cwd: str = ROOT):
+    _probe(code, workdir, cwd)  # warm the OS file cache and __pycache__
+    samples = [_probe(code, workdir, cwd) for _ in range(runs)]
+    return samples, {key: statistics.median(s[key] for s in samples) for key in ("app", "warm") if key in samples[0]}
+
+
+def _export(rev: str, dest: str) -> None:
+    archive = subprocess.run(["git", "archive", rev], capture_output=True, check=True, cwd=ROOT).stdout
+    with tarfile.open(fileobj=io.BytesIO(archive)) as tar:
+        tar.extractall(dest, filter="data")
+
+
+def _row(step: str, ms: float, heavy: Optional[list] = None) -> None:
+    modules = "" if heavy is None else ", ".join(heavy) or "-"
+    print(f"{step:<32}{ms:>11.0f}  {modules}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--baseline", metavar="REV", help="also time `import app.main` at this git revision")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="bench_import_") as workdir:
+        lazy, lazy_ms = _median(_LAZY_PROBE, args.runs, workdir)
+        eager, eager_ms = _median(_EAGER_PROBE, args.runs, workdir)
+
+        print(f"{'step':<32}{'median ms':>11}  heavy modules loaded")
+        _row("import app.main", lazy_ms["app"], lazy[0]["heavy"])
+        _row("+ warm_up(connect=False)", lazy_ms["warm"], lazy[0]["heavy_after_warm"])
+        _row("eager import (before)", eager_ms["app"], eager[0]["heavy"])
+
+        if args.baseline:
+            tree = os.path.join(workdir, "tree")
+            try:
+                _export(args.baseline, tree)
+                base, base_ms = _median(_IMPORT_PROBE, args.runs, workdir, cwd=tree)
+            except subprocess.CalledProcessError as e:
+                err = e.stderr.decode(errors="replace") if isinstance(e.stderr, bytes) else e.stderr or ""
+                print(f"import app.main @ {args.baseline} failed: {err.strip()[-300:]}")
+            else:
+                _row(f"import app.main @ {args.baseline}", base_ms["app"], base[0]["heavy"])
+
+
+if __name__ == "__main__":
+    main()
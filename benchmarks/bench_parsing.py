@@ -0,0 +1,72 @@
+"""
+Per-page parse time of the scrapers: full html5lib parse vs the lxml fast path.
+
+Both columns run the same extractor on the same fixture page; only the way the
+page is turned into a soup differs. The generic row measures the BeautifulSoup
+fallback scraper (newspaper already parses with lxml on its own).
+
+Usage:
+    python -m benchmarks.bench_parsing [--runs 10] [--paragraphs 30]
+"""
+
+import argparse
+import statistics
+import time
+
+from app.agents.scraper_agent.parsing import FALLBACK_PARSER, parse_html
+from app.agents.scraper_agent.sites import site_for_url
+from app.agents.scraper_agent.web_scraper import WebScraper
+from benchmarks.fixtures import SITES, URLS, make_page
+
+
+def _paths(scraper: WebScraper):
+    """site -> (extract from a soup, fast path from raw html)"""
+    paths = {}
+    for site in SITES:
+        spec = site_for_url(URLS[site])
+        if spec is None:
+            paths[site] = (scraper._old_generic_extract, scraper._old_generic_webscrape)
+        else:
+            paths[site] = (spec.extract, lambda url, html, spec=spec: scraper._site_webscrape(spec, url, html))
+    return paths
+
+
+def _time(fn, runs: int) -> float:
+    """Median wall time of ``fn()`` in milliseconds."""
+    fn()  # warm up
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--paragraphs", type=int, default=30)
+    args = parser.parse_args()
+
+    scraper = WebScraper(cache=None)
+    paths = _paths(scraper)
+
+    print(f"{'site':<12}{'page KB':>9}{'html5lib ms':>13}{'fast ms':>10}{'speedup':>9}")
+    for site in SITES:
+        url = URLS[site]
+        html = make_page(site, paragraphs=args.paragraphs)
+        extract, fast = paths[site]
+
+        slow_result = extract(url, parse_html(html, FALLBACK_PARSER))
+        fast_result = fast(url, html)
+        if site != "generic":
+            # Same article either way; the generic scraper keeps all page text so only lengths are close
+            assert fast_result == slow_result, f"{site}: fast path extracted different content"
+
+        slow_ms = _time(lambda: extract(url, parse_html(html, FALLBACK_PARSER)), args.runs)
+        fast_ms = _time(lambda: fast(url, html), args.runs)
+        print(f"{site:<12}{len(html) / 1024:>9.0f}{slow_ms:>13.1f}{fast_ms:>10.1f}{slow_ms / fast_ms:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
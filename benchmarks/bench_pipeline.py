@@ -0,0 +1,243 @@
+"""
+Offline end-to-end benchmark of ``verify_post``.
+
+Runs the whole verification (claim reuse lookup, search, concurrent scraping,
+context packing, embedding, retrieval, generation) for a dataset of claims
+without network or API quota:
+
+- the RAG pipeline uses the deterministic local backend (``RAG_BACKEND=local``)
+  with simulated LLM/embedding latency (``--llm-latency``, ``--embed-latency``),
+- search returns ``--links`` URLs on a local fixture server (``bench_scraper``),
+- Supabase writes go to an in-memory stand-in,
+- Chroma and every cache live in a temporary directory, so each run starts cold
+  (``--repeat 2`` shows the warm path: scrape, embedding, LLM and claim caches).
+
+Per-stage latency comes from the timestamps of the progress events
+``verify_post`` emits: each stage is timed from the previous stage's last event
+(``scrape`` from ``search_done`` to the last ``scrape_done``).
+
+``--async`` drives ``averify_post`` on one event loop instead of
+``verify_post`` in a thread pool; ``--concurrency`` is then the number of
+verifications in flight.
+
+Claims come from ``--claims FILE`` (one per line, or JSON lines with a
+``content`` field) or a built-in list.
+
+Usage:
+    python -m benchmarks.bench_pipeline [--claims FILE] [--concurrency 4] [--repeat 1]
+        [--links 4] [--llm-latency 0.8] [--embed-latency 0.1] [--generation-mode single] [--async]
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+from app.core.config import settings
+from app.models.post import PostContentRequest
+from benchmarks.bench_scraper import _percentile, start_server
+from benchmarks.fixtures import make_page
+
+CLAIMS = [
+    "The state government announced a new water project for farmers in the district",
+    "Police said the court report on the election was released this week",
+    "The railway budget includes a new airport link for the city",
+    "Hospital data shows a 20 percent rise in health spending in the state",
+    "The minister said schools will stay closed due to heavy rain",
+    "The council approved the policy on district water supply",
+    "Farmers were promised 500 crore in the state budget",
+    "Official statement says the election will be held next week",
+]
+
+# verify_post stages in the order they finish; a reused claim skips straight to completed
+STAGES = [
+    ("search", "search_done"),
+    ("scrape", "scrape_done"),
+    ("pack", "context_ready"),
+    ("embed", "embeddings_stored"),
+    ("retrieve", "retrieved"),
+    ("answer", "answer_generated"),
+    ("classify", "classified"),
+    ("store", "completed"),
+]
+
+
+class _Table:
+    def __init__(self, writes):
+        self.writes = writes
+
+    def update(self, values):
+        self.writes.append(values)
+        return self
+
+    def eq(self, *args):
+        return self
+
+    def execute(self):
+        return SimpleNamespace(data=[{}])
+
+
+class _Supabase:
+    """Accepts ``table(...).update(...).eq(...).execute()`` and keeps the writes."""
+
+    def __init__(self):
+        self.writes = []
+
+    def table(self, name):
+        return _Table(self.writes)
+
+
+def load_claims(path=None):
+    if not path:
+        return list(CLAIMS)
+    claims = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            claims.append(json.loads(line)["content"] if line.startswith("{") else line)
+    return claims
+
+
+def configure(args, workdir):
+    """Point the pipeline at the local backend and throwaway storage; must run before importing services."""
+    settings.gemini.backend = "local"
+    settings.gemini.generation_mode = args.generation_mode
+    settings.local_llm.latency = args.llm_latency
+    settings.local_llm.embed_latency = args.embed_latency
+    settings.local_llm.jitter = args.jitter
+    settings.vectordb.chroma_persist_path = f"{workdir}/chroma"
+    settings.vectordb.claim_reuse_enabled = args.claim_reuse
+    settings.gemini.embed_cache_path = f"{workdir}/embeddings.sqlite3"
+    settings.llm_cache.backend = "sqlite"
+    settings.llm_cache.path = f"{workdir}/llm_cache.sqlite3"
+    settings.scraping.cache_path = f"{workdir}/scrape_cache.sqlite3"
+    settings.scraping.min_results = args.links
+    settings.scraping.max_concurrent = args.links
+    # Every fixture is served from one host, so measure the pipeline rather than the politeness spacing
+    settings.scraping.delay = 0.0
+    settings.scraping.domain_concurrency = args.links * args.concurrency
+    settings.scraping.politeness_backend = "local"
+
+
+def stage_durations(start, events):
+    """stage -> seconds, from the last event of each stage; stages that didn't run are left out."""
+    last = {}
+    for event in events:
+        last[event.stage] = event.timestamp
+    durations = {}
+    previous = start
+    for name, stage in STAGES:
+        if stage in last:
+            durations[name] = last[stage] - previous
+            previous = last[stage]
+    return durations
+
+
+def run(claims, concurrency, base_url, links, verification_service):
+    def verify(item):
+        i, claim = item
+        events = []
+        post = PostContentRequest(pid=f"bench-{i}", content=claim)
+        start = time.time()
+        response = verification_service.verify_post(post, progress=events.append)
+        return time.time() - start, stage_durations(start, events), response
+
+    verification_service.get_links = lambda post: fixture_links(base_url, post, links)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        runs = list(executor.map(verify, enumerate(claims)))
+    return time.perf_counter() - start, runs
+
+
+async def arun(claims, concurrency, base_url, links, verification_service):
+    limit = asyncio.Semaphore(concurrency)
+
+    async def verify(i, claim):
+        async with limit:
+            events = []
+            post = PostContentRequest(pid=f"bench-{i}", content=claim)
+            start = time.time()
+            response = await verification_service.averify_post(post, progress=events.append)
+            return time.time() - start, stage_durations(start, events), response
+
+    async def links_for(post):
+        return fixture_links(base_url, post, links)
+
+    verification_service.aget_links = links_for
+    start = time.perf_counter()
+    runs = await asyncio.gather(*(verify(i, claim) for i, claim in enumerate(claims)))
+    return time.perf_counter() - start, runs
+
+
+def fixture_links(base_url, post, links):
+    return [f"{base_url}/generic?post={post.pid}&n={n}" for n in range(links)]
+
+
+def report(label, elapsed, runs):
+    totals = [total for total, _, _ in runs]
+    statuses = {}
+    for _, _, response in runs:
+        statuses[response.get("status")] = statuses.get(response.get("status"), 0) + 1
+    errors = sum(1 for _, _, response in runs if (response.get("metadata") or {}).get("error"))
+
+    print(f"\n{label}: {len(runs)} claims in {elapsed:.2f}s, {len(runs) / elapsed:.2f} claims/s, "
+          f"{errors} errors, statuses {statuses}")
+    print(f"{'stage':<10}{'runs':>6}{'p50 ms':>10}{'p95 ms':>10}{'mean ms':>10}")
+    for name, _ in STAGES + [("total", None)]:
+        samples = totals if name == "total" else [d[name] for _, d, _ in runs if name in d]
+        if not samples:
+            continue
+        samples = [s * 1000 for s in samples]
+        print(f"{name:<10}{len(samples):>6}{statistics.median(samples):>10.1f}"
+              f"{_percentile(samples, 95):>10.1f}{statistics.fmean(samples):>10.1f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Offline end-to-end verify_post benchmark")
+    parser.add_argument("--claims", help="file with one claim per line (or JSON lines with 'content')")
+    parser.add_argument("--concurrency", type=int, default=4, help="posts verified in parallel")
+    parser.add_argument("--repeat", type=int, default=1, help="passes over the claims; later passes hit warm caches")
+    parser.add_argument("--links", type=int, default=4, help="search results (fixture pages) per claim")
+    parser.add_argument("--llm-latency", type=float, default=0.8, help="simulated seconds per generation")
+    parser.add_argument("--embed-latency", type=float, default=0.1, help="simulated seconds per embedding batch")
+    parser.add_argument("--jitter", type=float, default=0.2, help="+/- fraction of the simulated latencies")
+    parser.add_argument("--generation-mode", choices=["single", "two_call"], default="single")
+    parser.add_argument("--claim-reuse", action="store_true", help="enable near-duplicate verdict reuse")
+    parser.add_argument("--async", dest="use_async", action="store_true", help="benchmark averify_post")
+    args = parser.parse_args()
+
+    claims = load_claims(args.claims)
+    pages = {"generic": make_page("generic")}
+    server, base_url = start_server(pages)
+
+    with tempfile.TemporaryDirectory(prefix="bench_pipeline_") as workdir:
+        configure(args, workdir)
+        # Imported only now: the service reads settings (e.g. claim reuse) and builds its pipeline from them
+        from app.services import verification_service
+
+        supabase = _Supabase()
+        verification_service.get_supabase_client = lambda: supabase
+        print(f"backend=local generation_mode={args.generation_mode} llm_latency={args.llm_latency}s "
+              f"embed_latency={args.embed_latency}s links={args.links} concurrency={args.concurrency} "
+              f"path={'averify_post' if args.use_async else 'verify_post'}")
+        try:
+            for attempt in range(args.repeat):
+                if args.use_async:
+                    elapsed, runs = asyncio.run(
+                        arun(claims, args.concurrency, base_url, args.links, verification_service)
+                    )
+                else:
+                    elapsed, runs = run(claims, args.concurrency, base_url, args.links, verification_service)
+                report("cold" if attempt == 0 else f"warm #{attempt}", elapsed, runs)
+        finally:
+            server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
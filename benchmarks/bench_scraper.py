@@ -0,0 +1,152 @@
+"""
+Offline throughput benchmark for ``WebScraper``.
+
+Fixture pages are served by a local stand-in HTTP server and every extractor is
+run end to end through ``WebScraper._fetch`` (shared pooled session) and its
+parse/extract step: the registered site extractors (``sites.py``) plus both
+generic scrapers. No live site is contacted, so runs are repeatable locally.
+
+Pages come from ``benchmarks/fixtures.py`` unless ``--fixtures DIR`` points at
+a directory of saved pages named ``<site>.html`` (indiatoday, livemint, ndtv,
+generic), e.g. real articles saved from a browser.
+
+Reports, per extractor: pages/sec, p50/p95 latency, peak traced memory of one
+page and the number of paragraphs extracted.
+
+Usage:
+    python -m benchmarks.bench_scraper [--pages 50] [--concurrency 4] [--fixtures DIR] [--delay 0]
+"""
+
+import argparse
+import os
+import statistics
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from app.agents.scraper_agent import politeness
+from app.agents.scraper_agent.web_scraper import WebScraper
+from benchmarks.fixtures import SITES, URLS, make_page
+
+# extractor -> fixture page it runs on; site extractors go through the registry via _extract
+EXTRACTORS = {
+    "indiatoday": "indiatoday",
+    "livemint": "livemint",
+    "ndtv": "ndtv",
+    "_generic_webscrape": "generic",
+    "_old_generic_webscrape": "generic",
+}
+
+
+def load_pages(directory=None):
+    """site -> html bytes, from saved files when available."""
+    pages = {}
+    for site in SITES:
+        path = os.path.join(directory, f"{site}.html") if directory else None
+        if path and os.path.exists(path):
+            with open(path, "rb") as f:
+                pages[site] = f.read()
+        else:
+            pages[site] = make_page(site)
+    return pages
+
+
+def start_server(pages):
+    """Serve ``/<site>`` from memory on a free local port; returns (server, base_url)."""
+
+    class FixtureHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            body = pages.get(self.path.strip("/").split("?")[0])
+            if body is None:
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FixtureHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
+
+
+def _percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def scrape_once(scraper, extractor, fetch_url, source_url):
+    """Fetch a fixture and run one extractor on it; returns (latency ms, paragraphs)."""
+    start = time.perf_counter()
+    response = scraper._fetch(fetch_url)
+    extract = scraper._extract if extractor in SITES else getattr(scraper, extractor)
+    result = extract(source_url, response.content)
+    return (time.perf_counter() - start) * 1000, len(result.content)
+
+
+def bench_extractor(scraper, extractor, fetch_url, source_url, pages, concurrency):
+    # Memory on a single page, traced separately so tracing doesn't skew timings
+    tracemalloc.start()
+    _, paragraphs = scrape_once(scraper, extractor, fetch_url, source_url)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        runs = list(executor.map(
+            lambda _: scrape_once(scraper, extractor, fetch_url, source_url), range(pages)
+        ))
+    elapsed = time.perf_counter() - start
+
+    latencies = [ms for ms, _ in runs]
+    return {
+        "pages_per_sec": pages / elapsed,
+        "p50_ms": statistics.median(latencies),
+        "p95_ms": _percentile(latencies, 95),
+        "peak_mb": peak / (1024 * 1024),
+        "paragraphs": paragraphs,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Offline WebScraper throughput benchmark")
+    parser.add_argument("--pages", type=int, default=50, help="pages scraped per extractor")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--fixtures", help="directory of saved <site>.html pages")
+    parser.add_argument("--delay", type=float, default=0.0,
+                        help="per-domain politeness delay (SCRAPING_DELAY would throttle the local server)")
+    args = parser.parse_args()
+
+    # Every fixture is served from one host, so measure the scraper rather than the politeness spacing
+    politeness._scheduler = politeness.DomainScheduler(
+        delay=args.delay, max_per_domain=args.concurrency, use_redis=False
+    )
+
+    pages = load_pages(args.fixtures)
+    server, base_url = start_server(pages)
+    scraper = WebScraper(cache=None)
+
+    print(f"{'extractor':<24}{'pages/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'peak MB':>9}{'paras':>7}")
+    try:
+        for extractor, site in EXTRACTORS.items():
+            stats = bench_extractor(
+                scraper, extractor, f"{base_url}/{site}", URLS[site], args.pages, args.concurrency
+            )
+            print(
+                f"{extractor:<24}{stats['pages_per_sec']:>9.1f}{stats['p50_ms']:>9.1f}"
+                f"{stats['p95_ms']:>9.1f}{stats['peak_mb']:>9.1f}{stats['paragraphs']:>7}"
+            )
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
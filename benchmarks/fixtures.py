@@ -0,0 +1,173 @@
+"""
+Synthetic news pages for the scraper benchmarks.
+
+Each page mirrors the markup the site scrapers walk (same ids and class names)
+and pads it the way the real pages are padded: a large inline ``__NEXT_DATA__``
+style script, header navigation, sidebars full of teaser cards and a footer.
+Pages are generated deterministically, so timings are comparable between runs
+without committing megabytes of HTML or hitting the network.
+"""
+
+import json
+import random
+
+SITES = ("indiatoday", "livemint", "ndtv", "generic")
+
+URLS = {
+    "indiatoday": "https://www.indiatoday.in/india/story/fixture-story-2701234-2025-05-20",
+    "livemint": "https://www.livemint.com/news/india/fixture-story-11747721444594.html",
+    "ndtv": "https://www.ndtv.com/india-news/fixture-story-9201234",
+    "generic": "https://news.example.com/2025/09/02/fixture-story",
+}
+
+_WORDS = (
+    "government minister said state election court report police district council "
+    "official statement week budget project water health school farmers rain city "
+    "announced according data percent crore lakh hospital airport railway policy"
+).split()
+
+
+def _sentence(rng: random.Random, words: int = 18) -> str:
+    text = " ".join(rng.choice(_WORDS) for _ in range(words))
+    return text[0].upper() + text[1:] + "."
+
+
+def _paragraph(rng: random.Random) -> str:
+    return " ".join(_sentence(rng) for _ in range(rng.randint(3, 5)))
+
+
+def _head(rng: random.Random, title: str, script_kb: int) -> str:
+    meta = "".join(
+        f'<meta property="og:tag{i}" content="{_sentence(rng, 6)}"/>'
+        f'<link rel="preload" href="/static/chunks/{i}.js" as="script"/>'
+        for i in range(40)
+    )
+    blob = {"props": {"pageProps": {"items": [_sentence(rng, 12) for _ in range(script_kb * 8)]}}}
+    return (
+        f"<head><meta charset=\"utf-8\"/><title>{title}</title>{meta}"
+        "<style>" + ".c{margin:0;padding:0}" * 300 + "</style>"
+        f'<script id="__NEXT_DATA__" type="application/json">{json.dumps(blob)}</script>'
+        "</head>"
+    )
+
+
+def _nav(rng: random.Random, links: int = 150) -> str:
+    items = "".join(
+        f'<li class="nav__item"><a href="/section/{i}" title="{_sentence(rng, 3)}">{rng.choice(_WORDS)}</a></li>'
+        for i in range(links)
+    )
+    return f'<header class="site-header"><nav class="menu"><ul>{items}</ul></nav></header>'
+
+
+def _teasers(rng: random.Random, count: int) -> str:
+    return "".join(
+        f'<div class="card"><a href="/story/{i}"><img src="/img/{i}.jpg" alt=""/>'
+        f"<h3>{_sentence(rng, 9)}</h3></a><p>{_sentence(rng, 14)}</p>"
+        f'<div id="ad-slot-{i}" class="adsbygoogle"><script>window.ads.push({i})</script></div></div>'
+        for i in range(count)
+    )
+
+
+def _footer(rng: random.Random) -> str:
+    links = "".join(f'<a href="/f/{i}">{_sentence(rng, 2)}</a>' for i in range(120))
+    return f'<footer class="site-footer">{links}<script>window.analytics && analytics()</script></footer>'
+
+
+def _indiatoday(rng: random.Random, title: str, summary: str, paras: list) -> str:
+    body = "".join(f"<p>{p}</p>" for p in paras)
+    article = (
+        '<div class="lhs__section">'
+        f"<h1>{title}</h1>"
+        f'<div class="Story_w__100__e1YfC"><div class="wapper__kicker"><h2>{summary}</h2></div></div>'
+        '<div class="widgetgap">'
+        '<div class="Story_story__byline__7MVK3"><div class="Story_profile__details__wyZj7">'
+        '<div class="Story_stryupdates__wdMz_"><span class="strydate">UPDATED: May 20, 2025 16:22 IST</span></div>'
+        "</div></div>"
+        f'<div class="story-with-main-sec"><div class="description">{body}</div></div>'
+        "</div></div>"
+    )
+    return (
+        '<div id="__next"><div id="main">' + _nav(rng) +
+        '<div class="temp__container"><div class="temp__layout"><div class="content__section">'
+        f'<main>{article}<aside class="rhs__section">{_teasers(rng, 60)}</aside></main>'
+        "</div></div></div>" + _footer(rng) + "</div></div>"
+    )
+
+
+def _livemint(rng: random.Random, title: str, summary: str, paras: list) -> str:
+    body = "".join(f'<div class="storyParagraph"><p>{p}</p></div>' for p in paras)
+    article = (
+        '<div class="storyPage_storyBox__9iWpG">'
+        f'<h1 id="article-0">{title}</h1>'
+        f'<h2 class="storyPage_summary__K7jOt">{summary}</h2>'
+        '<div class="storyPage_authorSocial__z7nHm"><div class="storyPage_authorInfo__Dj3b4">'
+        '<div class="storyPage_authorDesc__cKKWd"><div class="storyPage_date__iM8Kb">'
+        "<span>27 Aug 2025, 12:09 AM IST</span></div></div></div></div>"
+        f'<div class="storyPage_storyContent__3xuFc">{body}</div>'
+        "</div>"
+    )
+    return (
+        '<div id="__next">' + _nav(rng) +
+        f'<div class="containerNew clearfix"><div class="leftSec">{_teasers(rng, 30)}</div>'
+        f'<div class="midSec">{article}</div><div class="rightSec">{_teasers(rng, 40)}</div></div>'
+        + _footer(rng) + "</div>"
+    )
+
+
+def _ndtv(rng: random.Random, title: str, summary: str, paras: list) -> str:
+    body = "".join(f"<p>{p}</p>" for p in paras)
+    article = (
+        '<div class="vjl-Mid-1"><div class="vjl-row"><div class="vjl-Mid-2"><div class="stp-wr">'
+        f'<div class="sp-hd"><h1 class="sp-ttl">{title}</h1><h2 class="sp-descp">{summary}</h2>'
+        '<nav class="pst-by"><ul class="pst-by_ul"><li>India News</li><li><span>Written by Staff</span></li>'
+        "<li><span>Sep 02, 2025 16:11 pm IST</span></li></ul></nav></div>"
+        f'<div class="sp-cn"><div class="sp_txt"><div class="Art-exp_cn"><div class="Art-exp_wr">{body}'
+        "</div></div></div></div></div></div></div></div>"
+    )
+    return (
+        _nav(rng) +
+        '<div class="vjl-cnt"><div class="vjl-cntr"><div class="vjl-row">'
+        f'{article}<div class="vjl-Mid-3">{_teasers(rng, 70)}</div>'
+        "</div></div></div>" + _footer(rng)
+    )
+
+
+def _generic(rng: random.Random, title: str, summary: str, paras: list) -> str:
+    body = "".join(f"<p>{p}</p>" for p in paras)
+    return (
+        _nav(rng) +
+        f'<div class="layout"><article><h1>{title}</h1><p class="lede">{summary}</p>'
+        '<time datetime="2025-09-02T16:11:00+05:30">Sep 2, 2025</time>'
+        f'{body}</article><aside>{_teasers(rng, 50)}</aside></div>' + _footer(rng)
+    )
+
+
+_BUILDERS = {
+    "indiatoday": _indiatoday,
+    "livemint": _livemint,
+    "ndtv": _ndtv,
+    "generic": _generic,
+}
+
+
+def make_page(site: str, paragraphs: int = 30, script_kb: int = 120, seed: int = 0) -> bytes:
+    """Build a synthetic article page for ``site``.
+
+    Args:
+        site: One of ``SITES``
+        paragraphs: Number of article paragraphs
+        script_kb: Rough size of the inline JSON script in KB
+        seed: Seed for the filler text
+
+    Returns:
+        UTF-8 encoded HTML, as the scraper receives it from the network
+    """
+    rng = random.Random(f"{site}-{seed}")
+    title = _sentence(rng, 10)
+    summary = _sentence(rng, 24)
+    paras = [_paragraph(rng) for _ in range(paragraphs)]
+    html = (
+        "<!DOCTYPE html><html lang=\"en\">" + _head(rng, title, script_kb) +
+        "<body>" + _BUILDERS[site](rng, title, summary, paras) + "</body></html>"
+    )
+    return html.encode("utf-8")
@@ -0,0 +1,15 @@
+-- Applies buffered like/dislike deltas from the write-behind counter flusher
+-- (app/services/counter_service.py) in a single statement.
+--
+-- deltas: [{"pid": "...", "likes": 3, "dislikes": -1}, ...]
+create or replace function public.apply_post_counter_deltas(deltas jsonb)
+returns void
+language sql
+as $$
+    update public.posts as p
+       set likes    = coalesce(p.likes, 0) + coalesce((d ->> 'likes')::integer, 0),
+           dislikes = coalesce(p.dislikes, 0) + coalesce((d ->> 'dislikes')::integer, 0)
+      from jsonb_array_elements(deltas) as d
+     -- Cast the JSON value rather than the column so the lookup uses the primary key index
+     where p.pid = (d ->> 'pid')::uuid;
+$$;
@@ -0,0 +1,9 @@
+-- One reaction per user and post, written by the reaction flusher
+-- (app/services/reaction_service.py).
+create table if not exists public.post_reactions (
+    user_id    uuid        not null,
+    post_id    uuid        not null references public.posts (pid) on delete cascade,
+    kind       text        not null check (kind in ('like', 'dislike')),
+    created_at timestamptz not null default now(),
+    primary key (user_id, post_id)
+);
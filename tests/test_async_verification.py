@@ -0,0 +1,96 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+from app.agents.rag_agent import rag_agent
+from app.agents.rag_agent.backends import LocalBackend
+from app.agents.scraper_agent import politeness, web_scraper as web_scraper_module
+from app.agents.scraper_agent.web_scraper import WebScraper
+from app.models.post import PostContentRequest
+from app.models.rag import RagRequest
+from app.models.scraper import ScraperResult
+from app.services import verification_service
+from benchmarks.fixtures import make_page
+
+
+@pytest.fixture
+def fake_site(monkeypatch):
+    page = make_page("generic", paragraphs=5, script_kb=1)
+
+    def handler(request):
+        if request.url.path == "/pdf":
+            return httpx.Response(200, headers={"Content-Type": "application/pdf"}, content=b"%PDF" * 1000)
+        return httpx.Response(200, headers={"Content-Type": "text/html; charset=utf-8"}, content=page)
+
+    monkeypatch.setattr(politeness, "_scheduler", politeness.DomainScheduler(delay=0, max_per_domain=2, use_redis=False))
+    monkeypatch.setattr(
+        web_scraper_module, "get_async_http_client",
+        lambda: httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+    )
+    return page
+
+
+def test_awebscrape_matches_sync_extraction_and_caps_bytes(fake_site):
+    scraper = WebScraper(cache=None, max_bytes=4096)
+    url = "https://news.example.com/story"
+
+    async def scrape():
+        page = await scraper._afetch(url)
+        result = await scraper.awebscrape(url)
+        with pytest.raises(ValueError):
+            await scraper._afetch("https://news.example.com/pdf")
+        return page, result
+
+    page, result = asyncio.run(scrape())
+    expected = scraper._extract(url, fake_site[:4096])
+
+    assert page.truncated and len(page.content) == 4096
+    # The generic extractor stamps undated articles with the current time
+    assert (result.title, result.content) == (expected.title, expected.content)
+
+
+def test_aget_context_scrapes_concurrently_in_ranking_order(monkeypatch):
+    async def fake_links(post_data):
+        return [f"https://site{i}.example/" for i in range(4)]
+
+    async def fake_scrape(url):
+        # Later ranked links finish first
+        await asyncio.sleep(0.2 - 0.05 * int(url[12]))
+        return ScraperResult(source=url, title="t", content=["paragraph"])
+
+    monkeypatch.setattr(verification_service, "aget_links", fake_links)
+    monkeypatch.setattr(verification_service, "get_web_scraper", lambda: SimpleNamespace(awebscrape=fake_scrape))
+    monkeypatch.setattr(verification_service.settings.scraping, "min_results", 4)
+    monkeypatch.setattr(verification_service.settings.scraping, "max_concurrent", 4)
+    events = []
+
+    start = time.perf_counter()
+    results = asyncio.run(verification_service.aget_context(PostContentRequest(pid="p", content="c"), events.append))
+
+    assert time.perf_counter() - start < 0.4
+    assert [r.source for r in results] == [f"https://site{i}.example/" for i in range(4)]
+    assert [e.stage for e in events] == ["search_done"] + ["scrape_done"] * 4
+
+
+def test_averify_matches_verify_and_overlaps_llm_calls(monkeypatch):
+    monkeypatch.setattr(rag_agent, "get_backend", lambda name=None: LocalBackend(latency=0.2, embed_latency=0, jitter=0))
+    monkeypatch.setattr(rag_agent, "_get_embedding_cache", lambda: None)
+    pipeline = rag_agent.VerificationRAGPipeline(retrieval_mode="ephemeral", generation_mode="single")
+    pipeline._use_knowledge_base = False
+    pipeline._llm_cache = None
+    requests = [
+        RagRequest(post_id=str(i), post_content=f"Claim {i} about the metro line", context=["The metro line opened", "Rain"])
+        for i in range(10)
+    ]
+
+    async def verify_all():
+        return await asyncio.gather(*(pipeline.averify(request) for request in requests))
+
+    start = time.perf_counter()
+    results = asyncio.run(verify_all())
+
+    assert time.perf_counter() - start < 1.0
+    assert results[0] == pipeline.verify(requests[0])
@@ -0,0 +1,162 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+from pydantic import ValidationError
+
+from app.agents.rag_agent import claim_index as claim_index_module
+from app.agents.rag_agent import rag_agent
+from app.api.routers import auth
+from app.models.post import BatchVerificationRequest
+from app.services import batch_verification, verification_service
+
+
+class FakePostsQuery:
+    def __init__(self, rows, updates):
+        self.rows = rows
+        self.updates = updates
+        self.filters = {}
+        self.values = None
+        self.bounds = None
+
+    def select(self, columns):
+        return self
+
+    def update(self, values):
+        self.values = values
+        return self
+
+    def eq(self, column, value):
+        self.filters[column] = lambda v: v == value
+        return self
+
+    def in_(self, column, values):
+        self.filters[column] = lambda v: v in values
+        return self
+
+    def order(self, column):
+        return self
+
+    def range(self, start, end):
+        self.bounds = (start, end)
+        return self
+
+    def execute(self):
+        rows = [r for r in sorted(self.rows, key=lambda r: r["pid"])
+                if all(match(r.get(col)) for col, match in self.filters.items())]
+        if self.values is not None:
+            self.updates.append((self.values["verification_status"], sorted(r["pid"] for r in rows)))
+            for row in rows:
+                row.update(self.values)
+            return SimpleNamespace(data=rows)
+        if self.bounds:
+            rows = rows[self.bounds[0]:self.bounds[1] + 1]
+        return SimpleNamespace(data=[{"pid": r["pid"], "content": r["content"]} for r in rows])
+
+
+class FakeSupabase:
+    def __init__(self, rows):
+        self.rows = rows
+        self.updates = []
+
+    def table(self, name):
+        assert name == "posts"
+        return FakePostsQuery(self.rows, self.updates)
+
+
+def _install(monkeypatch, rows):
+    fake = FakeSupabase(rows)
+    monkeypatch.setattr(batch_verification, "get_supabase_client", lambda: fake)
+    monkeypatch.setattr(verification_service, "get_claim_index", lambda: None)
+    monkeypatch.setattr(rag_agent, "_get_embedding_cache", lambda: None)
+    return fake
+
+
+def test_select_posts_by_status_pages_through_results(monkeypatch):
+    rows = [{"pid": f"p{i:02d}", "content": f"claim {i}", "verification_status": "unverified" if i % 2 else "verified"}
+            for i in range(20)]
+    _install(monkeypatch, rows)
+    monkeypatch.setattr(batch_verification, "SELECT_PAGE_SIZE", 3)
+
+    posts = batch_verification.select_posts(status="unverified", limit=7)
+
+    assert [p["pid"] for p in posts] == ["p01", "p03", "p05", "p07", "p09", "p11", "p13"]
+
+
+def test_batch_verifies_each_distinct_claim_once_and_writes_in_bulk(monkeypatch):
+    rows = [
+        {"pid": "a", "content": "Delhi is the capital of India"},
+        {"pid": "b", "content": "  delhi is the CAPITAL of india"},
+        {"pid": "c", "content": "The moon is made of cheese"},
+        {"pid": "d", "content": "It rained in Mumbai"},
+    ]
+    fake = _install(monkeypatch, rows)
+    monkeypatch.setattr(batch_verification.settings.queue, "batch_write_size", 100)
+    verdicts = {"Delhi": "verified", "The moon": "misinformation"}
+    verified = []
+
+    async def fake_averify_content(post, progress=None, reuse=True):
+        assert reuse is False
+        verified.append(post.pid)
+        await asyncio.sleep(0)
+        if post.content.startswith("It rained"):
+            raise RuntimeError("search failed")
+        status = next(v for prefix, v in verdicts.items() if post.content.startswith(prefix))
+        return {"status": status, "confidence": 0.9, "metadata": {"post_id": post.pid}}
+
+    monkeypatch.setattr(verification_service, "averify_content", fake_averify_content)
+    reports = []
+
+    summary = asyncio.run(batch_verification.averify_batch(rows, concurrency=2, progress=reports.append))
+
+    assert sorted(verified) == ["a", "c", "d"]
+    assert sorted(fake.updates) == [("misinformation", ["c"]), ("unverified", ["d"]), ("verified", ["a", "b"])]
+    assert summary["total"] == 4 and summary["unique"] == 3 and summary["done"] == 4
+    assert summary["errors"] == 1 and summary["writes"] == 3
+    assert summary["statuses"] == {"verified": 2, "misinformation": 1, "unverified": 1}
+    assert [r["done"] for r in reports][-1] == 4
+
+
+def test_batch_reverifies_already_indexed_posts_instead_of_reusing_their_verdict(tmp_path, monkeypatch):
+    rows = [{"pid": "a", "content": "Delhi is the capital of India"}]
+    fake = _install(monkeypatch, rows)
+    monkeypatch.setattr(claim_index_module.settings.vectordb, "chroma_persist_path", str(tmp_path / "chroma"))
+    monkeypatch.setattr(claim_index_module, "_embed_texts", lambda texts: [[1.0, 0.0] for _ in texts])
+    index = claim_index_module.ClaimIndex(collection_name="test_claims", threshold=0.9, max_age=3600)
+    monkeypatch.setattr(verification_service, "get_claim_index", lambda: index)
+    # Verified before the model change
+    index.add("a", rows[0]["content"], {"status": "verified", "confidence": 0.9, "answer": "", "rationale": ""})
+
+    async def no_sources(post_data, progress=None):
+        return []
+
+    class NewModel:
+        async def averify(self, request, top_k=4, progress=None):
+            return {"status": "misinformation", "confidence": 0.8, "answer": "No", "rationale": "new model",
+                    "metadata": {"post_id": request.post_id}}
+
+    monkeypatch.setattr(verification_service, "aget_context", no_sources)
+    monkeypatch.setattr(verification_service, "get_pipeline", lambda: NewModel())
+
+    summary = asyncio.run(batch_verification.averify_batch(rows, concurrency=1))
+
+    assert summary["statuses"] == {"misinformation": 1}
+    assert fake.updates == [("misinformation", ["a"])]
+    assert index.lookup("Delhi is the capital of India").status == "misinformation"
+
+
+def test_batch_request_bounds_and_operator_key(monkeypatch):
+    cap = batch_verification.settings.queue.batch_concurrency
+    assert BatchVerificationRequest(status="pending", concurrency=cap).concurrency == cap
+    for bad in ({"concurrency": 0}, {"concurrency": cap + 1}, {"limit": 0}, {"status": "verified') or ('1"}):
+        with pytest.raises(ValidationError):
+            BatchVerificationRequest(**bad)
+
+    monkeypatch.setattr(batch_verification.settings.queue, "batch_api_key", "")
+    with pytest.raises(HTTPException):
+        auth.require_operator("anything")
+    monkeypatch.setattr(batch_verification.settings.queue, "batch_api_key", "s3cret")
+    with pytest.raises(HTTPException):
+        auth.require_operator("wrong")
+    assert auth.require_operator("s3cret")
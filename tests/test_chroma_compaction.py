@@ -0,0 +1,47 @@
+import chromadb
+import pytest
+
+from app.agents.rag_agent import rag_agent
+from app.agents.rag_agent.backends import LocalBackend
+from app.agents.rag_agent.compaction import compact_collection
+from app.models.rag import RagRequest
+
+
+@pytest.fixture
+def chroma_path(tmp_path, monkeypatch):
+    path = str(tmp_path / "chroma")
+    monkeypatch.setattr(rag_agent.settings.vectordb, "chroma_persist_path", path)
+    return path
+
+
+def test_compaction_drops_expired_then_oldest_entries(chroma_path):
+    collection = chromadb.PersistentClient(path=chroma_path).get_or_create_collection("test_docs")
+    stamps = {"legacy": None, "old": 100, "a": 900, "b": 950, "c": 980, "d": 990}
+    collection.add(
+        ids=list(stamps),
+        documents=list(stamps),
+        embeddings=[[1.0, float(i)] for i in range(len(stamps))],
+        metadatas=[{"ingested_at": t} if t else None for t in stamps.values()],
+    )
+
+    summary = compact_collection(collection, ttl=500, max_documents=3, now=1000)
+
+    assert summary == {"collection": "test_docs", "before": 6, "expired": 1, "evicted": 2, "remaining": 3}
+    assert sorted(collection.get()["ids"]) == ["b", "c", "d"]
+
+
+def test_chroma_mode_tags_passages_and_replaces_them_on_reverification(chroma_path):
+    pipeline = rag_agent.VerificationRAGPipeline(retrieval_mode="chroma", generation_mode="single")
+    pipeline._llm_cache = None
+    pipeline._backend = LocalBackend(latency=0)
+
+    def verify(context, sources):
+        pipeline.verify(RagRequest(post_id="p1", post_content="The metro line opened", context=context, sources=sources))
+        return pipeline._get_collection().get(include=["documents", "metadatas"])
+
+    verify(["The metro line opened today", "Rain in Mumbai"], ["https://a.example/1", "https://b.example/2"])
+    stored = verify(["The metro line opened on Monday"], ["https://c.example/3"])
+
+    assert stored["documents"] == ["The metro line opened on Monday"]
+    meta = stored["metadatas"][0]
+    assert meta["post_id"] == "p1" and meta["source_url"] == "https://c.example/3" and meta["ingested_at"] > 0
@@ -0,0 +1,58 @@
+import pytest
+
+from app.agents.rag_agent import claim_index as claim_index_module
+from app.agents.rag_agent.claim_index import ClaimIndex
+
+VECTORS = {
+    "Delhi is the capital of India": [1.0, 0.0, 0.0],
+    "India's capital is Delhi": [0.99, 0.05, 0.0],
+    "Mumbai has the most rain": [0.0, 1.0, 0.0],
+    "The moon is made of cheese": [0.0, 0.0, 1.0],
+}
+
+
+@pytest.fixture
+def index(tmp_path, monkeypatch):
+    monkeypatch.setattr(claim_index_module.settings.vectordb, "chroma_persist_path", str(tmp_path / "chroma"))
+    monkeypatch.setattr(claim_index_module, "_embed_texts", lambda texts: [VECTORS[t] for t in texts])
+    return ClaimIndex(collection_name="test_claims", threshold=0.95, max_age=3600)
+
+
+def _response(status, confidence=0.9):
+    return {"status": status, "confidence": confidence, "answer": "a", "rationale": "r", "metadata": {"post_id": "p"}}
+
+
+def test_near_duplicate_claim_reuses_verdict_with_provenance(index):
+    assert index.lookup("India's capital is Delhi") is None
+    assert index.add("p1", "Delhi is the capital of India", _response("verified"))
+
+    match = index.lookup("India's capital is Delhi")
+
+    assert match.post_id == "p1" and match.status == "verified" and match.similarity > 0.95
+    reused = match.to_response("p2")
+    assert reused["metadata"]["post_id"] == "p2"
+    assert reused["metadata"]["reused_from"]["claim"] == "Delhi is the capital of India"
+    assert index.lookup("Mumbai has the most rain") is None
+
+
+def test_unverified_and_reused_verdicts_are_not_indexed(index):
+    assert not index.add("p1", "Mumbai has the most rain", _response("unverified"))
+    reused = _response("misinformation")
+    reused["metadata"]["reused_from"] = {"post_id": "p0"}
+    assert not index.add("p2", "The moon is made of cheese", reused)
+    assert index.lookup("The moon is made of cheese") is None
+
+
+def test_post_never_reuses_its_own_verdict(index):
+    index.add("p1", "Delhi is the capital of India", _response("verified"))
+
+    assert index.lookup("Delhi is the capital of India", exclude_post_id="p1") is None
+    assert index.lookup("India's capital is Delhi", exclude_post_id="p2").post_id == "p1"
+
+
+def test_removed_claim_is_no_longer_reused(index):
+    index.add("p1", "Delhi is the capital of India", _response("verified"))
+
+    index.remove("p1")
+
+    assert index.lookup("India's capital is Delhi") is None
@@ -0,0 +1,59 @@
+from app.models.scraper import ScraperResult
+from app.services.context_packer import chunk_results, estimate_tokens, pack_context
+
+
+def make_result(source, title, paragraphs, summary=None):
+    return ScraperResult(source=source, title=title, article_summary=summary, content=paragraphs)
+
+
+def test_chunk_results_drops_fragments_and_splits_long_paragraphs():
+    long_paragraph = " ".join(f"Sentence number {i} about the budget vote." for i in range(40))
+    result = make_result("https://a.example/1", "Budget passed", ["Advertisement", long_paragraph])
+
+    chunks = chunk_results([result], max_chars=200)
+
+    assert all(len(chunk.text) <= 200 for chunk in chunks)
+    assert all("Advertisement" not in chunk.text for chunk in chunks)
+    assert " ".join(chunk.text for chunk in chunks) == long_paragraph
+
+
+def test_pack_context_ranks_relevant_chunks_first():
+    claim = "The city council approved the new metro line in Pune"
+    results = [
+        make_result("https://a.example/sports", "Cricket roundup", [
+            "The home side won the third test match by six wickets on Sunday evening.",
+        ]),
+        make_result("https://b.example/metro", "Metro news", [
+            "Weather in the region stayed dry through the week with mild temperatures.",
+            "Pune city council approved the new metro line after a long debate on Tuesday.",
+        ]),
+    ]
+
+    packed = pack_context(claim, results, token_budget=1000, dedupe_threshold=0.8)
+
+    assert packed[0].startswith("Pune city council approved the new metro line")
+    assert packed[0].endswith("Source: Metro news (https://b.example/metro)")
+
+
+def test_pack_context_drops_near_duplicate_chunks():
+    paragraph = "The finance ministry said on Monday that fuel prices would remain unchanged until March."
+    results = [
+        make_result("https://a.example/1", "Fuel prices", [paragraph]),
+        make_result("https://b.example/2", "Fuel prices unchanged", ["Reported by wire. " + paragraph]),
+    ]
+
+    packed = pack_context("fuel prices unchanged until March", results, token_budget=1000, dedupe_threshold=0.8)
+
+    assert sum(paragraph in chunk for chunk in packed) == 1
+
+
+def test_pack_context_respects_token_budget():
+    results = [
+        make_result(f"https://s{i}.example/", f"Story {i}", [f"Paragraph {j} of story {i} about the election results." * 3 for j in range(10)])
+        for i in range(5)
+    ]
+
+    packed = pack_context("election results", results, token_budget=300, dedupe_threshold=1.0)
+
+    assert packed
+    assert sum(estimate_tokens(chunk) for chunk in packed) <= 300
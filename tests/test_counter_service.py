@@ -0,0 +1,151 @@
+from types import SimpleNamespace
+
+import fakeredis
+import pytest
+
+from app.services import counter_service
+
+PID = "0b9e3c2a-6f4d-4e8b-9a51-2f7c1d3e4a5b"
+OTHER = "5d1f0e7b-2c3a-4b9d-8e6f-1a2b3c4d5e6f"
+
+
+class FakePostsQuery:
+    def __init__(self, rows):
+        self.rows = rows
+        self.pid = None
+
+    def select(self, columns):
+        return self
+
+    def eq(self, column, value):
+        self.pid = value
+        return self
+
+    def single(self):
+        return self
+
+    def execute(self):
+        row = self.rows.get(self.pid)
+        return SimpleNamespace(data=dict(row) if row else None)
+
+
+class FakeRPC:
+    def __init__(self, supabase, params):
+        self.supabase = supabase
+        self.params = params
+
+    def execute(self):
+        self.supabase.calls += 1
+        if self.supabase.calls == self.supabase.fail_call:
+            raise RuntimeError("connection reset")
+        for delta in self.params["deltas"]:
+            row = self.supabase.rows[delta["pid"]]
+            row["likes"] += delta["likes"]
+            row["dislikes"] += delta["dislikes"]
+        self.supabase.batches.append(self.params["deltas"])
+
+
+class FakeSupabase:
+    def __init__(self, rows):
+        self.rows = rows
+        self.batches = []
+        self.calls = 0
+        self.fail_call = None
+
+    def table(self, name):
+        assert name == "posts"
+        return FakePostsQuery(self.rows)
+
+    def rpc(self, name, params):
+        assert name == "apply_post_counter_deltas"
+        return FakeRPC(self, params)
+
+
+@pytest.fixture
+def store(monkeypatch):
+    r = fakeredis.FakeRedis(decode_responses=True)
+    db = FakeSupabase({PID: {"likes": 5, "dislikes": 1}, OTHER: {"likes": 0, "dislikes": 0}})
+    monkeypatch.setattr(counter_service, "_redis", lambda: r)
+    monkeypatch.setattr(counter_service, "supabase", db)
+    return r, db
+
+
+def test_deltas_are_applied_live_and_flushed_once(store):
+    r, db = store
+
+    counter_service.increment(PID, "likes")
+    assert counter_service.apply(PID, {"likes": 1, "dislikes": -1}) == {"likes": 7, "dislikes": 0}
+
+    assert counter_service.flush() == 1
+    assert counter_service.flush() == 0
+    assert db.rows[PID] == {"likes": 7, "dislikes": 0}
+    assert db.batches == [[{"pid": PID, "likes": 2, "dislikes": -1}]]
+    assert counter_service.get_metrics()["pending_fields"] == 0
+
+
+def test_crashed_flush_is_retried_without_double_counting(store, monkeypatch):
+    r, db = store
+    monkeypatch.setattr(counter_service.settings.counters, "flush_batch_size", 1)
+    counter_service.increment(PID, "likes")
+    counter_service.increment(OTHER, "dislikes")
+    # The first batch is applied, the second fails
+    db.fail_call = 2
+
+    with pytest.raises(RuntimeError):
+        counter_service.flush()
+    # A reaction arriving before the retry goes to a new snapshot
+    counter_service.increment(OTHER, "likes")
+
+    assert counter_service.flush() == 2
+    assert db.rows == {PID: {"likes": 6, "dislikes": 1}, OTHER: {"likes": 1, "dislikes": 1}}
+    assert not list(r.scan_iter(match=f"{counter_service.FLUSHING_PREFIX}*"))
+    assert not r.exists(counter_service.SNAPSHOTS_KEY)
+
+
+def test_reseeding_an_expired_value_keeps_buffered_deltas(store, monkeypatch):
+    r, db = store
+    counter_service.increment(PID, "likes")
+    # A flush snapshot left behind by a crash, and the value key expiring meanwhile
+    crashed = f"{counter_service.FLUSHING_PREFIX}crashed"
+    r.rename(counter_service.PENDING_KEY, crashed)
+    r.sadd(counter_service.SNAPSHOTS_KEY, crashed)
+    counter_service.increment(PID, "likes")
+    r.delete(counter_service.VALUE_KEY.format(pid=PID))
+    # Snapshots are found through their set, never by scanning the keyspace
+    monkeypatch.setattr(r, "scan_iter", None)
+
+    assert counter_service.increment(PID, "likes") == 8
+
+    counter_service.flush()
+    assert db.rows[PID]["likes"] == 8
+    r.delete(counter_service.VALUE_KEY.format(pid=PID))
+    assert counter_service.increment(PID, "dislikes") == 2
+    assert counter_service.increment(PID, "likes", 0) == 8
+
+
+def test_seeding_behind_a_long_flush_is_refused(store, monkeypatch):
+    r, db = store
+    monkeypatch.setattr(counter_service, "SEED_LOCK_WAIT", 0.05)
+    flush_lock = counter_service._flush_lock(r, blocking=False)
+    assert flush_lock.acquire()
+
+    with pytest.raises(counter_service.CounterBusy):
+        counter_service.increment(PID, "likes")
+
+    assert not r.exists(counter_service.VALUE_KEY.format(pid=PID))
+    flush_lock.release()
+    assert counter_service.increment(PID, "likes") == 6
+
+
+def test_overlay_replaces_only_posts_with_live_counters(store):
+    counter_service.increment(PID, "likes")
+    posts = [{"pid": PID, "likes": 5, "dislikes": 1}, {"pid": OTHER, "likes": 3, "dislikes": 0}]
+
+    counter_service.overlay_live_counts(posts)
+
+    assert posts == [{"pid": PID, "likes": 6, "dislikes": 1}, {"pid": OTHER, "likes": 3, "dislikes": 0}]
+
+
+def test_unknown_post_is_not_seeded(store):
+    with pytest.raises(counter_service.PostNotFound):
+        counter_service.increment("missing", "likes")
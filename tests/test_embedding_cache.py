@@ -0,0 +1,59 @@
+from app.agents.rag_agent import backends, rag_agent
+from app.agents.rag_agent.embedding_cache import EmbeddingCache, text_hash
+from app.models.rag import RagRequest
+
+
+def test_cache_round_trip_and_lru_eviction(tmp_path):
+    cache = EmbeddingCache(path=str(tmp_path / "emb.sqlite3"), max_entries=2)
+    cache.put_many("m", [(text_hash("a"), [0.5, 1.0]), (text_hash("b"), [2.0])])
+
+    assert cache.get_many("m", [text_hash("a")]) == {text_hash("a"): [0.5, 1.0]}
+    assert cache.get_many("other-model", [text_hash("a")]) == {}
+
+    cache.put_many("m", [(text_hash("c"), [3.0])])
+    assert set(cache.get_many("m", [text_hash(t) for t in "abc"])) == {text_hash("a"), text_hash("c")}
+    assert len(cache) == 2
+
+
+def test_embed_texts_batches_and_skips_cached(tmp_path, monkeypatch):
+    cache = EmbeddingCache(path=str(tmp_path / "emb.sqlite3"), max_entries=100)
+    monkeypatch.setattr(rag_agent, "_embedding_cache", cache)
+    monkeypatch.setattr(rag_agent.settings.gemini, "embed_batch_size", 2)
+    calls = []
+
+    def fake_embed_content(model, content):
+        calls.append(list(content))
+        return {"embedding": [[float(len(text))] for text in content]}
+
+    monkeypatch.setattr(backends.genai, "embed_content", fake_embed_content)
+    monkeypatch.setattr(rag_agent, "get_backend", lambda: backends.GeminiBackend())
+
+    first = rag_agent._embed_texts(["one", "three", "", "one", "fifteen"])
+    assert first == [[3.0], [5.0], [], [3.0], [7.0]]
+    assert calls == [["one", "three"], ["fifteen"]]
+
+    calls.clear()
+    assert rag_agent._embed_texts(["fifteen", "four"]) == [[7.0], [4.0]]
+    assert calls == [["four"]]
+
+
+def test_pipeline_embeds_with_its_own_backend(tmp_path, monkeypatch):
+    cache = EmbeddingCache(path=str(tmp_path / "emb.sqlite3"), max_entries=100)
+    monkeypatch.setattr(rag_agent, "_embedding_cache", cache)
+    monkeypatch.setattr(rag_agent.settings.gemini, "backend", "gemini")
+
+    def no_gemini(model, content):
+        raise AssertionError("the Gemini embeddings API was called")
+
+    monkeypatch.setattr(backends.genai, "embed_content", no_gemini)
+    pipeline = rag_agent.VerificationRAGPipeline(backend="local", retrieval_mode="ephemeral", generation_mode="single")
+    pipeline._use_knowledge_base = False
+    pipeline._llm_cache = None
+
+    request = RagRequest(post_id="p1", post_content="The metro line opened", context=["The metro line opened today"])
+    result = pipeline.verify(request)
+
+    assert result["status"] == "verified"
+    local_model = pipeline._backend.embed_model
+    assert cache.get_many(local_model, [text_hash("The metro line opened")])
+    assert cache.get_many(backends.settings.gemini.embed_model, [text_hash("The metro line opened")]) == {}
@@ -0,0 +1,87 @@
+import base64
+import json
+
+import pytest
+
+from app.core.pagination import apply_keyset, decode_cursor, encode_cursor, split_page
+
+
+PID = "0b9e3c2a-6f4d-4e8b-9a51-2f7c1d3e4a5b"
+
+
+def _raw_cursor(created_at, pid):
+    raw = json.dumps([created_at, pid]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+class FakeQuery:
+    def __init__(self):
+        self.calls = []
+
+    def or_(self, filters):
+        self.calls.append(("or", filters))
+        return self
+
+    def order(self, column, desc=False):
+        self.calls.append(("order", column, desc))
+        return self
+
+    def limit(self, n):
+        self.calls.append(("limit", n))
+        return self
+
+
+def test_cursor_round_trip():
+    cursor = encode_cursor("2025-09-01T10:00:00.123456+00:00", PID)
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == ("2025-09-01T10:00:00.123456+00:00", PID)
+
+
+@pytest.mark.parametrize("cursor", ["not-a-cursor", "W10", "WyJ0IixudWxsXQ"])
+def test_decode_rejects_garbage(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+
+
+@pytest.mark.parametrize("created_at, pid", [
+    ('x",pid.neq."0', PID),
+    ("2025-09-01T10:00:00+00:00", 'x"),pid.neq.("0'),
+    ("2025-09-01T10:00:00+00:00", "a,b)"),
+    ("2025-09-01T10:00:00+00:00", 42),
+    (["2025-09-01"], PID),
+])
+def test_decode_rejects_values_that_could_rewrite_the_filter(created_at, pid):
+    with pytest.raises(ValueError):
+        decode_cursor(_raw_cursor(created_at, pid))
+
+
+def test_apply_keyset_without_cursor_orders_and_limits():
+    query = apply_keyset(FakeQuery(), None, 20)
+    assert query.calls == [
+        ("order", "created_at", True),
+        ("order", "pid", True),
+        ("limit", 21),
+    ]
+
+
+def test_apply_keyset_with_cursor_filters_after_sort_key():
+    cursor = encode_cursor("2025-09-01T10:00:00+00:00", PID.upper())
+    query = apply_keyset(FakeQuery(), cursor, 10)
+    kind, filters = query.calls[0]
+    assert kind == "or"
+    assert filters == (
+        'created_at.lt."2025-09-01T10:00:00+00:00",'
+        f'and(created_at.eq."2025-09-01T10:00:00+00:00",pid.lt."{PID}")'
+    )
+
+
+def test_split_page_emits_cursor_only_when_more_rows_exist():
+    rows = [{"pid": f"00000000-0000-4000-8000-00000000000{i}", "created_at": f"2025-09-0{i + 1}T10:00:00+00:00"}
+            for i in range(3)]
+
+    page, next_cursor = split_page(rows, 3)
+    assert page == rows and next_cursor is None
+
+    page, next_cursor = split_page(rows, 2)
+    assert page == rows[:2]
+    assert decode_cursor(next_cursor) == ("2025-09-02T10:00:00+00:00", "00000000-0000-4000-8000-000000000001")
@@ -0,0 +1,51 @@
+import threading
+import time
+
+from app.agents.scraper_agent.politeness import DomainScheduler, domain_of
+
+
+def test_domain_of_ignores_www_and_case():
+    assert domain_of("https://WWW.NDTV.com/india-news/x") == "ndtv.com"
+    assert domain_of("https://livemint.com/a") == "livemint.com"
+
+
+def test_requests_to_one_domain_are_spaced():
+    scheduler = DomainScheduler(delay=0.05, max_per_domain=4, use_redis=False)
+    starts = []
+
+    for _ in range(3):
+        with scheduler.slot("https://www.ndtv.com/story"):
+            starts.append(time.monotonic())
+    with scheduler.slot("https://www.livemint.com/story") as waited:
+        assert waited < 0.05
+
+    assert starts[1] - starts[0] >= 0.045 and starts[2] - starts[1] >= 0.045
+    stats = scheduler.stats()
+    assert stats["ndtv.com"]["requests"] == 3
+    assert stats["ndtv.com"]["total_wait_seconds"] >= 0.09
+    assert stats["livemint.com"]["requests"] == 1
+
+
+def test_concurrency_cap_queues_excess_requests():
+    scheduler = DomainScheduler(delay=0, max_per_domain=2, use_redis=False)
+    in_flight, peak = [0], [0]
+    lock = threading.Lock()
+
+    def fetch():
+        with scheduler.slot("https://www.indiatoday.in/story"):
+            with lock:
+                in_flight[0] += 1
+                peak[0] = max(peak[0], in_flight[0])
+            time.sleep(0.02)
+            with lock:
+                in_flight[0] -= 1
+
+    threads = [threading.Thread(target=fetch) for _ in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    stats = scheduler.stats()["indiatoday.in"]
+    assert peak[0] == 2
+    assert stats["requests"] == 6 and stats["waiting"] == 0 and stats["in_flight"] == 0
@@ -0,0 +1,99 @@
+from types import SimpleNamespace
+
+from app.core.cache import TTLCache
+from app.services import profile_service
+
+
+class FakeUsersQuery:
+    def __init__(self, rows, calls):
+        self.rows = rows
+        self.calls = calls
+        self.uids = []
+
+    def select(self, columns):
+        return self
+
+    def in_(self, column, values):
+        self.uids = list(values)
+        return self
+
+    def execute(self):
+        self.calls.append(self.uids)
+        return SimpleNamespace(data=[r for r in self.rows if r["uid"] in self.uids])
+
+
+class FakeSupabase:
+    def __init__(self, rows):
+        self.rows = rows
+        self.calls = []
+
+    def table(self, name):
+        assert name == "users"
+        return FakeUsersQuery(self.rows, self.calls)
+
+
+def _install(monkeypatch, rows, batch_size=100):
+    fake = FakeSupabase(rows)
+    monkeypatch.setattr(profile_service, "supabase", fake)
+    monkeypatch.setattr(profile_service, "_profile_cache", TTLCache(maxsize=100, ttl=60))
+    monkeypatch.setattr(profile_service.settings.cache, "profile_batch_size", batch_size)
+    return fake
+
+
+def test_hydrate_authors_uses_one_query_for_distinct_owners(monkeypatch):
+    rows = [
+        {"uid": "u1", "username": "alice", "full_name": "Alice", "profile_pic_url": "a.png"},
+        {"uid": "u2", "username": "bob", "full_name": "Bob", "profile_pic_url": ""},
+    ]
+    fake = _install(monkeypatch, rows)
+    posts = [{"owner_id": "u1"}, {"owner_id": "u2"}, {"owner_id": "u1"}, {"owner_id": "ghost"}]
+
+    profile_service.hydrate_authors(posts)
+
+    assert len(fake.calls) == 1
+    assert sorted(fake.calls[0]) == ["ghost", "u1", "u2"]
+    assert [p["author_name"] for p in posts] == ["alice", "bob", "alice", "Unknown"]
+    assert posts[0]["author_avatar"] == "a.png"
+    assert posts[3]["author_display_name"] is None
+
+
+def test_profiles_are_chunked_and_cached(monkeypatch):
+    rows = [{"uid": f"u{i}", "username": f"user{i}"} for i in range(5)]
+    fake = _install(monkeypatch, rows, batch_size=2)
+
+    profile_service.get_profiles([r["uid"] for r in rows])
+    assert [len(c) for c in fake.calls] == [2, 2, 1]
+
+    profile_service.get_profiles(["u0", "u1"])
+    assert len(fake.calls) == 3
+
+
+def test_invalidate_profile_forces_refetch(monkeypatch):
+    rows = [{"uid": "u1", "username": "alice"}]
+    fake = _install(monkeypatch, rows)
+
+    profile_service.get_profiles(["u1"])
+    rows[0] = {"uid": "u1", "username": "alice2"}
+    assert profile_service.get_profiles(["u1"])["u1"]["username"] == "alice"
+
+    profile_service.invalidate_profile("u1")
+    assert profile_service.get_profiles(["u1"])["u1"]["username"] == "alice2"
+    assert len(fake.calls) == 2
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert "a" in cache
+    assert "b" not in cache
+    assert cache.get("c") == 3
+
+
+def test_ttl_cache_expires_entries():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1, ttl=-1)
+    assert cache.get("a") is None
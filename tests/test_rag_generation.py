@@ -0,0 +1,106 @@
+import pytest
+
+from app.agents.rag_agent import rag_agent
+from app.agents.rag_agent.backends import LocalBackend
+from app.agents.rag_agent.llm_cache import LLMCache, SQLiteLLMCache, cache_key
+from app.models.rag import RagRequest
+
+
+class FakeLLM:
+    def __init__(self, *replies):
+        self.replies = list(replies)
+        self.prompts = []
+
+    model_name = "fake"
+
+    def generate(self, prompt, generation_config=None):
+        self.prompts.append(prompt)
+        return self.replies.pop(0)
+
+
+@pytest.fixture
+def fake_embeddings(monkeypatch):
+    monkeypatch.setattr(rag_agent, "_embed_texts", lambda texts, backend=None: [[1.0, float(len(t))] for t in texts])
+
+
+def _verify(mode, llm):
+    pipeline = rag_agent.VerificationRAGPipeline(retrieval_mode="ephemeral", generation_mode=mode)
+    pipeline._use_knowledge_base = False
+    pipeline._llm_cache = None
+    pipeline._backend = llm
+    request = RagRequest(post_id="p1", post_content="Delhi is the capital of India", context=["Delhi is the capital"])
+    return pipeline.verify(request)
+
+
+def test_single_call_mode_makes_one_generation(fake_embeddings):
+    llm = FakeLLM('```json\n{"answer": "Yes, it is.", "label": "verified", "confidence": 1.4, "rationale": "ctx"}\n```')
+
+    result = _verify("single", llm)
+
+    assert len(llm.prompts) == 1
+    assert result["answer"] == "Yes, it is."
+    assert result["status"] == "verified" and result["confidence"] == 1.0
+    assert result["metadata"]["generation_mode"] == "single"
+
+
+def test_two_call_mode_is_kept(fake_embeddings):
+    llm = FakeLLM("Yes, it is.", '{"label": "misinformation", "confidence": 0.2, "rationale": "r"}')
+
+    result = _verify("two_call", llm)
+
+    assert len(llm.prompts) == 2
+    assert "Answer: Yes, it is." in llm.prompts[1]
+    assert result["status"] == "misinformation" and result["confidence"] == 0.2
+
+
+def test_unparseable_reply_falls_back_to_defaults():
+    label, confidence, rationale = rag_agent._parse_classification(rag_agent._extract_json_block("no json"), "no json")
+    assert (label.value, confidence, rationale) == ("other", 0.5, "no json")
+
+
+def test_repeated_claim_is_served_from_llm_cache(fake_embeddings, tmp_path):
+    cache = LLMCache(SQLiteLLMCache(path=str(tmp_path / "llm.sqlite3"), ttl=60, max_entries=10))
+    reply = '{"answer": "Yes.", "label": "verified", "confidence": 0.9, "rationale": "r"}'
+    pipeline = rag_agent.VerificationRAGPipeline(retrieval_mode="ephemeral", generation_mode="single")
+    pipeline._use_knowledge_base = False
+    pipeline._llm_cache = cache
+    pipeline._backend = llm = FakeLLM(reply)
+
+    for claim in ("Delhi is the capital of India", "  delhi IS the capital\nof india "):
+        result = pipeline.verify(RagRequest(post_id="p1", post_content=claim, context=["Delhi is the capital"]))
+        assert result["status"] == "verified"
+
+    assert len(llm.prompts) == 1
+    assert cache.stats()["hits"] == 1
+
+
+def test_llm_cache_key_depends_on_context_and_config():
+    base = cache_key("answer", "Claim", ["a"], "m", {"temperature": 0.7})
+    assert base == cache_key("answer", " claim ", ["a"], "m", {"temperature": 0.7})
+    assert base != cache_key("answer", "Claim", ["b"], "m", {"temperature": 0.7})
+    assert base != cache_key("answer", "Claim", ["a"], "m", {"temperature": 0.2})
+    assert base != cache_key("classify", "Claim", ["a"], "m", {"temperature": 0.7})
+
+
+def test_local_backend_is_deterministic_and_offline(fake_embeddings):
+    pipeline = rag_agent.VerificationRAGPipeline(retrieval_mode="ephemeral", generation_mode="two_call", backend="local")
+    pipeline._use_knowledge_base = False
+    pipeline._llm_cache = None
+    request = RagRequest(post_id="p1", post_content="Delhi is the capital of India", context=["Delhi is the capital of India"])
+
+    first, second = pipeline.verify(request), pipeline.verify(request)
+
+    assert first == second
+    assert first["status"] == "verified" and first["confidence"] == 1.0
+
+
+def test_local_backend_embeddings_are_normalized_and_similar_for_shared_words():
+    backend = LocalBackend(embed_latency=0, dim=64)
+    same, related, other, blank = backend.embed(["metro line in Pune", "Pune metro line opened", "cricket scores", ""])
+
+    def cosine(a, b):
+        return sum(x * y for x, y in zip(a, b))
+
+    assert abs(cosine(same, same) - 1.0) < 1e-9
+    assert cosine(same, related) > cosine(same, other)
+    assert blank == []
@@ -0,0 +1,194 @@
+from types import SimpleNamespace
+
+import fakeredis
+import pytest
+
+from app.services import counter_service, reaction_service
+
+UID = "u1"
+A, B, C = "post-a", "post-b", "post-c"
+
+
+class FakePostsQuery:
+    def __init__(self, db):
+        self.db = db
+        self.pids = None
+        self.one = False
+
+    def select(self, columns):
+        return self
+
+    def eq(self, column, value):
+        self.pids = [value]
+        return self
+
+    def in_(self, column, values):
+        self.pids = list(values)
+        return self
+
+    def single(self):
+        self.one = True
+        return self
+
+    def execute(self):
+        rows = [{"pid": pid, **self.db.posts[pid]} for pid in self.pids if pid in self.db.posts]
+        if self.one:
+            return SimpleNamespace(data=rows[0] if rows else None)
+        return SimpleNamespace(data=rows)
+
+
+class FakeReactionsQuery:
+    def __init__(self, db):
+        self.db = db
+        self.filters = {}
+        self.upserts = None
+        self.deleting = False
+        self.window = None
+
+    def select(self, columns):
+        return self
+
+    def eq(self, column, value):
+        self.filters[column] = lambda v: v == value
+        return self
+
+    def in_(self, column, values):
+        self.filters[column] = lambda v: v in values
+        return self
+
+    def order(self, column):
+        return self
+
+    def range(self, start, end):
+        self.window = (start, end + 1)
+        return self
+
+    def upsert(self, rows, on_conflict=None):
+        self.upserts = rows
+        return self
+
+    def delete(self):
+        self.deleting = True
+        return self
+
+    def execute(self):
+        if self.upserts is not None:
+            if self.db.fail_next:
+                self.db.fail_next -= 1
+                raise RuntimeError("connection reset")
+            if any(row["post_id"] not in self.db.posts for row in self.upserts):
+                raise RuntimeError("violates foreign key constraint post_reactions_post_id_fkey")
+            for row in self.upserts:
+                self.db.reactions[(row["user_id"], row["post_id"])] = row["kind"]
+            return SimpleNamespace(data=self.upserts)
+
+        rows = [{"user_id": u, "post_id": p, "kind": k} for (u, p), k in self.db.reactions.items()]
+        rows = [row for row in rows if all(match(row[col]) for col, match in self.filters.items())]
+        if self.window:
+            rows = sorted(rows, key=lambda row: row["post_id"])
+            # PostgREST's max-rows cap applies on top of the requested range
+            rows = rows[self.window[0]:min(self.window[1], self.window[0] + self.db.max_rows)]
+        if self.deleting:
+            for row in rows:
+                del self.db.reactions[(row["user_id"], row["post_id"])]
+        return SimpleNamespace(data=rows)
+
+
+class FakeSupabase:
+    def __init__(self):
+        self.posts = {pid: {"likes": 0, "dislikes": 0} for pid in (A, B, C)}
+        self.reactions = {}
+        self.fail_next = 0
+        self.max_rows = 1000
+
+    def table(self, name):
+        return FakePostsQuery(self) if name == "posts" else FakeReactionsQuery(self)
+
+
+@pytest.fixture
+def db(monkeypatch):
+    r = fakeredis.FakeRedis(decode_responses=True)
+    fake = FakeSupabase()
+    for module in (counter_service, reaction_service):
+        monkeypatch.setattr(module, "_redis", lambda: r)
+        monkeypatch.setattr(module, "supabase", fake)
+    fake.redis = r
+    return fake
+
+
+def _expire_index(r):
+    r.delete(reaction_service.LOADED_KEY.format(uid=UID), *reaction_service._index_keys(UID))
+
+
+def test_like_and_unlike_are_idempotent(db):
+    assert reaction_service.react(UID, A, "like") == {"likes": 1, "dislikes": 0, "reaction": "like", "changed": True}
+    assert reaction_service.react(UID, A, "like")["changed"] is False
+    assert reaction_service.react(UID, A, "like")["likes"] == 1
+
+    assert reaction_service.react(UID, A, "none")["likes"] == 0
+    assert reaction_service.react(UID, A, "none")["changed"] is False
+    assert reaction_service.liked_post_ids(UID, [A]) == set()
+
+
+def test_dislike_replaces_like(db):
+    reaction_service.react(UID, A, "like")
+
+    result = reaction_service.react(UID, A, "dislike")
+
+    assert (result["likes"], result["dislikes"]) == (0, 1)
+    reaction_service.flush()
+    assert db.reactions == {(UID, A): "dislike"}
+
+
+def test_expired_index_is_rebuilt_from_table_flushing_and_pending(db):
+    r = db.redis
+    db.reactions[(UID, A)] = "like"
+    db.posts[A]["likes"] = 1
+    reaction_service.react(UID, B, "like")
+    # A flush crashed after taking its snapshot; a newer reaction is pending
+    r.rename(reaction_service.PENDING_KEY, reaction_service.FLUSHING_KEY)
+    reaction_service.react(UID, C, "like")
+    _expire_index(r)
+
+    assert reaction_service.liked_post_ids(UID, [A, B, C]) == {A, B, C}
+    assert reaction_service.react(UID, B, "like")["changed"] is False
+    assert reaction_service.react(UID, B, "like")["likes"] == 1
+
+
+def test_failed_flush_is_retried_and_deleted_posts_do_not_block_it(db):
+    reaction_service.react(UID, A, "like")
+    reaction_service.react(UID, B, "dislike")
+    db.fail_next = 1
+
+    with pytest.raises(RuntimeError):
+        reaction_service.flush()
+    # B is deleted before the retry (and before delete_post could clear it)
+    del db.posts[B]
+    reaction_service.react(UID, C, "like")
+
+    assert reaction_service.flush() == 2
+    assert reaction_service.flush() == 1
+    assert db.reactions == {(UID, A): "like", (UID, C): "like"}
+    assert not db.redis.exists(reaction_service.FLUSHING_KEY)
+
+
+def test_forget_drops_buffered_reactions_of_a_deleted_post(db):
+    reaction_service.react(UID, A, "like")
+    reaction_service.react("u2", A, "dislike")
+    reaction_service.react(UID, B, "like")
+
+    reaction_service.forget(A)
+
+    assert db.redis.hkeys(reaction_service.PENDING_KEY) == [f"{UID}:{B}"]
+
+
+def test_index_of_a_heavy_user_is_loaded_page_by_page(db, monkeypatch):
+    monkeypatch.setattr(reaction_service, "INDEX_PAGE_SIZE", 2)
+    db.max_rows = 2
+    for pid in (A, B, C):
+        db.reactions[(UID, pid)] = "like"
+        db.posts[pid]["likes"] = 1
+    db.reactions[("u2", A)] = "dislike"
+
+    assert reaction_service.liked_post_ids(UID, [A, B, C]) == {A, B, C}
+    assert reaction_service.react(UID, C, "like") == {"likes": 1, "dislikes": 0, "reaction": "like", "changed": False}
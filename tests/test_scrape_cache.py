@@ -0,0 +1,111 @@
+import sqlite3
+from types import SimpleNamespace
+
+from app.agents.scraper_agent.scrape_cache import ScrapeCache, normalize_url
+from app.agents.scraper_agent.web_scraper import WebScraper
+from app.models.scraper import ScraperResult
+
+
+def _result(url, title="Title"):
+    return ScraperResult(source=url, title=title, content=["para one", "para two"])
+
+
+def test_normalize_url_drops_tracking_and_noise():
+    assert normalize_url(
+        "HTTPS://News.Example.com:443/story/?utm_source=x&b=2&a=1&fbclid=abc#comments"
+    ) == "https://news.example.com/story?a=1&b=2"
+    assert normalize_url("http://example.com:8080/") == "http://example.com:8080/"
+
+
+def test_get_put_and_stats(tmp_path):
+    cache = ScrapeCache(path=str(tmp_path / "cache.sqlite3"), ttl=60, max_entries=10)
+    url = "https://example.com/a?utm_medium=social"
+
+    assert cache.get(url) is None
+    cache.put(url, _result(url), etag='"v1"')
+
+    entry = cache.get("https://example.com/a")
+    assert entry.fresh
+    assert entry.result.title == "Title"
+    assert entry.conditional_headers() == {"If-None-Match": '"v1"'}
+
+    stats = cache.stats()
+    assert stats["misses"] == 1 and stats["hits"] == 1 and stats["stores"] == 1
+    assert stats["hit_ratio"] == 0.5
+
+
+def test_stale_entries_and_revalidation(tmp_path):
+    cache = ScrapeCache(path=str(tmp_path / "cache.sqlite3"), ttl=0, max_entries=10)
+    url = "https://example.com/a"
+    cache.put(url, _result(url), last_modified="Wed, 01 Oct 2025 10:00:00 GMT")
+
+    entry = cache.get(url)
+    assert not entry.fresh and entry.revalidatable
+    cache.mark_revalidated(url)
+    assert cache.stats()["revalidated"] == 1
+
+
+def test_eviction_keeps_most_recently_used(tmp_path):
+    cache = ScrapeCache(path=str(tmp_path / "cache.sqlite3"), ttl=60, max_entries=2)
+    for name in ("a", "b"):
+        cache.put(f"https://example.com/{name}", _result(name))
+    cache.get("https://example.com/a")
+    cache.put("https://example.com/c", _result("c"))
+
+    assert cache.get("https://example.com/a") is not None
+    assert cache.get("https://example.com/b") is None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_webscraper_serves_304_from_cache(tmp_path, monkeypatch):
+    cache = ScrapeCache(path=str(tmp_path / "cache.sqlite3"), ttl=0, max_entries=10)
+    scraper = WebScraper(cache=cache)
+    url = "https://example.com/story"
+    cache.put(url, _result(url, "Cached"), etag='"v1"')
+
+    sent = {}
+
+    def fake_fetch(fetch_url, extra_headers=None):
+        sent.update(extra_headers or {})
+        return SimpleNamespace(status_code=304, headers={}, content=b"")
+
+    monkeypatch.setattr(scraper, "_fetch", fake_fetch)
+
+    assert scraper.webscrape(url).title == "Cached"
+    assert sent == {"If-None-Match": '"v1"'}
+    assert cache.stats()["revalidated"] == 1
+
+
+def test_lookups_do_not_wait_for_the_write_lock(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    cache = ScrapeCache(path=path, ttl=60, max_entries=10)
+    cache.put("https://example.com/a", _result("a"))
+    writer = sqlite3.connect(path)
+    writer.execute("BEGIN IMMEDIATE")
+
+    assert cache.get("https://example.com/a").fresh
+    assert cache.get("https://example.com/b") is None
+
+    writer.rollback()
+    stats = cache.stats()
+    assert stats["hits"] == 1 and stats["misses"] == 1
+
+
+def test_database_errors_count_as_misses_and_skipped_stores(tmp_path, monkeypatch):
+    cache = ScrapeCache(path=str(tmp_path / "cache.sqlite3"), ttl=60, max_entries=10)
+
+    class LockedConnection:
+        def execute(self, *args):
+            raise sqlite3.OperationalError("database is locked")
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+    monkeypatch.setattr(cache, "_conn", lambda: LockedConnection())
+
+    assert cache.get("https://example.com/a") is None
+    cache.put("https://example.com/a", _result("a"))
+    cache.mark_revalidated("https://example.com/a")
@@ -0,0 +1,27 @@
+from app.agents.rag_agent import rag_agent
+from app.agents.rag_agent.vector_index import VectorIndex
+
+
+def test_query_ranks_by_cosine_similarity():
+    index = VectorIndex()
+    added = index.add(["east", "north", "blank", "north-east"], [[1, 0], [0, 1], [], [1, 1]])
+
+    hits = index.query([2, 0.1], k=2)
+
+    assert added == 3 and len(index) == 3
+    assert [doc for doc, _ in hits] == ["east", "north-east"]
+    assert hits[0][1] > 0.99
+    assert VectorIndex().query([1, 0]) == []
+
+
+def test_ephemeral_retrieval_only_sees_its_own_passages(monkeypatch):
+    vectors = {"claim": [1, 0], "same topic": [0.9, 0.1], "other topic": [0, 1], "other post": [1, 0]}
+    monkeypatch.setattr(rag_agent, "_embed_texts", lambda texts, backend=None: [vectors[t] for t in texts])
+    pipeline = rag_agent.VerificationRAGPipeline(retrieval_mode="ephemeral")
+    pipeline._use_knowledge_base = False
+
+    first = pipeline._build_index(["same topic", "other topic"], summary=None)
+    pipeline._build_index(["other post"], summary=None)
+
+    assert pipeline._retrieve("claim", k=1, index=first) == ["same topic"]
+    assert pipeline._collection is None
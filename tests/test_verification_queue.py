@@ -0,0 +1,116 @@
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import fakeredis
+import pytest
+from rq import SimpleWorker
+from rq.job import JobStatus
+
+from app.services import verification_queue, verification_service
+
+
+class FakePostsQuery:
+    def __init__(self, updates):
+        self.updates = updates
+        self.values = None
+
+    def update(self, values):
+        self.values = values
+        return self
+
+    def eq(self, column, value):
+        self.updates.append((value, self.values["verification_status"]))
+        return self
+
+    def execute(self):
+        return SimpleNamespace(data=[])
+
+
+class FakeSupabase:
+    def __init__(self):
+        self.updates = []
+
+    def table(self, name):
+        assert name == "posts"
+        return FakePostsQuery(self.updates)
+
+
+@pytest.fixture
+def queue(monkeypatch):
+    r = fakeredis.FakeRedis()
+    monkeypatch.setattr(verification_queue, "get_redis_client", lambda decode_responses=True: r)
+    monkeypatch.setattr(verification_queue.settings.queue, "max_retries", 0)
+    supabase = FakeSupabase()
+    monkeypatch.setattr(verification_service, "get_supabase_client", lambda: supabase)
+    monkeypatch.setattr(verification_service, "get_claim_index", lambda: None)
+    return SimpleNamespace(redis=r, supabase=supabase)
+
+
+def _work(queue):
+    SimpleWorker([verification_queue.get_queue()], connection=queue.redis).work(burst=True)
+
+
+def test_enqueueing_a_live_post_reuses_its_job(queue):
+    first = verification_queue.enqueue_verification("p1", "claim")
+    second = verification_queue.enqueue_verification("p1", "claim")
+
+    assert first.id == second.id and first.id.startswith("verify-post-p1-")
+    assert verification_queue.get_queue().count == 1
+    assert verification_queue.get_verification_job_status("p1")["status"] == "queued"
+
+
+def test_concurrent_enqueues_queue_one_job(queue):
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        jobs = list(pool.map(lambda _: verification_queue.enqueue_verification("p1", "claim"), range(8)))
+
+    assert len({job.id for job in jobs}) == 1
+    assert verification_queue.get_queue().count == 1
+
+
+def test_edit_replaces_a_queued_job_with_the_new_content(queue):
+    old = verification_queue.enqueue_verification("p1", "claim")
+
+    new = verification_queue.enqueue_verification("p1", "edited claim")
+
+    assert new.id != old.id and new.args == ("p1", "edited claim")
+    assert verification_queue.get_queue().job_ids == [new.id]
+    assert verification_queue.fetch_job("p1").id == new.id
+
+
+def test_edit_during_a_running_job_waits_for_it(queue):
+    running = verification_queue.enqueue_verification("p1", "claim")
+    running.set_status(JobStatus.STARTED)
+
+    new = verification_queue.enqueue_verification("p1", "edited claim")
+
+    assert new.get_status() == JobStatus.DEFERRED
+    assert new.dependency_ids == [running.id]
+    assert verification_queue.get_verification_job_status("p1")["job_id"] == new.id
+
+
+def test_pipeline_error_fails_the_job_marks_post_unverified_and_allows_requeue(queue, monkeypatch):
+    def no_search(post_data, progress=None):
+        raise RuntimeError("search quota exceeded")
+
+    monkeypatch.setattr(verification_service, "get_context", no_search)
+    verification_queue.enqueue_verification("p1", "claim")
+
+    _work(queue)
+
+    status = verification_queue.get_verification_job_status("p1")
+    assert status["status"] == "failed"
+    assert "search quota exceeded" in status["error"]
+    assert queue.supabase.updates == [("p1", "unverified")]
+
+    job = verification_queue.enqueue_verification("p1", "claim")
+    assert job.get_status() == JobStatus.QUEUED
+
+
+def test_retry_policy_follows_settings(queue, monkeypatch):
+    monkeypatch.setattr(verification_queue.settings.queue, "max_retries", 2)
+    monkeypatch.setattr(verification_queue.settings.queue, "retry_intervals", [30, 120])
+
+    job = verification_queue.enqueue_verification("p1", "claim")
+
+    assert job.retries_left == 2
+    assert job.retry_intervals == [30, 120]
@@ -0,0 +1,85 @@
+import asyncio
+import json
+
+from app.models.post import PostContentRequest
+from app.models.rag import emit_event
+from app.services import verification_stream
+
+POST = PostContentRequest(pid="p1", content="Delhi is the capital of India")
+
+
+def _parse(frames):
+    """(event, data) of each SSE frame; keep-alive comments are skipped."""
+    parsed = []
+    for frame in frames:
+        assert frame.endswith("\n\n")
+        if frame.startswith(":"):
+            continue
+        event_line, data_line = frame.strip().split("\n")
+        assert event_line.startswith("event: ") and data_line.startswith("data: ")
+        payload = json.loads(data_line[len("data: "):])
+        assert payload["stage"] == event_line[len("event: "):]
+        parsed.append((payload["stage"], payload["data"]))
+    return parsed
+
+
+async def _collect(gen):
+    return [frame async for frame in gen]
+
+
+def test_stream_frames_stages_in_order_and_ends_with_result(monkeypatch):
+    async def fake_averify(post_data, progress=None, reuse=True):
+        emit_event(progress, "search_done", links=2)
+        await asyncio.sleep(0.02)
+        emit_event(progress, "classified", status="verified")
+        return {"status": "verified", "metadata": {"post_id": post_data.pid}}
+
+    monkeypatch.setattr(verification_stream, "averify_post", fake_averify)
+    monkeypatch.setattr(verification_stream, "KEEPALIVE_SECONDS", 0.01)
+
+    frames = asyncio.run(_collect(verification_stream.stream_verification(POST)))
+
+    assert ": keep-alive\n\n" in frames
+    assert _parse(frames) == [
+        ("started", {"post_id": "p1"}),
+        ("search_done", {"links": 2}),
+        ("classified", {"status": "verified"}),
+        ("result", {"status": "verified", "metadata": {"post_id": "p1"}}),
+    ]
+
+
+def test_stream_ends_with_error_frame_when_verification_raises(monkeypatch):
+    async def failing_averify(post_data, progress=None, reuse=True):
+        emit_event(progress, "search_done", links=0)
+        raise RuntimeError("pipeline down")
+
+    monkeypatch.setattr(verification_stream, "averify_post", failing_averify)
+
+    frames = asyncio.run(_collect(verification_stream.stream_verification(POST)))
+
+    assert [stage for stage, _ in _parse(frames)] == ["started", "search_done", "error"]
+    assert _parse(frames)[-1][1] == {"message": "pipeline down"}
+
+
+def test_verification_finishes_after_client_disconnects(monkeypatch):
+    finished = []
+
+    async def slow_averify(post_data, progress=None, reuse=True):
+        await asyncio.sleep(0.05)
+        finished.append(post_data.pid)
+        return {"status": "verified"}
+
+    monkeypatch.setattr(verification_stream, "averify_post", slow_averify)
+
+    async def disconnect_after_first_frame():
+        gen = verification_stream.stream_verification(POST)
+        first = await gen.__anext__()
+        await gen.aclose()
+        assert verification_stream._orphaned
+        await asyncio.gather(*verification_stream._orphaned)
+        return first
+
+    first = asyncio.run(disconnect_after_first_frame())
+
+    assert _parse([first]) == [("started", {"post_id": "p1"})]
+    assert finished == ["p1"] and not verification_stream._orphaned
@@ -0,0 +1,101 @@
+import pytest
+
+from app.agents.scraper_agent import parsing
+from app.agents.scraper_agent.parsing import FALLBACK_PARSER, parse_html, parse_with_fallback
+from app.agents.scraper_agent.sites import site_for_url
+from app.agents.scraper_agent.web_scraper import WebScraper
+from benchmarks.fixtures import URLS, make_page
+
+
+@pytest.mark.parametrize("site", ["indiatoday", "livemint", "ndtv"])
+def test_fast_path_matches_full_html5lib_parse(site):
+    scraper = WebScraper(cache=None)
+    html = make_page(site, paragraphs=5, script_kb=1)
+    spec = site_for_url(URLS[site])
+
+    result = scraper._extract(URLS[site], html)
+
+    assert spec.name == site
+    assert len(result.content) == 5
+    assert result.date_published is not None
+    assert result == spec.extract(URLS[site], parse_html(html, FALLBACK_PARSER))
+
+
+def test_site_lookup_by_hostname():
+    assert site_for_url("https://livemint.com/technology/some-story.html").name == "livemint"
+    assert site_for_url("https://WWW.NDTV.COM/india-news/x").headers["Sec-Fetch-Site"] == "same-origin"
+    assert site_for_url("https://www.indiatoday.in.example.com/story") is None
+    assert site_for_url("https://news.example.com/story") is None
+
+
+def test_falls_back_to_html5lib_when_structure_is_missing(monkeypatch):
+    parsers = []
+    real_parse = parsing.parse_html
+
+    def tracking_parse(html, parser=parsing.FAST_PARSER, only=None):
+        parsers.append(parser)
+        return real_parse(html, parser, only)
+
+    monkeypatch.setattr(parsing, "parse_html", tracking_parse)
+
+    def extract(soup):
+        if parsers[-1] != FALLBACK_PARSER:
+            raise AttributeError("'NoneType' object has no attribute 'find'")
+        return soup.find("p").text
+
+    assert parse_with_fallback(b"<p>hello</p>", extract) == "hello"
+    assert parsers == [parsing.FAST_PARSER, FALLBACK_PARSER]
+
+
+def test_generic_scraper_drops_scripts_and_ads():
+    scraper = WebScraper(cache=None)
+    html = make_page("generic", paragraphs=3, script_kb=1)
+
+    result = scraper._old_generic_webscrape(URLS["generic"], html)
+
+    assert result.title
+    assert not any("window.ads" in line or "__NEXT_DATA__" in line for line in result.content)
+
+
+class FakeResponse:
+    def __init__(self, body=b"", content_type="text/html; charset=utf-8", status_code=200):
+        self.status_code = status_code
+        self.headers = {"Content-Type": content_type}
+        self.body = body
+        self.read = 0
+
+    def iter_content(self, chunk_size):
+        for i in range(0, len(self.body), chunk_size):
+            self.read += 1
+            yield self.body[i:i + chunk_size]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+def _serve(monkeypatch, response):
+    session = type("Session", (), {"get": lambda self, url, **kwargs: response})()
+    monkeypatch.setattr("app.agents.scraper_agent.web_scraper.get_http_session", lambda: session)
+
+
+def test_fetch_rejects_non_html_before_reading_body(monkeypatch):
+    response = FakeResponse(body=b"%PDF-1.7" * 1000, content_type="application/pdf")
+    _serve(monkeypatch, response)
+
+    with pytest.raises(ValueError, match="application/pdf"):
+        WebScraper(cache=None)._fetch("https://news.example.com/report.pdf")
+    assert response.read == 0
+
+
+def test_fetch_caps_body_and_extract_caps_paragraphs(monkeypatch):
+    html = make_page("ndtv", paragraphs=40, script_kb=1)
+    _serve(monkeypatch, FakeResponse(body=html + b"<!--" + b"x" * 500_000))
+    scraper = WebScraper(cache=None, max_bytes=len(html), max_paragraphs=10)
+
+    page = scraper._fetch(URLS["ndtv"])
+
+    assert page.truncated and page.content == html
+    assert len(scraper._extract(URLS["ndtv"], page.content).content) == 10